@@ -3,32 +3,34 @@
 Analyze entrant tracking data and generate reports
 """
 
-import json
 import csv
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+import fileio
+
 DATA_DIR = Path("data")
 CHANGES_FILE = DATA_DIR / "changes.json"
 HISTORY_FILE = DATA_DIR / "history.csv"
 
 class TrackerAnalysis:
-    def __init__(self):
+    def __init__(self, changes_file: Path = CHANGES_FILE, history_file: Path = HISTORY_FILE):
+        self.changes_file = Path(changes_file)
+        self.history_file = Path(history_file)
         self.changes = self.load_changes()
         self.history = self.load_history()
     
     def load_changes(self) -> list:
         """Load all change records"""
-        if CHANGES_FILE.exists():
-            with open(CHANGES_FILE, 'r') as f:
-                return json.load(f)
+        if fileio.find(self.changes_file):
+            return fileio.read_json(self.changes_file)
         return []
     
     def load_history(self) -> list:
         """Load history CSV"""
-        if HISTORY_FILE.exists():
-            with open(HISTORY_FILE, 'r') as f:
+        if fileio.find(self.history_file):
+            with fileio.open_text(self.history_file, newline='') as f:
                 return list(csv.DictReader(f))
         return []
     
@@ -49,12 +51,16 @@ class TrackerAnalysis:
             total += change.get('total_dropped', 0)
         return total
     
+    def poll_count(self) -> int:
+        """Tracker runs behind the change log (a rolled-up summary counts its polls)"""
+        return sum(change.get('polls', 1) for change in self.changes)
+    
     def average_daily_admits(self) -> float:
         """Calculate average daily admissions from waitlist"""
-        if not self.changes or len(self.changes) < 2:
+        if self.poll_count() < 2:
             return 0.0
         
-        first_timestamp = self.changes[0]['timestamp']
+        first_timestamp = self.changes[0].get('first_timestamp', self.changes[0]['timestamp'])
         last_timestamp = self.changes[-1]['timestamp']
         
         try:
@@ -116,7 +122,7 @@ class TrackerAnalysis:
         print(f"\nCurrent Entrants: {self.current_entrant_count()}")
         print(f"Total Waitlist Admits: {self.total_waitlist_admits()}")
         print(f"Total Dropouts: {self.total_dropouts()}")
-        print(f"Days Tracked: {len(self.changes)}")
+        print(f"Days Tracked: {self.poll_count()}")
         
         avg_daily = self.average_daily_admits()
         print(f"Average Daily Admits: {avg_daily:.2f}")
@@ -4,13 +4,13 @@ Historical Analysis Generator
 Analyzes 2015-2025 Barkley Fall Classic results and generates insights.
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 
+import fileio
+
 RESULTS_DIR = Path("data/historical/results")
 ANALYSIS_DIR = Path("data/historical/analysis")
-ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def load_all_results():
@@ -22,9 +22,8 @@ def load_all_results():
         
         for distance in ['50k', 'marathon']:
             file_path = RESULTS_DIR / f"results_{year}_{distance}.json"
-            if file_path.exists():
-                with open(file_path) as f:
-                    results[year][distance] = json.load(f)
+            if fileio.find(file_path):
+                results[year][distance] = fileio.read_json(file_path)
     
     return results
 
@@ -176,12 +175,12 @@ def main():
     
     # Save analysis
     analysis_file = ANALYSIS_DIR / "barkley_analysis.json"
-    with open(analysis_file, 'w') as f:
-        json.dump({
+    with fileio.lock(f"report-{analysis_file.stem}"):
+        fileio.write_json(analysis_file, {
             'generated_at': datetime.now().isoformat(),
             'metrics': metrics,
             'insights': insights
-        }, f, indent=2)
+        })
     
     print(f"✓ Saved analysis to {analysis_file}")
     
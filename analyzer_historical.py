@@ -2,37 +2,76 @@
 """
 Analysis module for Barkley Fall Classic historical results.
 Generates trend data, demographics, and finish statistics.
+
+Each report streams the archive one edition at a time (archive_reader) and
+keeps only the finisher fields it uses, so memory does not grow with the
+number of years in the archive.
 """
 
-import json
 import csv
 from pathlib import Path
 from collections import Counter, defaultdict
 from statistics import mean, stdev, median
 
+import fileio
+import timing
+from archive_reader import iter_editions
+from records import Participation
+
 DATA_DIR = Path(__file__).parent / "data" / "historical"
 RESULTS_DIR = DATA_DIR / "results"
 ANALYSIS_DIR = DATA_DIR / "analysis"
 
-# Ensure directories exist
-ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
+# Finisher fields kept per participation in the veterans report
+VETERAN_FIELDS = (
+    'first_name', 'last_name', 'status', 'place', 'finish_time_seconds', 'finish_time_formatted',
+    'age', 'city', 'state', 'division',
+)
 
 class HistoricalAnalyzer:
-    def __init__(self, archive_path=None):
+    def __init__(self, archive_path=None, analysis_dir=None):
         if archive_path is None:
             archive_path = DATA_DIR / "barkley_archive_complete.json"
         
-        self.archive_path = archive_path
-        self.data = self._load_archive()
+        self.archive_path = Path(archive_path)
+        self.analysis_dir = Path(analysis_dir) if analysis_dir else ANALYSIS_DIR
+        self.analysis_dir.mkdir(parents=True, exist_ok=True)
+        self._data = None
+        if not fileio.find(self.archive_path):
+            print(f"Archive not found: {self.archive_path}")
+    
+    @property
+    def data(self):
+        """The whole archive as a list (loaded on first use); reports use editions() instead."""
+        if self._data is None:
+            self._data = self._load_archive()
+        return self._data
     
     def _load_archive(self):
         """Load the complete archive."""
-        if not self.archive_path.exists():
-            print(f"Archive not found: {self.archive_path}")
+        stored = fileio.find(self.archive_path)
+        if not stored:
             return []
         
-        with open(self.archive_path, 'r') as f:
-            return json.load(f)
+        with timing.span('load_archive'):
+            timing.add_file_bytes('bytes_read', stored)
+            return fileio.read_json(stored)
+    
+    def _write_report(self, output_file, data):
+        """Replace one analysis report atomically; the lock keeps concurrent runs from interleaving."""
+        with fileio.lock(f"report-{output_file.stem}"):
+            fileio.write_json(output_file, data)
+
+    def editions(self, fields=None):
+        """Stream editions one at a time, keeping only `fields` of each finisher."""
+        if self._data is not None:
+            yield from self._data
+            return
+        stored = fileio.find(self.archive_path)
+        if not stored:
+            return
+        timing.add_file_bytes('bytes_read', stored)
+        yield from iter_editions(stored, fields)
     
     def generate_all_analysis(self):
         """Generate all analysis reports."""
@@ -49,11 +88,12 @@ class HistoricalAnalyzer:
         
         print("✓ All analysis reports generated")
     
+    @timing.timed('generate_yearly_summary')
     def generate_yearly_summary(self):
         """Generate year-by-year summary statistics."""
         summary = []
         
-        for year_data in self.data:
+        for year_data in self.editions(('status', 'finish_time_seconds')):
             year = year_data['year']
             distance = year_data.get('distance', 'Unknown')
             finishers = year_data['finishers']
@@ -72,18 +112,19 @@ class HistoricalAnalyzer:
                 'median_finish_time_hours': self._median_finish_time(finished),
             })
         
-        output_file = ANALYSIS_DIR / "yearly_summary.json"
-        with open(output_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        output_file = self.analysis_dir / "yearly_summary.json"
+        self._write_report(output_file, summary)
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Yearly summary: {output_file}")
         return summary
     
+    @timing.timed('generate_demographic_trends')
     def generate_demographic_trends(self):
         """Analyze demographic changes over time."""
         trends = defaultdict(list)
         
-        for year_data in self.data:
+        for year_data in self.editions(('status', 'age', 'division')):
             year = year_data['year']
             finished = [f for f in year_data['finishers'] if f['status'] == 'Finished']
             
@@ -98,18 +139,19 @@ class HistoricalAnalyzer:
                 'finisher_count': len(finished),
             }
         
-        output_file = ANALYSIS_DIR / "demographic_trends.json"
-        with open(output_file, 'w') as f:
-            json.dump(dict(trends), f, indent=2)
+        output_file = self.analysis_dir / "demographic_trends.json"
+        self._write_report(output_file, dict(trends))
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Demographic trends: {output_file}")
         return trends
     
+    @timing.timed('generate_finish_statistics')
     def generate_finish_statistics(self):
         """Analyze finish time statistics."""
         stats = []
         
-        for year_data in self.data:
+        for year_data in self.editions(('distance', 'status', 'finish_time_seconds')):
             year = year_data['year']
             
             # By distance
@@ -134,18 +176,19 @@ class HistoricalAnalyzer:
                         'stdev_hours': round(stdev(times_hours), 2) if len(times_hours) > 1 else 0,
                     })
         
-        output_file = ANALYSIS_DIR / "finish_statistics.json"
-        with open(output_file, 'w') as f:
-            json.dump(stats, f, indent=2)
+        output_file = self.analysis_dir / "finish_statistics.json"
+        self._write_report(output_file, stats)
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Finish statistics: {output_file}")
         return stats
     
+    @timing.timed('generate_location_analysis')
     def generate_location_analysis(self):
         """Analyze where finishers are from."""
         locations = defaultdict(lambda: {'total': 0, 'finished': 0, 'dnf': 0})
         
-        for year_data in self.data:
+        for year_data in self.editions(('city', 'status')):
             for finisher in year_data['finishers']:
                 city_state = finisher['city']
                 locations[city_state]['total'] += 1
@@ -172,13 +215,14 @@ class HistoricalAnalyzer:
                 'finish_rate': round(stats['finished'] / stats['total'] * 100, 1) if stats['total'] > 0 else 0,
             })
         
-        output_file = ANALYSIS_DIR / "location_analysis.json"
-        with open(output_file, 'w') as f:
-            json.dump(location_data, f, indent=2)
+        output_file = self.analysis_dir / "location_analysis.json"
+        self._write_report(output_file, location_data)
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Location analysis: {output_file}")
         return location_data
     
+    @timing.timed('generate_age_analysis')
     def generate_age_analysis(self):
         """Analyze age group trends."""
         age_groups = {
@@ -193,7 +237,7 @@ class HistoricalAnalyzer:
         
         trends = []
         
-        for year_data in self.data:
+        for year_data in self.editions(('status', 'age')):
             year = year_data['year']
             year_trends = {'year': year}
             
@@ -215,18 +259,19 @@ class HistoricalAnalyzer:
             
             trends.append(year_trends)
         
-        output_file = ANALYSIS_DIR / "age_analysis.json"
-        with open(output_file, 'w') as f:
-            json.dump(trends, f, indent=2)
+        output_file = self.analysis_dir / "age_analysis.json"
+        self._write_report(output_file, trends)
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Age analysis: {output_file}")
         return trends
     
+    @timing.timed('generate_gender_trends')
     def generate_gender_trends(self):
         """Analyze gender participation and finish rates."""
         trends = []
         
-        for year_data in self.data:
+        for year_data in self.editions(('division', 'status')):
             year = year_data['year']
             
             for gender in ['M', 'F', 'X']:
@@ -245,18 +290,19 @@ class HistoricalAnalyzer:
                         'finish_rate': round(len(finished) / len(total) * 100, 1),
                     })
         
-        output_file = ANALYSIS_DIR / "gender_trends.json"
-        with open(output_file, 'w') as f:
-            json.dump(trends, f, indent=2)
+        output_file = self.analysis_dir / "gender_trends.json"
+        self._write_report(output_file, trends)
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Gender trends: {output_file}")
         return trends
     
+    @timing.timed('generate_distance_comparison')
     def generate_distance_comparison(self):
         """Compare 50K vs Marathon performance."""
         comparison = []
         
-        for year_data in self.data:
+        for year_data in self.editions(('distance', 'status')):
             year = year_data['year']
             
             for distance in ['50K', 'Marathon']:
@@ -274,9 +320,9 @@ class HistoricalAnalyzer:
                     'finish_rate': round(len(finished) / len(started) * 100, 1) if started else 0,
                 })
         
-        output_file = ANALYSIS_DIR / "distance_comparison.json"
-        with open(output_file, 'w') as f:
-            json.dump(comparison, f, indent=2)
+        output_file = self.analysis_dir / "distance_comparison.json"
+        self._write_report(output_file, comparison)
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Distance comparison: {output_file}")
         return comparison
@@ -295,11 +341,12 @@ class HistoricalAnalyzer:
             return round(median(times) / 3600, 2)
         return None
     
+    @timing.timed('generate_veterans_analysis')
     def generate_veterans_analysis(self):
         """Analyze runners who participated multiple years."""
         runner_participations = defaultdict(list)
         
-        for year_data in self.data:
+        for year_data in self.editions(VETERAN_FIELDS):
             year = year_data['year']
             distance = year_data.get('distance', 'Unknown')
             
@@ -313,37 +360,27 @@ class HistoricalAnalyzer:
                 # Use normalized name as key
                 name_key = (first_name.lower(), last_name.lower())
                 
-                runner_participations[name_key].append({
-                    'year': year,
-                    'distance': distance,
-                    'status': finisher.get('status', 'Unknown'),
-                    'place': finisher.get('place'),
-                    'finish_time_seconds': finisher.get('finish_time_seconds'),
-                    'finish_time_formatted': finisher.get('finish_time_formatted', ''),
-                    'age': finisher.get('age'),
-                    'city': finisher.get('city', ''),
-                    'state': finisher.get('state', ''),
-                    'division': finisher.get('division', ''),
-                    'display_name': f"{first_name} {last_name}"
-                })
+                runner_participations[name_key].append(
+                    Participation.from_finisher(finisher, year, distance, f"{first_name} {last_name}")
+                )
         
         # Filter to only multi-year participants
         veterans = []
         for name_key, participations in runner_participations.items():
             if len(participations) >= 2:
                 # Sort by year
-                participations.sort(key=lambda x: x['year'])
+                participations.sort(key=lambda x: x.year)
                 
                 # Calculate statistics
-                years_participated = sorted(list(set(p['year'] for p in participations)))
+                years_participated = sorted(list(set(p.year for p in participations)))
                 total_races = len(participations)
-                finishes = len([p for p in participations if p['status'] == 'Finished'])
-                dnfs = len([p for p in participations if p['status'] == 'DNF'])
-                dns = len([p for p in participations if p['status'] == 'DNS'])
+                finishes = len([p for p in participations if p.status == 'Finished'])
+                dnfs = len([p for p in participations if p.status == 'DNF'])
+                dns = len([p for p in participations if p.status == 'DNS'])
                 
                 # Get best finish time
-                finish_times = [p['finish_time_seconds'] for p in participations 
-                              if p['finish_time_seconds'] and p['status'] == 'Finished']
+                finish_times = [p.finish_time_seconds for p in participations 
+                              if p.finish_time_seconds and p.status == 'Finished']
                 best_time_seconds = min(finish_times) if finish_times else None
                 best_time_formatted = None
                 if best_time_seconds:
@@ -353,12 +390,12 @@ class HistoricalAnalyzer:
                     best_time_formatted = f"{hours}:{minutes:02d}:{seconds:02d}"
                 
                 # Find best placement
-                placements = [p['place'] for p in participations 
-                             if p['place'] and isinstance(p['place'], int)]
+                placements = [p.place for p in participations 
+                             if p.place and isinstance(p.place, int)]
                 best_place = min(placements) if placements else None
                 
                 veterans.append({
-                    'name': participations[0]['display_name'],
+                    'name': participations[0].display_name,
                     'total_participations': total_races,
                     'years': years_participated,
                     'year_range': f"{years_participated[0]}-{years_participated[-1]}" if len(years_participated) > 1 else str(years_participated[0]),
@@ -369,23 +406,24 @@ class HistoricalAnalyzer:
                     'best_time_formatted': best_time_formatted,
                     'best_place': best_place,
                     'most_recent_year': years_participated[-1],
-                    'location': participations[-1]['city'] + ', ' + participations[-1]['state'] if participations[-1]['city'] else participations[-1]['state'],
-                    'participations': participations
+                    'location': participations[-1].city + ', ' + participations[-1].state if participations[-1].city else participations[-1].state,
+                    'participations': [p.to_dict() for p in participations]
                 })
         
         # Sort by total participations (descending), then by name
         veterans.sort(key=lambda x: (-x['total_participations'], x['name']))
         
-        output_file = ANALYSIS_DIR / "veterans.json"
-        with open(output_file, 'w') as f:
-            json.dump(veterans, f, indent=2)
+        output_file = self.analysis_dir / "veterans.json"
+        self._write_report(output_file, veterans)
+        timing.add_file_bytes('bytes_written', output_file)
         
         print(f"  ✓ Veterans analysis: {output_file}")
         return veterans
 
 def main():
-    analyzer = HistoricalAnalyzer()
-    analyzer.generate_all_analysis()
+    with timing.run_report('analyze_historical'):
+        analyzer = HistoricalAnalyzer()
+        analyzer.generate_all_analysis()
 
 if __name__ == '__main__':
     main()
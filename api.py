@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Local JSON API over entrant tracking data and historical results.
+
+Builds in-memory indexes from the HistoricalAnalyzer archive and the
+EntrantTracker data files, and answers queries from an LRU response cache
+that is dropped whenever one of the underlying files changes.
+
+Endpoints:
+    /events                              tracked events and current counts
+    /events/{key}/entrants               current entrant snapshot
+    /events/{key}/changes?since=&limit=  change records at or after `since`
+    /results/{year}/{distance}           one year's results (50k or marathon)
+    /runners?name=                       runner history and current entries
+"""
+
+import argparse
+import hashlib
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import fileio
+import jsonio
+from analyzer_historical import DATA_DIR as HISTORICAL_DIR, HistoricalAnalyzer
+from scraper import EVENTS, data_paths_for
+from serve import LRUCache, etag_matches
+
+ARCHIVE_FILE = HISTORICAL_DIR / "barkley_archive_complete.json"
+RESPONSE_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def normalize_name(first, last=''):
+    """Normalize a runner name for matching - lowercase, collapse whitespace."""
+    return ' '.join(f"{first} {last}".lower().split())
+
+
+class APIError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class HistoricalIndex:
+    """Results by (year, distance) and participations by runner name."""
+
+    def __init__(self, archive_path: Path):
+        analyzer = HistoricalAnalyzer(archive_path)
+        self.results = {}
+        self.runners = defaultdict(list)
+        self.name_tokens = defaultdict(set)
+
+        for year_data in analyzer.data:
+            distance = year_data.get('distance', 'Unknown')
+            self.results[(year_data['year'], distance.lower())] = year_data
+            for finisher in year_data.get('finishers', []):
+                name = normalize_name(finisher.get('first_name', ''), finisher.get('last_name', ''))
+                if not name:
+                    continue
+                self.runners[name].append(finisher)
+                for token in name.split():
+                    self.name_tokens[token].add(name)
+
+        for participations in self.runners.values():
+            participations.sort(key=lambda f: (f['year'], f['distance']))
+
+    def find_names(self, query: str) -> list:
+        """Exact name match, else all names containing every query token."""
+        query = normalize_name(query)
+        if query in self.runners:
+            return [query]
+        tokens = query.split()
+        if not tokens:
+            return []
+        matches = None
+        for token in tokens:
+            names = self.name_tokens.get(token)
+            if names is None:
+                # Fall back to prefix matching for partially typed names
+                names = {n for t, ns in self.name_tokens.items() if t.startswith(token) for n in ns}
+            matches = names if matches is None else matches & names
+            if not matches:
+                return []
+        return sorted(matches)
+
+
+class EventIndex:
+    """Current entrants and time-ordered change records for one event."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.name = EVENTS[key][0]
+        entrants_file, changes_file, _ = data_paths_for(key)
+
+        self.snapshot = {'count': 0, 'entrants': {}, 'timestamp': None}
+        if fileio.find(entrants_file):
+            self.snapshot = fileio.read_json(entrants_file)
+
+        self.changes = []
+        if fileio.find(changes_file):
+            try:
+                self.changes = fileio.read_json(changes_file)
+            except ValueError:
+                self.changes = []
+        self.changes.sort(key=lambda c: c.get('timestamp', ''))
+        self.timestamps = [c.get('timestamp', '') for c in self.changes]
+
+        self.entrants_by_name = defaultdict(list)
+        for entrant_key, entrant in self.snapshot.get('entrants', {}).items():
+            name = normalize_name(entrant.get('first_name', ''), entrant.get('last_name', ''))
+            self.entrants_by_name[name].append(dict(entrant, key=entrant_key))
+
+    def changes_since(self, since: str = None) -> list:
+        if not since:
+            return self.changes
+        return self.changes[bisect_left(self.timestamps, since):]
+
+
+class DataIndex:
+    """All indexes plus the response cache, rebuilt when source files change."""
+
+    def __init__(self, archive_path: Path = ARCHIVE_FILE, cache_bytes: int = RESPONSE_CACHE_BYTES):
+        self.archive_path = Path(archive_path)
+        self.cache = LRUCache(cache_bytes)
+        self._lock = threading.Lock()
+        self._versions = {}
+        self.historical = None
+        self.events = {}
+        self.refresh()
+
+    def _source_files(self):
+        sources = {'historical': [self.archive_path]}
+        for key in EVENTS:
+            entrants_file, changes_file, _ = data_paths_for(key)
+            sources[key] = [entrants_file, changes_file]
+        return sources
+
+    @staticmethod
+    def _version(paths):
+        version = []
+        for path in paths:
+            try:
+                stat = (fileio.find(path) or path).stat()
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def refresh(self):
+        """Rebuild any index whose files changed and invalidate cached responses."""
+        with self._lock:
+            changed = False
+            for name, paths in self._source_files().items():
+                version = self._version(paths)
+                if self._versions.get(name) == version:
+                    continue
+                if name == 'historical':
+                    self.historical = HistoricalIndex(self.archive_path)
+                else:
+                    self.events[name] = EventIndex(name)
+                self._versions[name] = version
+                changed = True
+            if changed:
+                self.cache.clear()
+
+    def _event(self, key):
+        if key not in self.events:
+            raise APIError(HTTPStatus.NOT_FOUND, f"Unknown event key: {key}")
+        return self.events[key]
+
+    def query(self, path: str, params: dict):
+        """Route a request path to its handler and return a JSON-able result."""
+        parts = [unquote(p) for p in path.strip('/').split('/') if p]
+
+        if parts == ['events']:
+            return [
+                {
+                    'key': ev.key,
+                    'name': ev.name,
+                    'count': ev.snapshot.get('count', 0),
+                    'snapshot_timestamp': ev.snapshot.get('timestamp'),
+                    'change_records': len(ev.changes),
+                }
+                for ev in self.events.values()
+            ]
+
+        if len(parts) == 3 and parts[0] == 'events' and parts[2] == 'entrants':
+            ev = self._event(parts[1])
+            return {'event': ev.key, **ev.snapshot}
+
+        if len(parts) == 3 and parts[0] == 'events' and parts[2] == 'changes':
+            ev = self._event(parts[1])
+            changes = ev.changes_since(params.get('since'))
+            limit = params.get('limit')
+            if limit:
+                try:
+                    changes = changes[-int(limit):] if int(limit) > 0 else []
+                except ValueError:
+                    raise APIError(HTTPStatus.BAD_REQUEST, "limit must be an integer")
+            return {'event': ev.key, 'since': params.get('since'), 'count': len(changes), 'changes': changes}
+
+        if len(parts) == 3 and parts[0] == 'results':
+            try:
+                year = int(parts[1])
+            except ValueError:
+                raise APIError(HTTPStatus.BAD_REQUEST, "year must be an integer")
+            year_data = self.historical.results.get((year, parts[2].lower()))
+            if year_data is None:
+                raise APIError(HTTPStatus.NOT_FOUND, f"No results for {year} {parts[2]}")
+            return year_data
+
+        if parts == ['runners']:
+            query = params.get('name', '')
+            if not query.strip():
+                raise APIError(HTTPStatus.BAD_REQUEST, "name parameter is required")
+            runners = []
+            for name in self.historical.find_names(query)[:50]:
+                participations = self.historical.runners[name]
+                entries = {
+                    key: ev.entrants_by_name[name]
+                    for key, ev in self.events.items()
+                    if name in ev.entrants_by_name
+                }
+                runners.append({
+                    'name': name,
+                    'participations': participations,
+                    'finishes': sum(1 for p in participations if p.get('status') == 'Finished'),
+                    'current_entries': entries,
+                })
+            return {'query': query, 'count': len(runners), 'runners': runners}
+
+        raise APIError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {path}")
+
+    def response(self, path: str, params: dict):
+        """Return (status, body bytes, etag), served from the LRU when possible."""
+        self.refresh()
+        cache_key = (path, tuple(sorted(params.items())))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self.query(path, params)
+            status = HTTPStatus.OK
+        except APIError as e:
+            result = {'error': e.message}
+            status = e.status
+
+        body = jsonio.encode(result)
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        entry = (status, body, etag)
+        if status == HTTPStatus.OK:
+            self.cache.put(cache_key, entry, len(body))
+        return entry
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'BFCDataAPI/1.0'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        status, body, etag = self.server.index.response(url.path, params)
+
+        if status == HTTPStatus.OK and etag_matches(self.headers.get('If-None-Match'), (etag,)):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class APIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, index: DataIndex = None, quiet: bool = False):
+        self.index = index or DataIndex()
+        self.quiet = quiet
+        super().__init__(address, APIRequestHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a JSON query API over entrant and results data')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', '-p', type=int, default=8001, help='Port to listen on (default: 8001)')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Suppress per-request logging')
+    args = parser.parse_args()
+
+    server = APIServer((args.host, args.port), quiet=args.quiet)
+    print(f"Data API listening at http://{args.host}:{args.port}/")
+    print(f"  {len(server.index.historical.runners)} runners, {len(server.index.events)} events indexed")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for barkley_archive_complete.json.
+
+json.load() on the archive keeps every finisher dict of every edition in
+memory at once. This reads the same file in fixed-size chunks and decodes one
+finisher at a time, so peak memory depends on the largest edition, not on
+how many races and years the archive holds. `fields` keeps only the finisher
+fields a caller needs.
+
+    for finisher in iter_finishers(fields=('year', 'status', 'age')):
+        ...
+    for edition in iter_editions(fields=('status', 'finish_time_seconds')):
+        edition['year'], edition['total_dnf'], edition['finishers']
+
+The file format on disk is unchanged, and a compressed archive
+(barkley_archive_complete.json.gz, see fileio.cold_path) is read the same way.
+
+Usage:
+    python archive_reader.py            # editions and finisher counts
+"""
+
+import json
+import re
+from pathlib import Path
+
+import fileio
+
+ARCHIVE_FILE = Path(__file__).parent / "data" / "historical" / "barkley_archive_complete.json"
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'\s*')
+_decoder = json.JSONDecoder()
+
+
+class _Scanner:
+    """Just enough of a JSON tokenizer to walk the archive's outer structure."""
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+
+    def _fill(self, size: int = None) -> bool:
+        data = self.f.read(size or self.chunk_size)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file), without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed archive: expected one of {chars!r}, got {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode one complete JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: double the unread part so long values aren't re-decoded per chunk
+                if self._fill(max(self.chunk_size, len(self.buf) - self.pos)):
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _project(finisher: dict, fields) -> dict:
+    if fields is None:
+        return finisher
+    return {field: finisher[field] for field in fields if field in finisher}
+
+
+def _stream(path, fields, whole_editions: bool = False):
+    """
+    Yield (edition header, finisher) for every finisher, then (edition header, None)
+    once the edition's object is closed. The header holds every edition key except
+    'finishers'; keys written after the finishers list appear only in the final item.
+    With whole_editions, each edition's finishers come as one list (decoded in one call).
+    """
+    with fileio.open_text(path) as f:
+        scanner = _Scanner(f)
+        scanner.expect('[')
+        if scanner.peek() == ']':
+            return
+        while True:
+            scanner.expect('{')
+            header = {}
+            if scanner.peek() == '}':
+                scanner.expect('}')
+            else:
+                while True:
+                    key = scanner.value()
+                    scanner.expect(':')
+                    if key == 'finishers' and whole_editions:
+                        yield header, [_project(finisher, fields) for finisher in scanner.value()]
+                    elif key == 'finishers':
+                        scanner.expect('[')
+                        if scanner.peek() == ']':
+                            scanner.expect(']')
+                        else:
+                            while True:
+                                yield header, _project(scanner.value(), fields)
+                                if scanner.expect(',]') == ']':
+                                    break
+                    else:
+                        header[key] = scanner.value()
+                    if scanner.expect(',}') == '}':
+                        break
+            yield header, None
+            if scanner.expect(',]') == ']':
+                return
+
+
+def iter_finishers(path=ARCHIVE_FILE, fields=None):
+    """Every finisher in the archive, one dict at a time (only `fields` if given)."""
+    for _, finisher in _stream(path, fields):
+        if finisher is not None:
+            yield finisher
+
+
+def iter_editions(path=ARCHIVE_FILE, fields=None):
+    """Each edition dict with its finishers list; only one edition is held at a time."""
+    finishers = []
+    for header, item in _stream(path, fields, whole_editions=True):
+        if item is None:
+            yield {**header, 'finishers': finishers}
+            finishers = []
+        else:
+            finishers = item
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stream the historical results archive')
+    parser.add_argument('archive', nargs='?', default=str(ARCHIVE_FILE))
+    args = parser.parse_args()
+
+    total = 0
+    for edition in iter_editions(args.archive, fields=('status',)):
+        total += len(edition['finishers'])
+        print(f"  {edition.get('year')} {edition.get('distance', 'Unknown'):<9} {len(edition['finishers']):>5} finishers")
+    print(f"{total} finishers")
+
+
+if __name__ == '__main__':
+    main()
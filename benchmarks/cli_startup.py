@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Cold start-up time of each bfc.py subcommand.
+
+Every sample is a fresh interpreter running `bfc.py --startup-time COMMAND`,
+which imports the subcommand's script without running it. Reports the whole
+process wall time (interpreter start-up included), the import time measured
+inside the process and a bare `python -c pass` baseline.
+
+Usage:
+    python benchmarks/cli_startup.py
+    python benchmarks/cli_startup.py --repeat 20 analyze serve
+"""
+
+import argparse
+import json
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from bfc import COMMANDS
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "startup.json"
+# Budget for a cold `bfc analyze` (and the other report commands) before any work
+TARGET_MS = 100
+
+
+def sample(cmd: list, repeat: int) -> dict:
+    walls, imports = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+        walls.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(cmd)} failed:\n{result.stderr}")
+        match = re.search(r'([\d.]+) ms to import', result.stdout)
+        if match:
+            imports.append(float(match.group(1)))
+    walls.sort()
+    return {
+        'wall_ms_best': round(walls[0], 1),
+        'wall_ms_median': round(walls[len(walls) // 2], 1),
+        'import_ms_best': round(min(imports), 1) if imports else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold start-up of each bfc.py subcommand')
+    parser.add_argument('commands', nargs='*', help='Subcommands to measure (default: all)')
+    parser.add_argument('--repeat', type=int, default=10, help='Fresh processes per subcommand')
+    parser.add_argument('--output', '-o', default=str(DEFAULT_OUTPUT), help='Results JSON file')
+    args = parser.parse_args()
+
+    commands = args.commands or list(COMMANDS)
+    report = {
+        'started_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'repeat': args.repeat,
+        'baseline': sample([sys.executable, '-c', 'pass'], args.repeat),
+        'results': {},
+    }
+    print(f"  {'python -c pass':<12} {report['baseline']['wall_ms_best']:>8.1f} ms wall")
+    for name in commands:
+        result = sample([sys.executable, 'bfc.py', '--startup-time', name], args.repeat)
+        report['results'][name] = result
+        flag = '' if result['wall_ms_best'] < TARGET_MS else f"  (over {TARGET_MS} ms)"
+        print(f"  {name:<12} {result['wall_ms_best']:>8.1f} ms wall  {result['import_ms_best']:>7.1f} ms import{flag}")
+
+    output = Path(args.output)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
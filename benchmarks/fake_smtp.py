@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Local SMTP stand-in for testing notifications offline.
+
+Speaks enough SMTP for smtplib (EHLO/HELO, AUTH PLAIN/LOGIN, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT), accepts everything and keeps the messages in memory.
+It counts connections and logins so you can check that a run used one session.
+
+Usage:
+    python benchmarks/fake_smtp.py                     # listens on 127.0.0.1:8025
+    SMTP_HOST=127.0.0.1 SMTP_PORT=8025 NOTIFY_FROM=tracker@example.com \
+        NOTIFY_TO=me@example.com python scripts/run_all.py
+"""
+
+import argparse
+import socketserver
+import threading
+from email import message_from_bytes, policy
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        sender, recipients = None, []
+        self.reply('220 fake-smtp ready')
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb == 'EHLO':
+                self.reply('250-fake-smtp')
+                self.reply('250-AUTH PLAIN LOGIN')
+                self.reply('250 8BITMIME')
+            elif verb == 'HELO':
+                self.reply('250 fake-smtp')
+            elif verb == 'AUTH':
+                parts = command.split()
+                if parts[1].upper() == 'LOGIN':
+                    # Username and password prompts (base64 "Username:" / "Password:")
+                    for prompt in ('VXNlcm5hbWU6', 'UGFzc3dvcmQ6'):
+                        if len(parts) == 3 and prompt == 'VXNlcm5hbWU6':
+                            continue
+                        self.reply(f'334 {prompt}')
+                        self.rfile.readline()
+                elif len(parts) == 2:
+                    self.reply('334 ')
+                    self.rfile.readline()
+                with server.lock:
+                    server.logins += 1
+                self.reply('235 2.7.0 Authentication successful')
+            elif verb == 'MAIL':
+                sender = command.split(':', 1)[1].strip().split()[0].strip('<>')
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip().split()[0].strip('<>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b'.\r\n', b'.\n'):
+                        break
+                    if data_line.startswith(b'..'):
+                        data_line = data_line[1:]
+                    lines.append(data_line)
+                message = message_from_bytes(b''.join(lines), policy=policy.default)
+                with server.lock:
+                    server.messages.append({'from': sender, 'to': recipients, 'message': message})
+                if server.verbose:
+                    print(f"--- message from {sender} to {', '.join(recipients)} ---")
+                    print(f"Subject: {message['Subject']}")
+                    print(message.get_content())
+                self.reply('250 OK: queued')
+            elif verb in ('RSET', 'NOOP'):
+                if verb == 'RSET':
+                    sender, recipients = None, []
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, verbose: bool = False):
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.logins = 0
+        self.verbose = verbose
+        super().__init__(address, FakeSMTPHandler)
+
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local SMTP stand-in that prints received mail')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', '-p', type=int, default=8025)
+    args = parser.parse_args()
+
+    server = FakeSMTPServer((args.host, args.port), verbose=True)
+    print(f"Fake SMTP listening on {args.host}:{args.port}")
+    print(f"  export SMTP_HOST={args.host} SMTP_PORT={args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nShutting down ({len(server.messages)} messages over {server.connections} connections)")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
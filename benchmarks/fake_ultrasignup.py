@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the UltraSignup pages the scrapers use.
+
+Serves synthetic but structurally faithful versions of:
+    /entrants_event.aspx?did=     entrant table (third <table> on the page)
+    /results_event.aspx?did=      race date, 50K/Marathon toggle links and a
+                                  table#list jqGrid populated from the data endpoint
+    /service/events.svc/results/{did}/1/json
+                                  jqGrid row data (status codes 1/2/3)
+    /register.aspx?did=           "See the {year} event" link to the next eid
+    /register.aspx?eid=           registration entrant table
+
+Latency and row counts are configurable. Point the scrapers at it with
+ULTRASIGNUP_BASE_URL=http://127.0.0.1:8800 (see benchmarks/scraper_throughput.py).
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from events import load_registry
+from generators import entrants_page_html, make_entrants, make_year_results
+
+# Same (50K did, Marathon did) per year as the scrapers, so toggles resolve to real DIDs
+KNOWN_EVENTS = load_registry().series('barkley_fall_classic').by_year()
+STATUS_CODES = {'Finished': '1', 'DNF': '2', 'DNS': '3'}
+
+# Minimal jQuery/jqGrid surface used by HistoricalResultsScraper: the grid is
+# filled by a synchronous request so it is complete by DOMContentLoaded.
+JQGRID_SHIM = """
+(function () {
+  var grids = {};
+  window.jqGridShimLoad = function (selector, url) {
+    var xhr = new XMLHttpRequest();
+    xhr.open('GET', url, false);
+    xhr.send(null);
+    var rows = JSON.parse(xhr.responseText);
+    var table = document.querySelector(selector);
+    var byId = {};
+    var ids = [];
+    rows.forEach(function (row, i) {
+      var id = String(i + 1);
+      ids.push(id);
+      byId[id] = row;
+      var tr = document.createElement('tr');
+      tr.id = id;
+      ['place', 'firstname', 'lastname', 'city', 'state', 'age', 'agegroup', 'formattime'].forEach(function (k) {
+        var td = document.createElement('td');
+        td.textContent = row[k] == null ? '' : String(row[k]);
+        tr.appendChild(td);
+      });
+      table.appendChild(tr);
+    });
+    grids[selector] = {ids: ids, rows: byId};
+  };
+  window.jQuery = window.$ = function (selector) {
+    return {
+      jqGrid: function (method, arg) {
+        var grid = grids[selector] || {ids: [], rows: {}};
+        if (method === 'getDataIDs') return grid.ids.slice();
+        if (method === 'getRowData') return Object.assign({}, grid.rows[arg] || {});
+        if (method === 'getGridParam' && arg === 'reccount') return grid.ids.length;
+        return null;
+      }
+    };
+  };
+})();
+"""
+
+
+class FakeUltraSignup:
+    """Page generator with a per-page cache so throughput numbers measure the client."""
+
+    def __init__(self, rows: int = 500, current_year: int = 2026, next_eid: int = 130000):
+        self.rows = rows
+        self.current_year = current_year
+        self.next_eid = next_eid
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.did_info = {}
+        for year, (did_50k, did_marathon) in KNOWN_EVENTS.items():
+            self.did_info[did_50k] = (year, '50K', did_50k, did_marathon)
+            self.did_info[did_marathon] = (year, 'Marathon', did_50k, did_marathon)
+
+    def event_for(self, did: int):
+        """(year, distance, did_50k, did_marathon) for any DID, inventing siblings if unknown."""
+        if did in self.did_info:
+            return self.did_info[did]
+        return (self.current_year - 1, '50K', did, did + 1)
+
+    def cached(self, key, build):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        body = build()
+        with self._lock:
+            self._cache[key] = body
+        return body
+
+    def grid_rows(self, did: int) -> list:
+        year, distance, _, _ = self.event_for(did)
+        results = make_year_results(year, distance, self.rows, random.Random(did), did=did)
+        return [
+            {
+                'place': f['place'],
+                'firstname': f['first_name'],
+                'lastname': f['last_name'],
+                'city': f['city'],
+                'state': f['state'],
+                'age': f['age'],
+                'agegroup': f['division'],
+                'formattime': f['finish_time_formatted'],
+                'status': STATUS_CODES[f['status']],
+            }
+            for f in results['finishers']
+        ]
+
+    def results_page(self, did: int) -> str:
+        year, distance, did_50k, did_marathon = self.event_for(did)
+        return f"""<!DOCTYPE html>
+<html><head><title>Barkley Fall Classic {distance} Results</title>
+<script src="/js/jqgrid-shim.js"></script></head>
+<body>
+<h1>Barkley Fall Classic {distance}</h1>
+<div class="event-date">September 20, {year}</div>
+<div class="unit-1 text-right">
+  <a href="/results_event.aspx?did={did_50k}">50K</a>
+  <a href="/results_event.aspx?did={did_marathon}">Marathon</a>
+</div>
+<table id="list"></table>
+<script>jqGridShimLoad('table#list', '/service/events.svc/results/{did}/1/json');</script>
+</body></html>"""
+
+    def register_page(self, did: int = None, eid: int = None) -> str:
+        if eid is None:
+            return f"""<!DOCTYPE html>
+<html><body><h1>Barkley Fall Classic Registration</h1>
+<a id="ContentPlaceHolder1_hlCurrentEventPage" href="/register.aspx?eid={self.next_eid}">See the {self.current_year} event</a>
+</body></html>"""
+        snapshot = make_entrants(self.rows, seed=eid)
+        rows = ''.join(
+            f"<tr><td>{e['first_name']} {e['last_name']}</td><td>50K</td></tr>"
+            for e in snapshot['entrants'].values()
+        )
+        return f"""<!DOCTYPE html>
+<html><body><h1>Barkley Fall Classic {self.current_year}</h1>
+<table><tr><th>Name</th><th>Distance</th></tr>{rows}</table>
+</body></html>"""
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'FakeUltraSignup/1.0'
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.request_count += 1
+
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        site = self.server.site
+        try:
+            did = int(params['did']) if 'did' in params else None
+            eid = int(params['eid']) if 'eid' in params else None
+        except ValueError:
+            self._send(HTTPStatus.BAD_REQUEST, 'text/plain', 'bad id')
+            return
+
+        path = url.path
+        if path == '/js/jqgrid-shim.js':
+            self._send(HTTPStatus.OK, 'application/javascript', JQGRID_SHIM)
+        elif path == '/entrants_event.aspx' and did is not None:
+            body = site.cached(('entrants', did), lambda: entrants_page_html(make_entrants(site.rows, seed=did)))
+            self._send(HTTPStatus.OK, 'text/html', body)
+        elif path == '/results_event.aspx' and did is not None:
+            self._send(HTTPStatus.OK, 'text/html', site.cached(('results', did), lambda: site.results_page(did)))
+        elif path.startswith('/service/events.svc/results/'):
+            try:
+                grid_did = int(path.split('/')[4])
+            except (IndexError, ValueError):
+                self._send(HTTPStatus.NOT_FOUND, 'text/plain', 'not found')
+                return
+            body = site.cached(('grid', grid_did), lambda: json.dumps(site.grid_rows(grid_did)))
+            self._send(HTTPStatus.OK, 'application/json', body)
+        elif path == '/register.aspx' and (did is not None or eid is not None):
+            body = site.cached(('register', did, eid), lambda: site.register_page(did=did, eid=eid))
+            self._send(HTTPStatus.OK, 'text/html', body)
+        else:
+            self._send(HTTPStatus.NOT_FOUND, 'text/plain', 'not found')
+
+    def _send(self, status, content_type, body: str):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class FakeUltraSignupServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, rows: int = 500, latency_ms: float = 0, quiet: bool = True,
+                 current_year: int = 2026):
+        self.site = FakeUltraSignup(rows=rows, current_year=current_year)
+        self.latency = latency_ms / 1000.0
+        self.quiet = quiet
+        self.request_count = 0
+        super().__init__(address, FakeRequestHandler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve an offline UltraSignup stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', '-p', type=int, default=8800)
+    parser.add_argument('--rows', type=int, default=500, help='Entrants / results rows per page')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every response')
+    parser.add_argument('--year', type=int, default=2026, help='Year advertised as the current event')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    server = FakeUltraSignupServer((args.host, args.port), rows=args.rows, latency_ms=args.latency_ms,
+                                   quiet=not args.verbose, current_year=args.year)
+    print(f"Fake UltraSignup at {server.base_url} ({args.rows} rows, {args.latency_ms} ms latency)")
+    print(f"  export ULTRASIGNUP_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Local webhook receiver for testing outbox delivery offline.
+
+Records every JSON POST (generic webhook or Slack-style payloads). It can fail
+the first N requests or a fraction of them, to exercise retries and backoff.
+
+Usage:
+    python benchmarks/fake_webhook.py --fail-first 2     # listens on 127.0.0.1:8090
+    NOTIFY_WEBHOOK_URL=http://127.0.0.1:8090/hook python scripts/run_all.py
+"""
+
+import argparse
+import json
+import random
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeWebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        with server.lock:
+            server.request_count += 1
+            fail = server.request_count <= server.fail_first or random.random() < server.fail_rate
+            if not fail:
+                server.received.append({
+                    'path': self.path,
+                    'idempotency_key': self.headers.get('X-Idempotency-Key'),
+                    'body': json.loads(body or b'null'),
+                })
+        if fail:
+            self.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if server.verbose:
+            print(f"POST {self.path}: {body.decode('utf-8', 'replace')}")
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeWebhookServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fail_first: int = 0, fail_rate: float = 0.0, verbose: bool = False):
+        self.lock = threading.Lock()
+        self.received = []
+        self.request_count = 0
+        self.fail_first = fail_first
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        super().__init__(address, FakeWebhookHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/hook"
+
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local webhook receiver that prints payloads')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', '-p', type=int, default=8090)
+    parser.add_argument('--fail-first', type=int, default=0, help='Answer 503 to the first N requests')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Answer 503 to this fraction of requests')
+    args = parser.parse_args()
+
+    server = FakeWebhookServer((args.host, args.port), args.fail_first, args.fail_rate, verbose=True)
+    print(f"Fake webhook listening at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nShutting down ({len(server.received)} payloads, {server.request_count} requests)")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generators for the scaling benchmarks.
+Produces entrant snapshots and pages, change histories and historical
+archives in the same shapes the scrapers write, seeded for repeatability.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+from itertools import product
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_PAGE = REPO_ROOT / "marathon_2025_raw.html"
+
+# Sizes relative to today's data: ~500 entrants per event, a few hundred
+# change records and 11 years x 2 distances of ~200 results each
+SCALES = {
+    '1x': {'entrants': 500, 'change_records': 100, 'years': 11, 'distances': 2, 'finishers_per_page': 200},
+    '10x': {'entrants': 5000, 'change_records': 1000, 'years': 22, 'distances': 5, 'finishers_per_page': 200},
+    '100x': {'entrants': 50000, 'change_records': 10000, 'years': 50, 'distances': 10, 'finishers_per_page': 200},
+}
+
+DISTANCES = ['50K', 'Marathon', 'Half Marathon', '50M', '100K', '100M', '25K', '10K', '30K', '40M']
+
+FIRST_NAMES = [
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'William', 'Elizabeth',
+    'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Christopher', 'Nancy', 'Daniel', 'Lisa', 'Matthew', 'Betty', 'Anthony', 'Margaret', 'Mark', 'Sandra',
+    'Donald', 'Ashley', 'Steven', 'Kimberly', 'Paul', 'Emily', 'Andrew', 'Donna', 'Joshua', 'Michelle',
+    'Kenneth', 'Dorothy', 'Kevin', 'Carol', 'Brian', 'Amanda', 'George', 'Melissa', 'Edward', 'Deborah',
+    'Ronald', 'Stephanie', 'Timothy', 'Rebecca', 'Jason', 'Sharon', 'Jeffrey', 'Laura', 'Ryan', 'Cynthia',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+    'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+    'Green', 'Adams', 'Nelson', 'Baker', 'Hall', 'Rivera', 'Campbell', 'Mitchell', 'Carter', 'Roberts',
+    'Gomez', 'Phillips', 'Evans', 'Turner', 'Diaz', 'Parker', 'Cruz', 'Edwards', 'Collins', 'Reyes',
+    'Stewart', 'Morris', 'Morales', 'Murphy', 'Cook', 'Rogers', 'Gutierrez', 'Ortiz', 'Morgan', 'Cooper',
+    'Peterson', 'Bailey', 'Reed', 'Kelly', 'Howard', 'Ramos', 'Kim', 'Cox', 'Ward', 'Richardson',
+]
+STATES = [
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY',
+    'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND',
+    'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
+]
+CITIES = ['Knoxville', 'Nashville', 'Asheville', 'Atlanta', 'Chattanooga', 'Boulder', 'Louisville', 'Richmond',
+          'Columbus', 'Austin', 'Denver', 'Raleigh', 'Lexington', 'Birmingham', 'Greenville', 'Charlotte']
+AGE_GROUPS = ['M20-29', 'M30-39', 'M40-49', 'M50-59', 'M60-69', 'F20-29', 'F30-39', 'F40-49', 'F50-59', 'F60-69']
+
+# Every (first, last, state) combination, so large samples can stay unique
+_NAME_SPACE = len(FIRST_NAMES) * len(LAST_NAMES) * len(STATES)
+
+
+def _unique_people(n, rng):
+    """Return n distinct (first, last, state) tuples."""
+    if n > _NAME_SPACE:
+        raise ValueError(f"Cannot generate more than {_NAME_SPACE} unique entrants")
+    people = []
+    for index in rng.sample(range(_NAME_SPACE), n):
+        index, state = divmod(index, len(STATES))
+        first, last = divmod(index, len(LAST_NAMES))
+        people.append((FIRST_NAMES[first], LAST_NAMES[last], STATES[state]))
+    return people
+
+
+def make_entrant(first, last, state, rng):
+    return {
+        'first_name': first,
+        'last_name': last,
+        'city': rng.choice(CITIES),
+        'location': state,
+        'age': rng.choice(AGE_GROUPS),
+    }
+
+
+def make_entrants(n, seed=0) -> dict:
+    """A snapshot in the entrants_{key}.json format with n entrants."""
+    rng = random.Random(seed)
+    entrants = {}
+    for first, last, state in _unique_people(n, rng):
+        entrants[f"{first}_{last}_{state}".lower()] = make_entrant(first, last, state, rng)
+    return {'count': len(entrants), 'entrants': entrants, 'timestamp': datetime(2026, 1, 1).isoformat()}
+
+
+def churn_snapshot(snapshot, fraction=0.02, seed=1) -> dict:
+    """Copy a snapshot with a fraction of entrants dropped and replaced by new ones."""
+    rng = random.Random(seed)
+    entrants = dict(snapshot['entrants'])
+    n = max(1, int(len(entrants) * fraction))
+    for key in rng.sample(sorted(entrants), n):
+        del entrants[key]
+    added = 0
+    while added < n:
+        first, last, state = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(STATES)
+        key = f"{first}_{last}_{state}".lower()
+        if key in entrants or key in snapshot['entrants']:
+            continue
+        entrants[key] = make_entrant(first, last, state, rng)
+        added += 1
+    return {'count': len(entrants), 'entrants': entrants, 'timestamp': datetime(2026, 1, 2).isoformat()}
+
+
+def entrants_page_html(snapshot, template=TEMPLATE_PAGE) -> str:
+    """
+    Render an entrants_event.aspx-style page. The saved results page provides
+    realistic page chrome; the entrant table is appended as the third table,
+    matching what EntrantTracker.parse_entrants expects.
+    """
+    chrome = Path(template).read_text(encoding='utf-8') if Path(template).exists() else '<html><body></body></html>'
+    # Pad to exactly two leading tables so the entrant table is tables[2]
+    leading = chrome.lower().count('<table')
+    padding = ''.join('<table><tr><td></td></tr></table>' for _ in range(max(0, 2 - leading)))
+
+    rows = ['<tr>' + ''.join(f'<th>{h}</th>' for h in (
+        'Rank', 'Age Rank', 'Results', 'Target', 'Age', '', 'First', 'Last', 'City', 'State', '', 'Bib', 'Finishes', ''
+    )) + '</tr>']
+    for i, entrant in enumerate(snapshot['entrants'].values(), 1):
+        rows.append(
+            f"<tr><td>{50 + i % 50}.{i % 100:02d}%</td><td>{40 + i % 60}%</td><td>{i % 12}</td><td></td>"
+            f"<td>{entrant['age']}</td><td></td><td>{entrant['first_name']}</td><td>{entrant['last_name']}</td>"
+            f"<td>{entrant['city']}</td><td>{entrant['location']}</td><td></td><td>{i}</td><td>{i % 5}</td>"
+            f"<td><a href=\"/results_participant.aspx?fname={entrant['first_name']}&lname={entrant['last_name']}\">"
+            f"results</a></td></tr>"
+        )
+    table = '<table class="entrants">' + ''.join(rows) + '</table>'
+
+    marker = chrome.lower().rfind('</body>')
+    if marker == -1:
+        return chrome + padding + table
+    return chrome[:marker] + padding + table + chrome[marker:]
+
+
+def make_change_history(n_records, churn_per_record=3, base_count=500, seed=2) -> list:
+    """A changes_{key}.json list with n_records runs, most of them no-ops."""
+    rng = random.Random(seed)
+    records = []
+    count = base_count
+    timestamp = datetime(2026, 1, 1, 8)
+    for i in range(n_records):
+        active = rng.random() < 0.3
+        new_list, dropped_list = [], []
+        if active:
+            for _ in range(rng.randint(1, churn_per_record)):
+                first, last, state = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(STATES)
+                new_list.append(dict(make_entrant(first, last, state, rng), key=f"{first}_{last}_{state}".lower()))
+            for _ in range(rng.randint(0, churn_per_record)):
+                first, last, state = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(STATES)
+                dropped_list.append(dict(make_entrant(first, last, state, rng), key=f"{first}_{last}_{state}".lower()))
+        previous = count
+        count += len(new_list) - len(dropped_list)
+        records.append({
+            'timestamp': timestamp.isoformat(),
+            'count_change': count - previous,
+            'new_count': count,
+            'previous_count': previous,
+            'new_entrants': new_list,
+            'dropped_entrants': dropped_list,
+            'total_new': len(new_list),
+            'total_dropped': len(dropped_list),
+        })
+        timestamp += timedelta(hours=8)
+    return records
+
+
+def history_rows(change_records) -> list:
+    return [
+        [c['timestamp'], c['new_count'], c['previous_count'], c['total_new'], c['total_dropped'], c['count_change']]
+        for c in change_records
+    ]
+
+
+def _format_time(seconds):
+    return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def make_year_results(year, distance, n, rng, did=0) -> dict:
+    """One results_{year}_{distance}.json structure with n participants."""
+    finishers = []
+    counts = {'Finished': 0, 'DNF': 0, 'DNS': 0}
+    for first, last, state in _unique_people(n, rng):
+        status = rng.choices(['Finished', 'DNF', 'DNS'], weights=[60, 30, 10])[0]
+        counts[status] += 1
+        seconds = rng.randint(6 * 3600, 13 * 3600) if status == 'Finished' else None
+        age = rng.randint(18, 75)
+        finishers.append({
+            'year': year,
+            'distance': distance,
+            'place': 0,
+            'first_name': first,
+            'last_name': last,
+            'city': rng.choice(CITIES),
+            'state': state,
+            'age': age,
+            'division': rng.choice(['M', 'F']),
+            'status': status,
+            'finish_time_seconds': seconds,
+            'finish_time_formatted': _format_time(seconds) if seconds else '',
+        })
+    finished = sorted((f for f in finishers if f['status'] == 'Finished'), key=lambda f: f['finish_time_seconds'])
+    for place, f in enumerate(finished, 1):
+        f['place'] = place
+    finishers.sort(key=lambda x: (0 if x['status'] == 'Finished' else (1 if x['status'] == 'DNF' else 2), x['place']))
+    return {
+        'year': year,
+        'distance': distance,
+        'did': did,
+        'scraped_at': datetime(2026, 1, 1).isoformat(),
+        'total_finishers': counts['Finished'],
+        'total_dnf': counts['DNF'],
+        'total_dns': counts['DNS'],
+        'total_disqualified': 0,
+        'finishers': finishers,
+    }
+
+
+def make_archive(years, distances, finishers_per_page, last_year=2025, seed=3) -> list:
+    """A barkley_archive_complete.json list covering years x distances pages."""
+    rng = random.Random(seed)
+    archive = []
+    for year, distance in product(range(last_year - years + 1, last_year + 1), DISTANCES[:distances]):
+        archive.append(make_year_results(year, distance, finishers_per_page, rng, did=len(archive) + 1))
+    return archive
+
+
+def write_archive(archive, archive_file: Path, results_dir: Path):
+    """Write the archive plus per-year results files the way the scraper does."""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    with open(archive_file, 'w') as f:
+        json.dump(archive, f, indent=2)
+    for year_data in archive:
+        name = f"results_{year_data['year']}_{year_data['distance'].lower().replace(' ', '_')}.json"
+        with open(results_dir / name, 'w') as f:
+            json.dump(year_data, f, indent=2)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+JSON load/dump speed and file size: stdlib indent=2 versus jsonio.
+
+Times serializing and parsing the synthetic change log, entrant snapshot and
+historical archive three ways: the old stdlib json with indent=2, stdlib
+compact, and jsonio.encode()/loads() with whichever backend is installed
+(orjson if available). Also checks that jsonio's compact output decodes to
+the same data. Runs fully in memory.
+
+Usage:
+    python benchmarks/json_io.py
+    python benchmarks/json_io.py --scales 1x,10x,100x
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import jsonio
+from generators import SCALES, make_archive, make_change_history, make_entrants
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "json_io.json"
+
+VARIANTS = {
+    'json indent=2': (lambda data: json.dumps(data, indent=2).encode('utf-8'), json.loads),
+    'json compact': (lambda data: json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+                     json.loads),
+    f'jsonio ({jsonio.backend()})': (lambda data: jsonio.encode(data, pretty=False), jsonio.loads),
+}
+
+
+def best_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 2)
+
+
+def datasets(sizes: dict) -> dict:
+    return {
+        'changes': make_change_history(sizes['change_records'], base_count=sizes['entrants']),
+        'entrants': make_entrants(sizes['entrants']),
+        'archive': make_archive(sizes['years'], sizes['distances'], sizes['finishers_per_page']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JSON load/dump speed and size')
+    parser.add_argument('--scales', default='1x,10x', help=f"Comma-separated scales ({', '.join(SCALES)})")
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions per measurement')
+    parser.add_argument('--output', '-o', default=str(DEFAULT_OUTPUT), help='Results JSON file')
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scale(s): {', '.join(unknown)}")
+
+    report = {
+        'started_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'backend': jsonio.backend(),
+        'repeat': args.repeat,
+        'results': [],
+    }
+
+    print(f"{'scale':>5} {'file':<9} {'variant':<18}{'size':>12}{'dump':>11}{'load':>11}")
+    for scale in scales:
+        for name, data in datasets(SCALES[scale]).items():
+            expected, baseline = json.loads(json.dumps(data)), None
+            for variant, (dump, load) in VARIANTS.items():
+                content = dump(data)
+                if load(content) != expected:
+                    raise AssertionError(f"{variant} changed the {name} data")
+                result = {
+                    'scale': scale, 'file': name, 'variant': variant,
+                    'bytes': len(content),
+                    'dump_ms': best_ms(lambda: dump(data), args.repeat),
+                    'load_ms': best_ms(lambda: load(content), args.repeat),
+                }
+                baseline = baseline or result
+                report['results'].append(result)
+                print(f"{scale:>5} {name:<9} {variant:<18}{len(content) / 1024:>9.0f} KB"
+                      f"{result['dump_ms']:>8.1f} ms{result['load_ms']:>8.1f} ms"
+                      f"  ({result['bytes'] / baseline['bytes']:.0%} size, "
+                      f"{baseline['dump_ms'] / max(result['dump_ms'], 0.01):.1f}x dump, "
+                      f"{baseline['load_ms'] / max(result['load_ms'], 0.01):.1f}x load)")
+
+    output = Path(args.output)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmarks for the tracker and analysis pipeline.
+
+Generates synthetic data at 1x, 10x and 100x today's size, times the hot
+paths (entrant page parsing, diffing, change-log writes, tracker analysis,
+historical analysis and veterans building) and records wall time and peak
+memory to a JSON results file. Runs fully offline in a temporary directory.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # 1x and 10x
+    python benchmarks/run_benchmarks.py --scales 1x,10x,100x
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from generators import (SCALES, churn_snapshot, entrants_page_html, history_rows,
+                        make_archive, make_change_history, make_entrants, write_archive)
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results.json"
+
+
+def measure(fn, repeat=3):
+    """Best-of-N wall time, then one traced run for peak memory."""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_seconds': round(min(timings), 6),
+        'wall_seconds_max': round(max(timings), 6),
+        'peak_memory_mb': round(peak / (1024 * 1024), 3),
+    }
+
+
+def run_scale(scale, sizes, workdir: Path, repeat: int) -> list:
+    from analyze import TrackerAnalysis
+    from analyzer_historical import HistoricalAnalyzer
+    from build_veterans import build_veterans
+    from scraper import EntrantTracker
+    from storage import FileStorage, SQLiteStorage
+
+    results = []
+
+    def record(name, fn, **params):
+        print(f"  {scale:>5} {name:<32}", end='', flush=True)
+        result = measure(fn, repeat)
+        print(f"{result['wall_seconds'] * 1000:10.1f} ms {result['peak_memory_mb']:9.1f} MB")
+        results.append({'benchmark': name, 'scale': scale, **params, **result})
+
+    data_dir = workdir / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    # Entrant tracking
+    previous = make_entrants(sizes['entrants'])
+    current = churn_snapshot(previous)
+    page = entrants_page_html(current)
+    entrants_file = data_dir / "entrants_bench.json"
+    changes_file = data_dir / "changes_bench.json"
+    history_file = data_dir / "history_bench.csv"
+    tracker = EntrantTracker('frozen_head_50k', storage=FileStorage(entrants_file, changes_file, history_file))
+
+    record('parse_entrants', lambda: tracker.parse_entrants(page),
+           entrants=sizes['entrants'], page_bytes=len(page))
+    changes = tracker.find_changes(previous, current)
+    record('find_changes', lambda: tracker.find_changes(previous, current), entrants=sizes['entrants'])
+
+    history = make_change_history(sizes['change_records'], base_count=sizes['entrants'])
+    history_json = json.dumps(history, indent=2)
+
+    def save_changes_files():
+        changes_file.write_text(history_json)
+        tracker.save_changes(changes)
+
+    record('save_changes[files]', save_changes_files, change_records=sizes['change_records'])
+
+    db_path = workdir / "bench.sqlite3"
+    sqlite_storage = SQLiteStorage('bench', db_path=db_path)
+    for record_ in history:
+        sqlite_storage.save_changes(record_)
+    record('save_changes[sqlite]', lambda: sqlite_storage.save_changes(changes),
+           change_records=sizes['change_records'])
+    sqlite_storage.close()
+
+    changes_file.write_text(history_json)
+    with open(history_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Total_Entrants', 'Previous_Count', 'New_Entrants', 'Dropped_Entrants', 'Net_Change'])
+        writer.writerows(history_rows(history))
+
+    def tracker_analysis():
+        analysis = TrackerAnalysis(changes_file, history_file)
+        analysis.print_summary()
+
+    record('TrackerAnalysis', tracker_analysis, change_records=sizes['change_records'])
+
+    # Historical analysis
+    archive = make_archive(sizes['years'], sizes['distances'], sizes['finishers_per_page'])
+    historical_dir = data_dir / "historical"
+    archive_file = historical_dir / "barkley_archive_complete.json"
+    results_dir = historical_dir / "results"
+    write_archive(archive, archive_file, results_dir)
+    rows = sum(len(y['finishers']) for y in archive)
+    del archive
+
+    record('generate_all_analysis',
+           lambda: HistoricalAnalyzer(archive_file, historical_dir / "analysis").generate_all_analysis(),
+           pages=sizes['years'] * sizes['distances'], rows=rows,
+           archive_bytes=archive_file.stat().st_size)
+
+    veterans_entrants = data_dir / "entrants_veterans.json"
+    with open(veterans_entrants, 'w') as f:
+        json.dump(make_entrants(sizes['entrants'], seed=4), f)
+    record('build_veterans',
+           lambda: build_veterans(veterans_entrants, results_dir, data_dir / "veterans_bench.json"),
+           entrants=sizes['entrants'], rows=rows)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the scaling benchmark suite')
+    parser.add_argument('--scales', default='1x,10x', help=f"Comma-separated scales ({', '.join(SCALES)})")
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions per benchmark')
+    parser.add_argument('--output', '-o', default=str(DEFAULT_OUTPUT), help='Results JSON file')
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scale(s): {', '.join(unknown)}")
+
+    report = {
+        'started_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': [],
+    }
+
+    print(f"{'scale':>7} {'benchmark':<32}{'wall':>13} {'peak':>12}")
+    cwd = os.getcwd()
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"bfc-bench-{scale}-") as tmp:
+            # EntrantTracker creates ./data relative to the working directory
+            os.chdir(tmp)
+            try:
+                report['results'].extend(run_scale(scale, SCALES[scale], Path(tmp), args.repeat))
+            finally:
+                os.chdir(cwd)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraper throughput against the offline UltraSignup stand-in.
+
+Starts benchmarks/fake_ultrasignup.py in-process, points the scrapers at it
+through ULTRASIGNUP_BASE_URL and times the HTTP paths (EntrantTracker and the
+discovery lookups resolve_event_links, discover_current_year_event and
+get_race_date_for_year) and, when Playwright is installed, scrape_year.
+
+Usage:
+    python benchmarks/scraper_throughput.py --rows 500 --latency-ms 50
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_ultrasignup import FakeUltraSignupServer
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "throughput.json"
+
+
+def timed_calls(fn, calls: int, workers: int = 1) -> dict:
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    # redirect_stdout swaps sys.stdout globally, so wrap the whole batch rather than each thread
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                latencies = list(pool.map(one, range(calls)))
+        else:
+            latencies = [one(i) for i in range(calls)]
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'calls': calls,
+        'workers': workers,
+        'elapsed_seconds': round(elapsed, 4),
+        'calls_per_second': round(calls / elapsed, 2) if elapsed else None,
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the scrapers against a local UltraSignup stand-in')
+    parser.add_argument('--rows', type=int, default=500, help='Rows per entrants/results page')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Server-side delay per response')
+    parser.add_argument('--calls', type=int, default=20, help='Calls per HTTP benchmark')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrency for the parallel HTTP benchmark')
+    parser.add_argument('--browser-calls', type=int, default=2, help='Calls per Playwright benchmark')
+    parser.add_argument('--output', '-o', default=str(DEFAULT_OUTPUT), help='Results JSON file')
+    args = parser.parse_args()
+
+    server = FakeUltraSignupServer(('127.0.0.1', 0), rows=args.rows, latency_ms=args.latency_ms)
+    server.start_background()
+
+    # Must be set before the scraper modules build their URLs
+    os.environ['ULTRASIGNUP_BASE_URL'] = server.base_url
+    os.environ.setdefault('JQGRID_SETTLE_SECONDS', '0')
+
+    report = {
+        'started_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'base_url': server.base_url,
+        'rows': args.rows,
+        'latency_ms': args.latency_ms,
+        'results': {},
+    }
+
+    def record(name, result):
+        report['results'][name] = result
+        print(f"  {name:<40} {result['calls_per_second']:>8} calls/s  p50 {result['p50_ms']:>8} ms")
+
+    print(f"Fake UltraSignup at {server.base_url} ({args.rows} rows, {args.latency_ms} ms latency)")
+
+    with tempfile.TemporaryDirectory(prefix='bfc-throughput-') as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            from scraper import EntrantTracker
+
+            tracker = EntrantTracker('frozen_head_50k')
+            record('scrape_entrants[sequential]', timed_calls(tracker.scrape_entrants, args.calls))
+            record(f'scrape_entrants[{args.workers} threads]',
+                   timed_calls(tracker.scrape_entrants, args.calls, workers=args.workers))
+
+            import scraper_historical
+            from discover_current_year import discover_current_year_event
+            from get_race_dates import get_race_date_for_year
+
+            # Keep benchmark output away from the real results directory and discovery cache
+            scraper_historical.RESULTS_DIR = Path(tmp)
+            os.environ['DISCOVERY_CACHE'] = str(Path(tmp) / 'discovery_cache.json')
+            scraper = scraper_historical.HistoricalResultsScraper()
+            # Static HTML lookups over the shared session (refresh=True bypasses the discovery cache)
+            record('resolve_event_links', timed_calls(lambda: scraper.resolve_event_links(119817, refresh=True), args.calls))
+            record('discover_current_year_event',
+                   timed_calls(lambda: discover_current_year_event(119817, refresh=True), args.calls))
+            record('get_race_date_for_year',
+                   timed_calls(lambda: get_race_date_for_year(119817, refresh=True), args.calls))
+
+            if importlib.util.find_spec('playwright') is None:
+                print("  (Playwright not installed - skipping browser benchmarks)")
+            else:
+                record('scrape_year', timed_calls(lambda: scraper.scrape_year(2025, 119817), args.browser_calls))
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+            server.server_close()
+
+    report['server_requests'] = server.request_count
+    output = Path(args.output)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
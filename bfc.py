@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the tracker, scrapers and reports.
+
+Each subcommand runs an existing script exactly as if it were called
+directly (same arguments, run report and exit code). Nothing beyond the
+standard library is imported until a subcommand is chosen, and each script
+imports its heavy dependencies (requests, BeautifulSoup, Playwright) only in
+the code paths that use them, so report commands start quickly.
+
+Usage:
+    python bfc.py track [--shard 0/4] [--due-only]
+    python bfc.py daemon [--interval 5]
+    python bfc.py backfill [--resume]
+    python bfc.py analyze
+    python bfc.py veterans
+    python bfc.py diagnose
+    python bfc.py compact [--days 30] [--period week]
+    python bfc.py serve [--port 8000]
+    python bfc.py --startup-time analyze    # import cost only, runs nothing
+"""
+
+import runpy
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+# name: (script, takes arguments, help)
+COMMANDS = {
+    'track': ('scripts/run_all.py', True, 'Track entrant lists for every enabled event'),
+    'daemon': ('daemon.py', True, 'Track events continuously from one long-running process'),
+    'backfill': ('scripts/scrape_historical.py', True, 'Scrape historical results, then run the analysis'),
+    'analyze': ('analyzer_historical.py', False, 'Regenerate the historical analysis reports'),
+    'veterans': ('build_veterans.py', False, 'Build the veterans scout data for current entrants'),
+    'diagnose': ('scripts/diagnose_data.py', False, 'Check tracker data files for inconsistencies'),
+    'compact': ('compaction.py', True, 'Roll old change records into daily or weekly summaries'),
+    'serve': ('serve.py', True, 'Serve the dashboard and data files locally'),
+}
+
+
+def usage() -> str:
+    lines = ['usage: bfc.py [--startup-time] COMMAND [ARGS...]', '', 'commands:']
+    lines += [f"  {name:<10} {help_text}" for name, (_, _, help_text) in COMMANDS.items()]
+    return '\n'.join(lines)
+
+
+def load(name: str) -> dict:
+    """Execute a command's module body (its imports and setup) without running it."""
+    script = COMMANDS[name][0]
+    return runpy.run_path(str(REPO_ROOT / script), run_name=f"bfc_{name}")
+
+
+def run(name: str, args: list):
+    script, takes_args, help_text = COMMANDS[name]
+    if args and not takes_args:
+        if args in (['-h'], ['--help']):
+            print(f"usage: bfc.py {name}\n\n{help_text}")
+            return
+        sys.exit(f"bfc.py {name} takes no arguments")
+    sys.argv = [f"bfc.py {name}", *args]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    runpy.run_path(str(REPO_ROOT / script), run_name='__main__')
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    startup_time = '--startup-time' in argv[:1]
+    if startup_time:
+        argv = argv[1:]
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        sys.exit(f"Unknown command: {name}\n\n{usage()}")
+
+    if startup_time:
+        started = time.perf_counter()
+        load(name)
+        print(f"{name}: {(time.perf_counter() - started) * 1000:.1f} ms to import")
+        return
+    run(name, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Retention and rollup compaction for the per-event change logs.
+
+Every tracker run appends a record with the full new/dropped/modified
+entrant dicts to changes_{key}.json, including runs that saw no change. The
+dashboard only needs counts and names for older periods. Records older than
+the retention window are therefore rolled into one summary per day (or
+week):
+
+    {"timestamp": <last poll of the period>, "first_timestamp": <first poll>,
+     "period": "day", "period_start": "2026-01-20", "polls": 3,
+     "count_change": 1, "new_count": 499, "previous_count": 498,
+     "total_new": 1, "total_dropped": 0,
+     "new_entrants": [{"first_name": ..., "last_name": ..., "location": ..., "key": ...}],
+     "dropped_entrants": []}
+
+A summary is still a change record, so totals summed over the log do not
+change. Only whole periods that ended before the window are rolled, and
+summaries already written are left alone. The raw records are appended to
+changes_{key}.archive.jsonl.gz (one compressed frame per compaction, .zst
+under BFC_COMPRESS=zstd) before the log is rewritten. A crash can therefore
+archive a record twice but never lose it.
+
+    CHANGES_RETENTION_DAYS   days of full detail to keep (30)
+    CHANGES_ROLLUP           day or week (day)
+
+The SQLite backend keeps raw records in the database and applies the same
+compaction when it exports the changes file.
+
+Usage:
+    python compaction.py                       # every registered event
+    python compaction.py -e frozen_head_50k --days 14 --period week
+    python compaction.py --dry-run
+"""
+
+import os
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+import fileio
+import jsonio
+
+RETENTION_DAYS = float(os.getenv('CHANGES_RETENTION_DAYS', '30'))
+ROLLUP_PERIOD = os.getenv('CHANGES_ROLLUP', 'day')
+PERIODS = ('day', 'week')
+
+ENTRANT_LISTS = ('new_entrants', 'dropped_entrants', 'modified_entrants')
+# Enough of an entrant for the dashboard's name lists (plus the field edits of a modified one)
+NAME_FIELDS = ('first_name', 'last_name', 'location', 'key', 'changes')
+
+
+def _parse(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+def first_timestamp(record: dict) -> str:
+    """When the first poll behind a record ran (the record's own timestamp unless it is a summary)."""
+    return record.get('first_timestamp', record['timestamp'])
+
+
+def is_summary(record: dict) -> bool:
+    return 'polls' in record
+
+
+def period_start(moment: datetime, period: str):
+    day = moment.date()
+    return day - timedelta(days=day.weekday()) if period == 'week' else day
+
+
+def period_end(start, period: str) -> datetime:
+    return datetime.combine(start + timedelta(days=7 if period == 'week' else 1), time())
+
+
+def _names(entrants: list) -> list:
+    return [{field: entrant[field] for field in NAME_FIELDS if field in entrant} for entrant in entrants]
+
+
+def summarize(records: list, period: str) -> dict:
+    """One summary of consecutive records (raw or already summarized) from the same period."""
+    first, last = records[0], records[-1]
+    summary = {
+        'timestamp': last['timestamp'],
+        'first_timestamp': first_timestamp(first),
+        'period': period,
+        'period_start': period_start(_parse(first_timestamp(first)), period).isoformat(),
+        'polls': sum(record.get('polls', 1) for record in records),
+        'count_change': sum(record.get('count_change', 0) for record in records),
+        'new_count': last.get('new_count', 0),
+        'previous_count': first.get('previous_count', 0),
+        'total_new': sum(record.get('total_new', 0) for record in records),
+        'total_dropped': sum(record.get('total_dropped', 0) for record in records),
+    }
+    total_modified = sum(record.get('total_modified', 0) for record in records)
+    if total_modified:
+        summary['total_modified'] = total_modified
+    for field in ENTRANT_LISTS:
+        names = [name for record in records for name in _names(record.get(field, []))]
+        if names or field != 'modified_entrants':
+            summary[field] = names
+    return summary
+
+
+def compact(records: list, now: datetime = None, retention_days: float = None, period: str = None):
+    """
+    (compacted records, raw records that were rolled up). Records whose period
+    ended before now - retention_days become one summary per period.
+    """
+    period = period or ROLLUP_PERIOD
+    if period not in PERIODS:
+        raise ValueError(f"Unknown rollup period: {period} (expected one of {', '.join(PERIODS)})")
+    retention = RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = (now or datetime.now()) - timedelta(days=retention)
+
+    compacted, rolled, group = [], [], []
+
+    def flush():
+        if len(group) == 1 and is_summary(group[0]) and group[0].get('period') == period:
+            compacted.append(group[0])
+        elif group:
+            compacted.append(summarize(group, period))
+            rolled.extend(record for record in group if not is_summary(record))
+        group.clear()
+
+    group_start = None
+    for record in records:
+        start = period_start(_parse(first_timestamp(record)), period)
+        coarser = is_summary(record) and PERIODS.index(record.get('period', 'day')) > PERIODS.index(period)
+        if coarser or period_end(start, period) > cutoff:
+            # Inside the window (or a week summary when rolling by day): kept as is
+            flush()
+            compacted.append(record)
+            continue
+        if start != group_start:
+            flush()
+            group_start = start
+        group.append(record)
+    flush()
+    return compacted, rolled
+
+
+def archive_file(changes_file) -> Path:
+    """changes_{key}.archive.jsonl.gz (or .zst) next to the changes file."""
+    changes_file = fileio.logical_path(changes_file)
+    codec = fileio.compression() if fileio.compression() != 'none' else 'gzip'
+    return changes_file.with_name(f"{changes_file.stem}.archive.jsonl{fileio.COMPRESSION_SUFFIXES[codec]}")
+
+
+def load_archived(changes_file) -> list:
+    """Raw records moved out of a changes file by earlier compactions, oldest first."""
+    archive = fileio.find(archive_file(changes_file))
+    if archive is None:
+        return []
+    with fileio.open_text(archive) as f:
+        return [jsonio.loads(line) for line in f if line.strip()]
+
+
+def compact_file(changes_file, now: datetime = None, retention_days: float = None,
+                 period: str = None, dry_run: bool = False):
+    """Compact one changes file in place. Returns record counts and sizes, or None if there is no file."""
+    stored = fileio.find(changes_file)
+    if stored is None:
+        return None
+    records = fileio.read_json(stored)
+    compacted, rolled = compact(records, now, retention_days, period)
+    stats = {'records': len(records), 'kept': len(compacted), 'rolled': len(rolled),
+             'bytes': stored.stat().st_size, 'bytes_after': stored.stat().st_size}
+    if dry_run or compacted == records:
+        return stats
+
+    if rolled:
+        with fileio.append(archive_file(stored)) as f:
+            for record in rolled:
+                f.write(jsonio.dumps(record) + '\n')
+    fileio.write_json(stored, compacted)
+    stats['bytes_after'] = stored.stat().st_size
+    return stats
+
+
+def compact_event(key: str, **kwargs):
+    """Compact an event's changes file under its event lock, so a tracker run can't interleave."""
+    from scraper import data_paths_for
+
+    _, changes_file, _ = data_paths_for(key)
+    with fileio.lock(f"event-{key}"):
+        return compact_file(changes_file, **kwargs)
+
+
+def main():
+    import argparse
+
+    from events import load_registry
+
+    parser = argparse.ArgumentParser(description='Roll old change records into daily or weekly summaries')
+    parser.add_argument('--event', '-e', action='append', help='Event key (repeatable; default: every registered event)')
+    parser.add_argument('--days', type=float, default=RETENTION_DAYS, help=f'Days of full detail to keep (default: {RETENTION_DAYS:g})')
+    parser.add_argument('--period', choices=PERIODS, default=ROLLUP_PERIOD, help=f'Summary period (default: {ROLLUP_PERIOD})')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be rolled up without writing')
+    args = parser.parse_args()
+
+    keys = args.event or load_registry().keys()
+    for key in keys:
+        stats = compact_event(key, retention_days=args.days, period=args.period, dry_run=args.dry_run)
+        if stats is None:
+            print(f"  {key}: no changes file")
+            continue
+        verb = 'would archive' if args.dry_run else 'archived'
+        print(f"  {key}: {stats['records']} → {stats['kept']} records, {verb} {stats['rolled']} raw "
+              f"({stats['bytes'] / 1024:.0f} KB → {stats['bytes_after'] / 1024:.0f} KB)")
+    if not args.dry_run:
+        print("✓ Change logs compacted")
+
+
+if __name__ == '__main__':
+    main()
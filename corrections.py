@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Correction log for re-scraped historical results.
+
+When a correction run replaces results_{year}_{distance}.json, the new rows
+are diffed against the previous file before it is overwritten. Rows are keyed
+by runner (normalized name, with a #2 suffix for a repeated name in the same
+race), compared by a per-row digest, and only rows whose digest differs are
+expanded field by field. A removed and an added row with the same place,
+status and time are reported as one modified row (a name fix) with its
+previous_key. Each non-empty diff is appended to data/historical/corrections.jsonl
+(.jsonl.gz under BFC_COMPRESS, one frame per diff):
+
+    {"year": 2025, "distance": "50K", "did": 119817,
+     "previous_scraped_at": "...", "scraped_at": "...",
+     "added": [{"key": ..., "row": {...}}], "removed": [...],
+     "modified": [{"key": ..., "previous_key": ..., "fields": {"age": {"old": 41, "new": 42}}}]}
+
+affected_runners() turns the log into the runners whose results changed, so
+reports keyed by runner can recompute just those.
+
+Usage:
+    python corrections.py                    # every logged correction
+    python corrections.py --since 2026-09-23 --runners
+"""
+
+from pathlib import Path
+
+import fileio
+import jsonio
+from records import fields_digest
+
+CORRECTIONS_FILE = Path(__file__).parent / "data" / "historical" / "corrections.jsonl"
+
+# Result row fields compared between scrapes (year/distance are the file's own)
+RESULT_FIELDS = ('place', 'first_name', 'last_name', 'city', 'state', 'age', 'division',
+                 'status', 'finish_time_seconds', 'finish_time_formatted')
+
+
+def runner_name(row: dict) -> str:
+    """Normalized "first last", the same matching key as build_veterans.py."""
+    return f"{(row.get('first_name') or '').strip().lower()} {(row.get('last_name') or '').strip().lower()}"
+
+
+def keyed_rows(finishers: list) -> dict:
+    """{runner key: row}; a name seen again in the same race gets a #2, #3... suffix."""
+    rows = {}
+    for row in finishers:
+        name = runner_name(row)
+        key, n = name, 1
+        while key in rows:
+            n += 1
+            key = f"{name}#{n}"
+        rows[key] = row
+    return rows
+
+
+def row_digest(row: dict) -> str:
+    return fields_digest(row.get(field) for field in RESULT_FIELDS)
+
+
+def row_deltas(old: dict, new: dict) -> dict:
+    return {
+        field: {'old': old.get(field), 'new': new.get(field)}
+        for field in RESULT_FIELDS
+        if old.get(field) != new.get(field)
+    }
+
+
+def _result_slot(row: dict):
+    return (row.get('place'), row.get('status'), row.get('finish_time_formatted'))
+
+
+def diff_results(previous: dict, current: dict) -> dict:
+    """Row-level diff between two versions of one results file."""
+    old_rows = keyed_rows(previous.get('finishers', []))
+    new_rows = keyed_rows(current.get('finishers', []))
+
+    modified = [
+        {'key': key, 'fields': row_deltas(old_rows[key], new_rows[key])}
+        for key in old_rows.keys() & new_rows.keys()
+        if row_digest(old_rows[key]) != row_digest(new_rows[key])
+    ]
+    removed = {key: old_rows[key] for key in old_rows.keys() - new_rows.keys()}
+    added = {key: new_rows[key] for key in new_rows.keys() - old_rows.keys()}
+
+    # A renamed runner keeps their place and time: pair unambiguous slots
+    old_slots, new_slots = {}, {}
+    for key, row in removed.items():
+        old_slots.setdefault(_result_slot(row), []).append(key)
+    for key, row in added.items():
+        new_slots.setdefault(_result_slot(row), []).append(key)
+    for slot, old_keys in old_slots.items():
+        new_keys = new_slots.get(slot, [])
+        if len(old_keys) == 1 and len(new_keys) == 1:
+            old_key, new_key = old_keys[0], new_keys[0]
+            modified.append({'key': new_key, 'previous_key': old_key,
+                             'fields': row_deltas(removed.pop(old_key), added.pop(new_key))})
+
+    modified.sort(key=lambda entry: entry['key'])
+    return {
+        'year': current.get('year'),
+        'distance': current.get('distance'),
+        'did': current.get('did'),
+        'previous_scraped_at': previous.get('scraped_at'),
+        'scraped_at': current.get('scraped_at'),
+        'added': [{'key': key, 'row': row} for key, row in sorted(added.items())],
+        'removed': [{'key': key, 'row': row} for key, row in sorted(removed.items())],
+        'modified': modified,
+    }
+
+
+def has_corrections(diff: dict) -> bool:
+    return bool(diff['added'] or diff['removed'] or diff['modified'])
+
+
+def log_corrections(previous: dict, current: dict, log_file: Path = None):
+    """Diff two versions of a results file and append the diff to the log if anything changed."""
+    diff = diff_results(previous, current)
+    if not has_corrections(diff):
+        return None
+    fileio.append_line(fileio.cold_path(log_file or CORRECTIONS_FILE), jsonio.dumps(diff))
+    return diff
+
+
+def load_corrections(since: str = None, log_file: Path = None) -> list:
+    """Logged diffs, oldest first; `since` is an ISO timestamp compared with scraped_at."""
+    log_file = Path(log_file or CORRECTIONS_FILE)
+    if not fileio.find(log_file):
+        return []
+    corrections = []
+    with fileio.open_text(log_file) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            diff = jsonio.loads(line)
+            if since and (diff.get('scraped_at') or '') < since:
+                continue
+            corrections.append(diff)
+    return corrections
+
+
+def affected_runners(since: str = None, log_file: Path = None) -> dict:
+    """{(year, distance): {normalized runner name}} for every runner touched by a logged correction."""
+    affected = {}
+    for diff in load_corrections(since, log_file):
+        names = affected.setdefault((diff['year'], diff['distance']), set())
+        for entry in diff['added'] + diff['removed'] + diff['modified']:
+            for key in (entry['key'], entry.get('previous_key')):
+                if key:
+                    names.add(key.split('#')[0])
+    return affected
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show corrections logged by historical re-scrapes')
+    parser.add_argument('--since', help='Only corrections scraped at or after this ISO date/time')
+    parser.add_argument('--runners', action='store_true', help='List affected runners per race instead')
+    args = parser.parse_args()
+
+    if args.runners:
+        for (year, distance), names in sorted(affected_runners(args.since).items()):
+            print(f"{year} {distance}: {', '.join(sorted(names))}")
+        return
+
+    for diff in load_corrections(args.since):
+        print(f"{diff['year']} {diff['distance']} (scraped {diff['scraped_at'][:16]}): "
+              f"+{len(diff['added'])} -{len(diff['removed'])} ~{len(diff['modified'])}")
+        for entry in diff['modified']:
+            renamed = f" (was {entry['previous_key']})" if entry.get('previous_key') else ''
+            changes = ', '.join(f"{field} {delta['old']!r} → {delta['new']!r}" for field, delta in entry['fields'].items())
+            print(f"  ~ {entry['key']}{renamed}: {changes}")
+        for entry in diff['added']:
+            print(f"  + {entry['key']}")
+        for entry in diff['removed']:
+            print(f"  - {entry['key']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Long-running tracker: one process polls every event on a schedule.
+
+Each cron run pays for interpreter start-up, importing requests and
+BeautifulSoup, and reloading every event's JSON state just to diff one page.
+The daemon does that once. Each event's latest snapshot stays in memory
+(MemoryStorage), so a poll is fetch, parse and diff over a shared HTTP
+session. The backing storage is written only when something changed, plus a
+quiet record every QUIET_RECORD_HOURS so history_{key}.csv still shows when
+the list was checked (scheduler.py reads it). Intervals come from
+scheduler.py, or are fixed with --interval for near-real-time polling on
+lottery day.
+
+A small HTTP server on 127.0.0.1 reports how it is doing:
+    GET /health   200 while polls succeed, 503 when an event is overdue or failing
+    GET /status   per-event counts, last poll/change, errors and next poll
+
+Usage:
+    python daemon.py                      # adaptive intervals from scheduler.py
+    python daemon.py --interval 5         # every event every 5 minutes
+    python daemon.py --event frozen_head_50k --port 8765
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from notify import has_changes
+from records import entrant_records
+from storage import TrackerStorage
+
+DEFAULT_PORT = int(os.getenv('DAEMON_PORT', '8765'))
+# Unchanged polls are written through at most this often
+QUIET_RECORD_HOURS = float(os.getenv('DAEMON_QUIET_RECORD_HOURS', '6'))
+# Consecutive failures before /health reports the event as failing
+MAX_FAILURES = 3
+
+
+class MemoryStorage(TrackerStorage):
+    """
+    Keeps an event's latest snapshot in memory and writes through to `inner`
+    only for polls that changed something (or a periodic quiet record).
+    """
+
+    def __init__(self, inner: TrackerStorage, quiet_record_hours: float = QUIET_RECORD_HOURS):
+        self.inner = inner
+        self.quiet_record = timedelta(hours=quiet_record_hours)
+        self.snapshot = None
+        self.last_written = None
+        self._write = False
+
+    def load_previous_data(self) -> dict:
+        if self.snapshot is None:
+            # Held as Entrant records between polls
+            snapshot = self.inner.load_previous_data()
+            self.snapshot = {**snapshot, 'entrants': entrant_records(snapshot.get('entrants', {}))}
+        return self.snapshot
+
+    def _quiet_record_due(self) -> bool:
+        return self.last_written is None or datetime.now() - self.last_written >= self.quiet_record
+
+    def save_changes(self, changes: dict):
+        # Called first in a poll, so it decides whether the rest is written
+        self._write = has_changes(changes) or bool(changes.get('total_modified')) or self._quiet_record_due()
+        if self._write:
+            self.inner.save_changes(changes)
+
+    def append_to_history(self, changes: dict):
+        if self._write:
+            self.inner.append_to_history(changes)
+
+    def save_current_data(self, data: dict):
+        changed = self.snapshot is None or data.get('entrants') != self.snapshot.get('entrants')
+        self.snapshot = data
+        if changed or self._write:
+            self._write = True
+            self.inner.save_current_data(data)
+
+    def publish(self):
+        if self._write:
+            self.inner.publish()
+            self.last_written = datetime.now()
+        self._write = False
+
+    def describe(self) -> str:
+        return f"memory, writing through to {self.inner.describe()}"
+
+
+class EventState:
+    """A tracked event plus the aggregates /status reports."""
+
+    def __init__(self, event, tracker):
+        self.event = event
+        self.tracker = tracker
+        self.key = event.key
+        self.interval_hours = event.interval_hours
+        self.next_poll = datetime.now()
+        self.polls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_poll = None
+        self.last_success = None
+        self.last_change = None
+        self.last_error = None
+        self.last_seconds = None
+        self.totals = {'new': 0, 'dropped': 0, 'modified': 0}
+
+    @property
+    def count(self) -> int:
+        snapshot = self.tracker.storage.snapshot
+        return snapshot.get('count', 0) if snapshot else 0
+
+    def healthy(self, now: datetime) -> bool:
+        if self.consecutive_failures >= MAX_FAILURES:
+            return False
+        # Overdue by a full interval means the loop is stuck
+        return now - self.next_poll < timedelta(hours=self.interval_hours) + timedelta(minutes=5)
+
+    def to_dict(self) -> dict:
+        def iso(value):
+            return value.isoformat() if value else None
+
+        return {
+            'key': self.key,
+            'name': self.tracker.event_name,
+            'count': self.count,
+            'interval_hours': round(self.interval_hours, 3),
+            'polls': self.polls,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_poll': iso(self.last_poll),
+            'last_success': iso(self.last_success),
+            'last_change': iso(self.last_change),
+            'last_error': self.last_error,
+            'last_poll_seconds': round(self.last_seconds, 3) if self.last_seconds is not None else None,
+            'next_poll': iso(self.next_poll),
+            'totals': self.totals,
+        }
+
+
+class TrackerDaemon:
+    def __init__(self, events: list, interval_minutes: float = None, notifier=None, storage_backend: str = None):
+        import requests
+
+        from scraper import EntrantTracker, make_storage
+
+        self.interval_minutes = interval_minutes
+        self.session = requests.Session()
+        self.started_at = datetime.now()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.states = {}
+        for event in events:
+            storage = MemoryStorage(make_storage(event.key, storage_backend))
+            tracker = EntrantTracker(event.key, storage=storage, notifier=notifier, session=self.session)
+            tracker.load_previous_data()
+            self.states[event.key] = EventState(event, tracker)
+        self.reschedule()
+
+    def reschedule(self):
+        """Set each event's interval from --interval or the adaptive scheduler."""
+        if self.interval_minutes:
+            for state in self.states.values():
+                state.interval_hours = self.interval_minutes / 60
+            return
+        from scheduler import plan
+
+        for schedule in plan([state.event for state in self.states.values()]):
+            self.states[schedule.key].interval_hours = schedule.interval_hours
+
+    def poll(self, state: EventState):
+        """Fetch and parse without the lock, so /health and /status answer during a slow fetch."""
+        tracker = state.tracker
+        started = time.perf_counter()
+        polled_at = datetime.now()
+        current = tracker.scrape_entrants()
+        with self.lock:
+            self._record(state, current, polled_at, started)
+
+    def _record(self, state: EventState, current: dict, polled_at: datetime, started: float):
+        """Diff a fetched snapshot into the in-memory state and update the /status aggregates."""
+        state.last_poll = polled_at
+        state.polls += 1
+        error = None
+        # scrape_entrants() reports a failed fetch as an empty list; don't diff it as everyone dropping out
+        if not current['entrants'] and state.count:
+            error = 'fetch or parse returned no entrants'
+        else:
+            try:
+                changes = state.tracker.process(current)
+            except Exception as e:
+                error = str(e)
+        state.last_seconds = time.perf_counter() - started
+        state.next_poll = state.last_poll + timedelta(hours=state.interval_hours)
+
+        if error:
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.last_error = error
+            print(f"Error polling {state.key}: {error}")
+            return
+        state.consecutive_failures = 0
+        state.last_success = state.last_poll
+        if has_changes(changes) or changes.get('total_modified'):
+            state.last_change = state.last_poll
+            state.totals['new'] += changes['total_new']
+            state.totals['dropped'] += changes['total_dropped']
+            state.totals['modified'] += changes['total_modified']
+
+    def run(self):
+        print(f"Daemon tracking {len(self.states)} event(s): {', '.join(self.states)}")
+        while not self.stop_event.is_set():
+            now = datetime.now()
+            due = [state for state in self.states.values() if state.next_poll <= now]
+            for state in due:
+                if self.stop_event.is_set():
+                    break
+                self.poll(state)
+            if due and not self.interval_minutes:
+                with self.lock:
+                    self.reschedule()
+                    for state in due:
+                        state.next_poll = state.last_poll + timedelta(hours=state.interval_hours)
+            next_poll = min(state.next_poll for state in self.states.values())
+            self.stop_event.wait(max(1.0, (next_poll - datetime.now()).total_seconds()))
+        self.session.close()
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+    def health(self) -> tuple:
+        now = datetime.now()
+        with self.lock:
+            unhealthy = [key for key, state in self.states.items() if not state.healthy(now)]
+        body = {
+            'status': 'degraded' if unhealthy else 'ok',
+            'started_at': self.started_at.isoformat(),
+            'uptime_seconds': round((now - self.started_at).total_seconds()),
+            'unhealthy': unhealthy,
+        }
+        return (503 if unhealthy else 200), body
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                'started_at': self.started_at.isoformat(),
+                'events': [state.to_dict() for state in self.states.values()],
+            }
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        daemon = self.server.tracker_daemon
+        if self.path.rstrip('/') == '/health':
+            code, body = daemon.health()
+        elif self.path.rstrip('/') in ('', '/status'):
+            code, body = 200, daemon.status()
+        else:
+            code, body = 404, {'error': 'not found'}
+        payload = json.dumps(body, indent=2).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_status(daemon: TrackerDaemon, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StatusHandler)
+    server.daemon_threads = True
+    server.tracker_daemon = daemon
+    threading.Thread(target=server.serve_forever, name='daemon-status', daemon=True).start()
+    return server
+
+
+def main():
+    import argparse
+
+    from events import load_registry
+    from outbox import start_outbox
+
+    parser = argparse.ArgumentParser(description='Track events continuously from one long-running process')
+    parser.add_argument('--event', '-e', action='append', help='Event key to track (repeatable; default: all enabled)')
+    parser.add_argument('--interval', type=float, help='Poll every N minutes instead of the adaptive schedule')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Health/status port on 127.0.0.1 (0 disables)')
+    parser.add_argument('--storage', choices=['files', 'sqlite'],
+                        help='Storage backend (overrides TRACKER_STORAGE env var)')
+    args = parser.parse_args()
+
+    registry = load_registry()
+    events = [registry.get(key) for key in args.event] if args.event else registry.enabled()
+
+    outbox, worker = start_outbox()
+    daemon = TrackerDaemon(events, args.interval, notifier=outbox, storage_backend=args.storage)
+    server = serve_status(daemon, port=args.port) if args.port else None
+    if server:
+        print(f"Status on http://127.0.0.1:{server.server_address[1]}/status")
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    try:
+        daemon.run()
+    finally:
+        if server:
+            server.shutdown()
+        if worker:
+            worker.stop()
+        print("✓ Daemon stopped")
+
+
+if __name__ == '__main__':
+    main()
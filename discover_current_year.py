@@ -3,36 +3,39 @@
 Discover current/next year Barkley Fall Classic registration.
 Given a seed DID (any year's event), navigate to registration and find the
 "See the current year event" link to auto-discover the next year's eid.
+Pages are fetched over plain HTTP; Chromium is used only if the link is missing.
 """
 
-from playwright.sync_api import sync_playwright
 import re
 import json
 
+from discovery_cache import cached
+from events import load_registry
+from ultrasignup import fetch_html, parse_current_event_link, register_url
 
-def discover_current_year_event(seed_did):
+
+def discover_current_year_event(seed_did, refresh=False):
     """
     Given a seed DID (from any BFC year), discover the current year registration.
+    Answers come from the discovery cache until they expire (or refresh=True).
     
     Returns: {year: int, eid: int, did_50k: int, registration_url: str}
     """
+    return cached(seed_did, 'current_event', lambda: _fetch_current_year_event(seed_did), refresh)
+
+
+def _fetch_current_year_event(seed_did):
     # Start from the seed event's registration page
-    reg_url = f"https://ultrasignup.com/register.aspx?did={seed_did}"
+    reg_url = register_url(did=seed_did)
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(reg_url, wait_until='domcontentloaded', timeout=60000)
-        
-        # Look for the "See the [year] event" link
-        link_elem = page.query_selector('a#ContentPlaceHolder1_hlCurrentEventPage')
-        if not link_elem:
-            browser.close()
-            return None
-        
-        href = link_elem.get_attribute('href')
-        link_text = link_elem.inner_text()
-        browser.close()
+    # The link is server-rendered; the browser is only a fallback
+    html = fetch_html(reg_url)
+    link = parse_current_event_link(html) if html else None
+    if link is None:
+        link = _browser_current_event_link(reg_url)
+    if link is None:
+        return None
+    href, link_text = link
     
     if not href or 'eid=' not in href:
         return None
@@ -50,30 +53,44 @@ def discover_current_year_event(seed_did):
     return {
         'year': year,
         'eid': eid,
-        'registration_url': f"https://ultrasignup.com/register.aspx?eid={eid}",
+        'registration_url': register_url(eid=eid),
         'href': href
     }
 
 
-def discover_year_50k_did(year_eid):
-    """
-    From a registration page EID, scrape the 50K event DID.
-    This will be used as the seed for fetching marathon DID via toggle links.
-    """
-    url = f"https://ultrasignup.com/register.aspx?eid={year_eid}"
-    
+def _browser_current_event_link(reg_url):
+    """(href, text) of the current-event link as rendered by Chromium, or None."""
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
-        page.goto(url, wait_until='domcontentloaded', timeout=60000)
+        page.goto(reg_url, wait_until='domcontentloaded', timeout=60000)
+        
+        # Look for the "See the [year] event" link
+        link_elem = page.query_selector('a#ContentPlaceHolder1_hlCurrentEventPage')
+        if not link_elem:
+            browser.close()
+            return None
         
-        # Look for a link to the event results or entry page that contains did=
-        # Often in the page there's a link like: /results_event.aspx?did=XXXXX
-        scripts = page.evaluate("document.documentElement.outerHTML")
+        href = link_elem.get_attribute('href')
+        link_text = link_elem.inner_text()
         browser.close()
+    return href, link_text
+
+
+def discover_year_50k_did(year_eid):
+    """
+    From a registration page EID, scrape the 50K event DID.
+    This will be used as the seed for fetching marathon DID via toggle links.
+    """
+    url = register_url(eid=year_eid)
     
-    # Search for did parameter in the HTML
-    matches = re.findall(r'did=(\d+)', scripts)
+    # Links like /results_event.aspx?did=XXXXX are in the static HTML; render with Chromium only if none are
+    html = fetch_html(url)
+    matches = re.findall(r'did=(\d+)', html) if html else []
+    if not matches:
+        matches = re.findall(r'did=(\d+)', _browser_html(url))
     if matches:
         # Return the first unique DID (likely the 50K)
         return int(matches[0])
@@ -81,14 +98,32 @@ def discover_year_50k_did(year_eid):
     return None
 
 
+def _browser_html(url):
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto(url, wait_until='domcontentloaded', timeout=60000)
+        html = page.evaluate("document.documentElement.outerHTML")
+        browser.close()
+    return html
+
+
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Discover the current year registration event')
+    parser.add_argument('--refresh', action='store_true', help='Ignore the discovery cache')
+    args = parser.parse_args()
+
     # Start with a known seed (2025 50K)
-    seed_did = 119817
+    seed_did = load_registry().series('barkley_fall_classic').seed_did
     
     print(f"Starting discovery from seed DID: {seed_did}")
-    print(f"Registration page: https://ultrasignup.com/register.aspx?did={seed_did}")
+    print(f"Registration page: {register_url(did=seed_did)}")
     
-    event = discover_current_year_event(seed_did)
+    event = discover_current_year_event(seed_did, refresh=args.refresh)
     print(f"\nDiscovered next year event:")
     print(json.dumps(event, indent=2))
     
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for UltraSignup discovery lookups.
+
+Finding the current year's registration event, a results page's sibling
+distances and the race date each take a page load, yet the answers change
+about once a year. Each answer is stored under the seed DID it was looked up
+from, with the time it was fetched, and reused until its fact's TTL runs out:
+
+    current_event   year, eid and registration URL    DISCOVERY_TTL_CURRENT_EVENT_HOURS (24)
+    siblings        {'50K': did, 'Marathon': did}     DISCOVERY_TTL_SIBLINGS_HOURS (720)
+    race_date       ISO date of the race              DISCOVERY_TTL_RACE_DATE_HOURS (168)
+
+Failed lookups are not cached. Entries remember the UltraSignup base URL they
+came from, so answers from the offline stand-in are never served for the real
+site. Pass refresh=True to a discovery function, or set DISCOVERY_REFRESH=1,
+to fetch again and overwrite the cached answer.
+
+Usage:
+    python discovery_cache.py show
+    python discovery_cache.py clear [--did 119817]
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import fileio
+from ultrasignup import base_url
+
+DEFAULT_CACHE_FILE = Path(__file__).parent / "data" / "discovery_cache.json"
+
+TTL_HOURS = {
+    'current_event': float(os.getenv('DISCOVERY_TTL_CURRENT_EVENT_HOURS', '24')),
+    'siblings': float(os.getenv('DISCOVERY_TTL_SIBLINGS_HOURS', str(30 * 24))),
+    'race_date': float(os.getenv('DISCOVERY_TTL_RACE_DATE_HOURS', str(7 * 24))),
+}
+
+
+def cache_file() -> Path:
+    # Read on every call, like ultrasignup.base_url(), so tests and benchmarks can redirect it
+    return Path(os.getenv('DISCOVERY_CACHE', DEFAULT_CACHE_FILE))
+
+
+def refresh_requested() -> bool:
+    return os.getenv('DISCOVERY_REFRESH', '').lower() in ('1', 'true', 'yes')
+
+
+class DiscoveryCache:
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else cache_file()
+        self._entries = None
+
+    @property
+    def entries(self) -> dict:
+        if self._entries is None:
+            try:
+                self._entries = fileio.read_json(self.path)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, seed_did, fact: str, now: datetime = None):
+        """The cached value, or None if missing, expired or from another host."""
+        entry = self.entries.get(str(seed_did), {}).get(fact)
+        if not entry or entry.get('base_url') != base_url():
+            return None
+        fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        if (now or datetime.now()) - fetched_at > timedelta(hours=TTL_HOURS[fact]):
+            return None
+        return entry['value']
+
+    def put(self, seed_did, fact: str, value):
+        self.entries.setdefault(str(seed_did), {})[fact] = {
+            'value': value,
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+            'base_url': base_url(),
+        }
+        self.save()
+
+    def lookup(self, seed_did, fact: str, fetch, refresh: bool = False):
+        """Cached value for (seed_did, fact), calling fetch() on a miss or refresh."""
+        if not (refresh or refresh_requested()):
+            value = self.get(seed_did, fact)
+            if value is not None:
+                return value
+        value = fetch()
+        if value:
+            self.put(seed_did, fact, value)
+        return value
+
+    def clear(self, seed_did=None):
+        if seed_did is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(str(seed_did), None)
+        self.save()
+
+    def save(self):
+        fileio.write_json(self.path, self.entries, sort_keys=True)
+
+
+def cached(seed_did, fact: str, fetch, refresh: bool = False):
+    """Look up one fact in the cache file named by DISCOVERY_CACHE (or the default)."""
+    return DiscoveryCache().lookup(seed_did, fact, fetch, refresh)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect or clear the discovery cache')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('show', help='Print cached facts and their age')
+    clear = sub.add_parser('clear', help='Forget cached facts')
+    clear.add_argument('--did', help='Only this seed DID')
+    args = parser.parse_args()
+
+    cache = DiscoveryCache()
+    if args.command == 'clear':
+        cache.clear(args.did)
+        print(f"✓ Cleared {'DID ' + args.did if args.did else 'all entries'} in {cache.path}")
+        return
+
+    now = datetime.now()
+    for did, facts in sorted(cache.entries.items()):
+        print(f"{did}:")
+        for fact, entry in sorted(facts.items()):
+            age = now - datetime.fromisoformat(entry['fetched_at'])
+            fresh = 'fresh' if cache.get(did, fact, now) is not None else 'stale'
+            print(f"  {fact:<14} {json.dumps(entry['value'])}  ({age.total_seconds() / 3600:.1f} h old, {fresh})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Event registry: the single list of tracked races and historical series.
+
+events.json holds every tracked event (key, UltraSignup DID, distance,
+capacity, schedule) and every results series (DIDs per year and distance).
+Adding a race is a data change. load_registry() parses it once per process,
+builds indexes by key and DID, and reloads only when the file changes.
+Runners can split the registry with shard(), which uses a stable hash of the
+event key so an event always lands on the same shard.
+
+Usage:
+    python events.py list
+    python events.py list --shard 0/4
+    python events.py export            # data/event_list.json for the dashboard
+"""
+
+import os
+import zlib
+from pathlib import Path
+
+import fileio
+import jsonio
+from ultrasignup import entrants_url
+
+REGISTRY_FILE = Path(os.getenv('EVENTS_REGISTRY', Path(__file__).parent / "events.json"))
+EVENT_LIST_FILE = Path("data") / "event_list.json"
+
+DEFAULT_INTERVAL_HOURS = 24
+# Bounds for the adaptive scheduler (scheduler.py) unless an event sets its own
+DEFAULT_MIN_INTERVAL_HOURS = 1
+DEFAULT_MAX_INTERVAL_HOURS = 72
+
+
+class Event:
+    def __init__(self, data: dict):
+        self.key = data['key']
+        self.name = data.get('name', self.key)
+        self.display_name = data.get('display_name') or self.name
+        self.did = data.get('did')
+        self.distance = data.get('distance')
+        self.capacity = data.get('capacity')
+        self.series = data.get('series')
+        self.schedule = data.get('schedule') or {}
+        self.enabled = data.get('enabled', True)
+        self.data = data
+        if self.did is None and not data.get('url'):
+            raise ValueError(f"Event {self.key} needs a 'did' or 'url'")
+
+    @property
+    def url(self) -> str:
+        return self.data.get('url') or entrants_url(self.did)
+
+    @property
+    def interval_hours(self) -> float:
+        return float(self.schedule.get('interval_hours', DEFAULT_INTERVAL_HOURS))
+
+    @property
+    def min_interval_hours(self) -> float:
+        return float(self.schedule.get('min_interval_hours', DEFAULT_MIN_INTERVAL_HOURS))
+
+    @property
+    def max_interval_hours(self) -> float:
+        return float(self.schedule.get('max_interval_hours', DEFAULT_MAX_INTERVAL_HOURS))
+
+    def public(self) -> dict:
+        """Fields the dashboard needs."""
+        return {
+            'key': self.key,
+            'name': self.display_name,
+            'distance': self.distance,
+            'capacity': self.capacity,
+        }
+
+    def __repr__(self):
+        return f"Event({self.key!r}, did={self.did})"
+
+
+class Series:
+    """A race's results pages by year and distance, for the historical scraper."""
+
+    def __init__(self, key: str, data: dict):
+        self.key = key
+        self.name = data.get('name', key)
+        self.distances = data.get('distances', [])
+        self.seed_did = data.get('seed_did')
+        self.editions = {
+            int(year): {distance: int(did) for distance, did in dids.items()}
+            for year, dids in data.get('editions', {}).items()
+        }
+
+    def dids(self, year: int) -> tuple:
+        """DIDs for one year in `distances` order, e.g. (50K did, Marathon did)."""
+        return tuple(self.editions[year].get(distance) for distance in self.distances)
+
+    def by_year(self) -> dict:
+        return {year: self.dids(year) for year in sorted(self.editions, reverse=True)}
+
+
+class EventRegistry:
+    def __init__(self, data: dict, path: Path = None):
+        self.path = path
+        self.events = []
+        self._by_key = {}
+        self._by_did = {}
+        for item in data.get('events', []):
+            event = Event(item)
+            if event.key in self._by_key:
+                raise ValueError(f"Duplicate event key in registry: {event.key}")
+            if event.did is not None and event.did in self._by_did:
+                raise ValueError(f"Duplicate DID in registry: {event.did} ({event.key}, {self._by_did[event.did].key})")
+            self.events.append(event)
+            self._by_key[event.key] = event
+            if event.did is not None:
+                self._by_did[event.did] = event
+        self._series = {key: Series(key, value) for key, value in data.get('series', {}).items()}
+
+    @classmethod
+    def load(cls, path=REGISTRY_FILE):
+        path = Path(path)
+        return cls(jsonio.load(path), path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def get(self, key: str) -> Event:
+        if key not in self._by_key:
+            raise KeyError(f"Unknown event key: {key}")
+        return self._by_key[key]
+
+    def by_did(self, did: int):
+        return self._by_did.get(int(did))
+
+    def keys(self) -> list:
+        return [event.key for event in self.events]
+
+    def enabled(self) -> list:
+        return [event for event in self.events if event.enabled]
+
+    def shard(self, index: int, count: int) -> list:
+        """Enabled events whose key hashes to shard `index` of `count`."""
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard {index}/{count}")
+        return [e for e in self.enabled() if zlib.crc32(e.key.encode('utf-8')) % count == index]
+
+    def series(self, key: str) -> Series:
+        if key not in self._series:
+            raise KeyError(f"Unknown series: {key}")
+        return self._series[key]
+
+    def event_list(self) -> list:
+        return [event.public() for event in self.enabled()]
+
+
+_cache = {}
+
+
+def load_registry(path=None) -> EventRegistry:
+    """Registry for `path` (default events.json), re-read only when the file changes."""
+    path = Path(path or REGISTRY_FILE)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    registry = EventRegistry.load(path)
+    _cache[path] = (signature, registry)
+    return registry
+
+
+def parse_shard(value: str):
+    """'2/8' -> (2, 8); None or '' -> None."""
+    if not value:
+        return None
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard must look like INDEX/COUNT, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {value}")
+    return index, count
+
+
+def export_event_list(registry: EventRegistry = None, output=EVENT_LIST_FILE):
+    """Write the dashboard's event list; skips the write when nothing changed."""
+    registry = registry or load_registry()
+    output = Path(output)
+    body = jsonio.encode(registry.event_list())
+    if output.exists() and output.read_bytes() == body:
+        return output
+    fileio.write_bytes(output, body)
+    return output
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect the event registry')
+    parser.add_argument('command', choices=['list', 'export'])
+    parser.add_argument('--registry', default=str(REGISTRY_FILE), help='Registry file')
+    parser.add_argument('--shard', help='Only events in shard INDEX/COUNT')
+    parser.add_argument('--output', '-o', default=str(EVENT_LIST_FILE), help='Event list output (export)')
+    args = parser.parse_args()
+
+    registry = load_registry(args.registry)
+    if args.command == 'export':
+        output = export_event_list(registry, args.output)
+        print(f"✓ Wrote {len(registry.enabled())} events to {output}")
+        return
+
+    shard = parse_shard(args.shard)
+    events = registry.shard(*shard) if shard else registry.events
+    for event in events:
+        state = '' if event.enabled else ' (disabled)'
+        print(f"  {event.key:<24} did={str(event.did or '-'):<8} every {event.interval_hours:g}h  {event.name}{state}")
+    print(f"{len(events)} of {len(registry)} events")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Safe writes for the data files.
+
+atomic_write() writes to a temporary file in the target's directory and
+renames it over the target, so a reader (or a crash) sees either the old file
+or the new one, never a truncated one. lock(name) is an advisory
+cross-process lock (flock on data/.locks/{name}.lock) for read-modify-write
+sequences: one per event ("event-frozen_head_50k"), per report or per
+results file. It is re-entrant within a process, so nested helpers can take
+the same lock.
+
+BFC_FSYNC picks how hard writes are pushed to disk:
+    none    rename only (survives a crashed process, not a power cut)
+    data    fsync the file before the rename (default)
+    full    also fsync the directory after the rename, and fsync appends
+
+    with lock('event-frozen_head_50k'):
+        write_json(path, data)
+        append_line(log_path, jsonio.dumps(entry))
+
+Cold and append-only files that the static pages never fetch (the results
+archive, the correction and run-report logs) are written to cold_path(),
+which adds .gz or .zst when BFC_COMPRESS is gzip or zstd. Writing one
+variant removes the others. read_bytes(), read_json() and open_text() find
+whichever variant is on disk, so readers take the plain name. Appends to a
+compressed log add one frame each, and read_frames() can resume from a
+frame boundary. zstd needs the optional zstandard package.
+
+Usage:
+    python fileio.py compress data/historical/barkley_archive_complete.json
+    python fileio.py decompress data/historical/corrections.jsonl.gz
+"""
+
+import gzip
+import io
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+import jsonio
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks are per process only
+    fcntl = None
+
+LOCK_DIR = Path(os.getenv('BFC_LOCK_DIR', Path(__file__).parent / "data" / ".locks"))
+FSYNC_POLICIES = ('none', 'data', 'full')
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+FRAME_READ_SIZE = 64 * 1024
+
+
+def fsync_policy() -> str:
+    policy = os.getenv('BFC_FSYNC', 'data').lower()
+    return policy if policy in FSYNC_POLICIES else 'data'
+
+
+def _fsync_dir(directory: Path):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # not supported on this platform
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path, mode: str = 'w', newline: str = None, fsync: str = None):
+    """Open a temporary file for writing that replaces `path` when the block succeeds."""
+    path = Path(path)
+    policy = fsync or fsync_policy()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    encoding = None if 'b' in mode else 'utf-8'
+    try:
+        with open(tmp, mode, encoding=encoding, newline=newline) as f:
+            yield f
+            f.flush()
+            if policy != 'none':
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if policy == 'full':
+        _fsync_dir(path.parent)
+
+
+def compression() -> str:
+    """Codec for cold and append-only files: BFC_COMPRESS=none (default), gzip or zstd."""
+    codec = os.getenv('BFC_COMPRESS', 'none').lower()
+    return codec if codec in COMPRESSION_SUFFIXES else 'none'
+
+
+def codec_for(path):
+    """'gzip' or 'zstd' from a stored file's suffix, None for a plain file."""
+    suffix = Path(path).suffix
+    for codec, codec_suffix in COMPRESSION_SUFFIXES.items():
+        if suffix == codec_suffix:
+            return codec
+    return None
+
+
+def logical_path(path) -> Path:
+    """The plain name of a stored file: results.json for results.json.gz."""
+    path = Path(path)
+    return path.with_suffix('') if codec_for(path) else path
+
+
+def variants(path) -> list:
+    """Every name `path` may be stored under: plain first, then each codec."""
+    plain = logical_path(path)
+    return [plain] + [plain.with_name(plain.name + suffix) for suffix in COMPRESSION_SUFFIXES.values()]
+
+
+def cold_path(path) -> Path:
+    """Where a cold or append-only file is written under the current BFC_COMPRESS setting."""
+    plain = logical_path(path)
+    codec = compression()
+    return plain if codec == 'none' else plain.with_name(plain.name + COMPRESSION_SUFFIXES[codec])
+
+
+def find(path):
+    """The variant of `path` that exists on disk (`path` itself first), or None."""
+    path = Path(path)
+    for candidate in [path] + [v for v in variants(path) if v != path]:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd files need the zstandard package (pip install zstandard)") from None
+    return zstandard
+
+
+def compress(content: bytes, codec: str) -> bytes:
+    """One self-contained frame. Frames can be concatenated and still decode as one stream."""
+    if codec == 'gzip':
+        # mtime=0 keeps the bytes identical for identical content, so git sees no change
+        return gzip.compress(content, compresslevel=6, mtime=0)
+    if codec == 'zstd':
+        return _zstd().ZstdCompressor(level=10).compress(content)
+    return content
+
+
+def iter_frames(content: bytes, codec: str, offset: int = 0):
+    """
+    Yield (end offset, decompressed bytes) for each frame from byte `offset` on.
+    Appends to a compressed log are separate frames, so a reader that keeps the
+    last end offset can later decode only what was appended after it.
+    """
+    view = memoryview(content)
+    while offset < len(view):
+        decoder = zlib.decompressobj(wbits=31) if codec == 'gzip' else _zstd().ZstdDecompressor().decompressobj()
+        parts, fed = [], offset
+        while not decoder.eof:
+            if fed >= len(view):
+                raise ValueError(f"Truncated {codec} frame at byte {offset}")
+            parts.append(decoder.decompress(view[fed:fed + FRAME_READ_SIZE]))
+            fed = min(fed + FRAME_READ_SIZE, len(view))
+        offset = fed - len(decoder.unused_data)
+        yield offset, b''.join(parts)
+
+
+def decompress(content: bytes, codec: str) -> bytes:
+    if codec == 'gzip':
+        return gzip.decompress(content)  # reads every member
+    if codec == 'zstd':
+        return b''.join(frame for _, frame in iter_frames(content, codec))
+    return content
+
+
+def read_bytes(path) -> bytes:
+    """Contents of `path`, or of its compressed variant, decompressed."""
+    stored = find(path)
+    if stored is None:
+        raise FileNotFoundError(path)
+    return decompress(stored.read_bytes(), codec_for(stored))
+
+
+def read_json(path):
+    return jsonio.loads(read_bytes(path))
+
+
+def open_text(path, newline: str = None):
+    """Text stream over `path` or its compressed variant, decompressing as it reads."""
+    stored = find(path)
+    if stored is None:
+        raise FileNotFoundError(path)
+    codec = codec_for(stored)
+    if codec == 'gzip':
+        return gzip.open(stored, 'rt', encoding='utf-8', newline=newline)
+    if codec == 'zstd':
+        reader = _zstd().ZstdDecompressor().stream_reader(open(stored, 'rb'), read_across_frames=True)
+        return io.TextIOWrapper(reader, encoding='utf-8', newline=newline)
+    return open(stored, encoding='utf-8', newline=newline)
+
+
+def read_frames(path, offset: int = 0):
+    """(end offset, bytes) per appended frame of a log; a plain file is a single frame."""
+    stored = find(path)
+    if stored is None:
+        return
+    codec = codec_for(stored)
+    content = stored.read_bytes()
+    if codec is None:
+        if offset < len(content):
+            yield len(content), content[offset:]
+        return
+    yield from iter_frames(content, codec, offset)
+
+
+def _drop_variants(path: Path):
+    """Remove the other stored variants of `path`, so readers never see a stale twin."""
+    for other in variants(path):
+        if other != path:
+            other.unlink(missing_ok=True)
+
+
+def write_bytes(path, content: bytes):
+    """Atomically replace `path`, compressed if its suffix is .gz or .zst."""
+    path = Path(path)
+    with atomic_write(path, 'wb') as f:
+        f.write(compress(content, codec_for(path)))
+    _drop_variants(path)
+
+
+def write_json(path, data, pretty: bool = None, sort_keys: bool = False):
+    """Write JSON as jsonio.encode() does: compact unless pretty or BFC_JSON_PRETTY."""
+    write_bytes(path, jsonio.encode(data, pretty, sort_keys))
+
+
+def write_text(path, text: str):
+    write_bytes(path, text.encode('utf-8'))
+
+
+def _adopt(path: Path):
+    """Before the first append under a new name, carry over the log stored under another variant."""
+    if path.exists():
+        return
+    stored = find(path)
+    if stored is not None:
+        write_bytes(path, read_bytes(stored))
+
+
+@contextmanager
+def append(path, newline: str = None, fsync: str = None):
+    """
+    Open `path` for appending; flushed (and fsynced under the 'full' policy) on
+    exit. For a .gz or .zst log, what the block writes is appended as one frame.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _adopt(path)
+    codec = codec_for(path)
+    if codec is None:
+        with open(path, 'a', encoding='utf-8', newline=newline) as f:
+            yield f
+            f.flush()
+            if (fsync or fsync_policy()) == 'full':
+                os.fsync(f.fileno())
+        return
+
+    buffer = io.StringIO(newline=newline)
+    yield buffer
+    frame = compress(buffer.getvalue().encode('utf-8'), codec)
+    with open(path, 'ab') as f:
+        f.write(frame)
+        f.flush()
+        if (fsync or fsync_policy()) == 'full':
+            os.fsync(f.fileno())
+
+
+def append_line(path, line: str):
+    """Append one line in a single write, so concurrent appenders don't interleave."""
+    with append(path) as f:
+        f.write(line.rstrip('\n') + '\n')
+
+
+class _Lock:
+    def __init__(self, name: str):
+        self.name = name
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+@contextmanager
+def lock(name: str):
+    """Advisory cross-process lock named after an event, report or file."""
+    with _locks_guard:
+        held = _locks.setdefault(name, _Lock(name))
+    with held.thread_lock:
+        if held.depth == 0 and fcntl is not None:
+            LOCK_DIR.mkdir(parents=True, exist_ok=True)
+            held.file = open(LOCK_DIR / f"{name}.lock", 'a')
+            fcntl.flock(held.file.fileno(), fcntl.LOCK_EX)
+        held.depth += 1
+        try:
+            yield
+        finally:
+            held.depth -= 1
+            if held.depth == 0 and held.file is not None:
+                fcntl.flock(held.file.fileno(), fcntl.LOCK_UN)
+                held.file.close()
+                held.file = None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert data files between plain and compressed storage')
+    parser.add_argument('command', choices=['compress', 'decompress'])
+    parser.add_argument('files', nargs='+', type=Path)
+    parser.add_argument('--codec', choices=list(COMPRESSION_SUFFIXES), default='gzip')
+    args = parser.parse_args()
+
+    for path in args.files:
+        stored = find(path)
+        if stored is None:
+            print(f"✗ Not found: {path}")
+            continue
+        plain = logical_path(stored)
+        target = plain if args.command == 'decompress' else plain.with_name(plain.name + COMPRESSION_SUFFIXES[args.codec])
+        before = stored.stat().st_size
+        write_bytes(target, read_bytes(stored))
+        print(f"✓ {stored.name} ({before / 1024:.0f} KB) → {target.name} ({target.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
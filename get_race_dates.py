@@ -2,22 +2,51 @@
 """
 Get the race date and important dates for a given year.
 Allows dynamic workflow scheduling based on actual race dates.
+The date is read from the static results page; Chromium is only a fallback.
 """
 
-from playwright.sync_api import sync_playwright
 from datetime import datetime, timedelta
-import re
 
+from discovery_cache import cached
+from events import load_registry
+from ultrasignup import fetch_html, parse_race_date, parse_race_date_text, results_url
 
-def get_race_date_for_year(seed_did):
+
+def get_race_date_for_year(seed_did, refresh=False):
     """
     Get the race date from the UltraSignup event page.
+    Answers come from the discovery cache until they expire (or refresh=True).
     
     Args: seed_did - any DID for the year (50K or Marathon)
     Returns: datetime object of race date, or None if not found
     """
-    url = f"https://ultrasignup.com/results_event.aspx?did={seed_did}"
+    race_date = cached(seed_did, 'race_date', lambda: _fetch_race_date(seed_did), refresh)
+    return datetime.fromisoformat(race_date) if race_date else None
+
+
+def _fetch_race_date(seed_did):
+    """ISO date of the race from the results page, or None."""
+    url = results_url(seed_did)
     
+    # Look for date in format "Month DD, YYYY" in the static HTML, then in the rendered page
+    html = fetch_html(url)
+    parts = parse_race_date(html) if html else None
+    if parts is None:
+        parts = parse_race_date_text(_browser_body_text(url))
+    
+    if parts:
+        try:
+            month_name, day, year = parts
+            return datetime.strptime(f"{month_name} {day} {year}", "%B %d %Y").date().isoformat()
+        except ValueError:
+            pass
+    
+    return None
+
+
+def _browser_body_text(url):
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
@@ -26,19 +55,7 @@ def get_race_date_for_year(seed_did):
         # Get text content
         text = page.text_content('body')
         browser.close()
-    
-    # Look for date in format "Month DD, YYYY"
-    import re
-    match = re.search(r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),?\s+(\d{4})', text)
-    
-    if match:
-        try:
-            month_name, day, year = match.groups()
-            return datetime.strptime(f"{month_name} {day} {year}", "%B %d %Y")
-        except ValueError:
-            pass
-    
-    return None
+    return text
 
 
 def calculate_workflow_dates(race_date):
@@ -77,16 +94,20 @@ def calculate_workflow_dates(race_date):
 
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Race dates and workflow dates for recent years')
+    parser.add_argument('--refresh', action='store_true', help='Ignore the discovery cache')
+    args = parser.parse_args()
+
     # Test with 2025 race
     print("Getting race dates for historical years...")
     
-    test_dids = {
-        2025: 119817,  # 2025 50K
-        2024: 108870,  # 2024 50K
-    }
+    editions = load_registry().series('barkley_fall_classic').editions
+    test_dids = {year: editions[year]['50K'] for year in sorted(editions, reverse=True)[:2]}
     
     for year, did in test_dids.items():
-        race_date = get_race_date_for_year(did)
+        race_date = get_race_date_for_year(did, refresh=args.refresh)
         if race_date:
             print(f"\n{year} Race Date: {race_date.strftime('%B %d, %Y')}")
             dates = calculate_workflow_dates(race_date)
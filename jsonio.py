@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+JSON encoding and decoding for the data files.
+
+Uses orjson when it is installed and the stdlib json module otherwise. Output
+is byte-identical except for floats below 1e-4 or from 1e16 up in magnitude,
+which the two format differently (orjson 6e-6 and 1e20, json 6e-06 and 1e+20).
+The data files hold counts, seconds and rounded rates, so none of those occur
+today. Keep new float fields rounded so files don't churn between a run with
+orjson and one without.
+
+Data files are read by scripts and the static pages, not people, so they are
+written compact: no indentation, no spaces after separators, non-ASCII kept
+as UTF-8. Set
+BFC_JSON_PRETTY=1 (or pass pretty=True) to write them indented for
+debugging, or view a compact file with:
+
+    python jsonio.py data/changes_frozen_head_50k.json
+
+Dict keys that are not strings (ints, e.g. year-keyed tables) are written as
+strings by both backends, as json.dump does. Records with a to_dict() (the
+NamedTuples in records.py) are written as that dict by both backends.
+orjson would otherwise reject them, and json would write them as lists.
+"""
+
+import json
+import os
+from pathlib import Path
+
+# orjson, or False when it is not installed. Imported on first use: the import
+# (~10 ms, it pulls in uuid and zoneinfo) would otherwise land on every command
+_orjson = None
+
+
+def _fast():
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson
+            _orjson = orjson
+        except ImportError:
+            _orjson = False
+    return _orjson
+
+
+def backend() -> str:
+    return 'orjson' if _fast() else 'json'
+
+
+def pretty_requested() -> bool:
+    return os.getenv('BFC_JSON_PRETTY', '').lower() in ('1', 'true', 'yes')
+
+
+def _record_dict(value):
+    """orjson default= hook: records as their dicts."""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _plain(value):
+    """Records as dicts, recursively; json would write a NamedTuple as a list."""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if hasattr(value, 'to_dict'):
+            return _plain(value.to_dict())
+        return [_plain(item) for item in value]
+    return value
+
+
+def encode(data, pretty: bool = None, sort_keys: bool = False) -> bytes:
+    """UTF-8 JSON bytes; compact unless pretty (or BFC_JSON_PRETTY) is set."""
+    if pretty is None:
+        pretty = pretty_requested()
+    orjson = _fast()
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=_record_dict, option=option)
+    data = _plain(data)
+    if pretty:
+        text = json.dumps(data, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    else:
+        text = json.dumps(data, separators=(',', ':'), sort_keys=sort_keys, ensure_ascii=False)
+    return text.encode('utf-8')
+
+
+def dumps(data, pretty: bool = None, sort_keys: bool = False) -> str:
+    """encode() as a str, e.g. for one JSONL line."""
+    return encode(data, pretty, sort_keys).decode('utf-8')
+
+
+def loads(content):
+    """Decode JSON from str or bytes."""
+    orjson = _fast()
+    if orjson:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def load(path):
+    """Read and decode a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def main():
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Pretty-print a compact JSON data file')
+    parser.add_argument('file', type=Path)
+    parser.add_argument('--sort-keys', action='store_true')
+    args = parser.parse_args()
+
+    sys.stdout.buffer.write(encode(load(args.file), pretty=True, sort_keys=args.sort_keys) + b'\n')
+
+
+if __name__ == '__main__':
+    main()
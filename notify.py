@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Email notifications for entrant list changes.
+
+NotificationDigest collects changes from every tracked event during a run and
+sends one digest email per recipient over a single SMTP session at the end,
+instead of one connection (and TLS handshake and login) per changed event.
+
+Configuration (environment):
+    SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS
+    NOTIFY_FROM
+    NOTIFY_TO                   comma-separated recipients for every event
+    NOTIFY_TO_<EVENT_KEY>       recipients for one event, e.g. NOTIFY_TO_FROZEN_HEAD_50K
+"""
+
+import os
+import smtplib
+from email.message import EmailMessage
+
+import timing
+
+# Names listed per section before the rest are summarised
+MAX_NAMES = 25
+
+
+def _split(value: str) -> list:
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+
+class SMTPConfig:
+    def __init__(self, host=None, port=None, user=None, password=None, sender=None, recipients=None):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.sender = sender
+        self.recipients = recipients or []
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            host=os.getenv('SMTP_HOST'),
+            port=int(os.getenv('SMTP_PORT')) if os.getenv('SMTP_PORT') else None,
+            user=os.getenv('SMTP_USER'),
+            password=os.getenv('SMTP_PASS'),
+            sender=os.getenv('NOTIFY_FROM'),
+            recipients=_split(os.getenv('NOTIFY_TO')),
+        )
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.host and self.sender)
+
+    def recipients_for(self, event_key: str) -> list:
+        """Per-event override, else the global list."""
+        override = os.getenv(f"NOTIFY_TO_{event_key.upper()}")
+        return _split(override) if override is not None else self.recipients
+
+    def connect(self) -> smtplib.SMTP:
+        if self.port:
+            server = smtplib.SMTP(self.host, self.port, timeout=10)
+        else:
+            server = smtplib.SMTP(self.host, timeout=10)
+        server.ehlo()
+        if server.has_extn('starttls'):
+            server.starttls()
+            server.ehlo()
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        return server
+
+
+def has_changes(changes: dict) -> bool:
+    return bool(changes.get('count_change') or changes.get('total_new') or changes.get('total_dropped'))
+
+
+def _names(entrants: list) -> list:
+    lines = [f"  - {e['first_name']} {e['last_name']} ({e.get('location', '')})" for e in entrants[:MAX_NAMES]]
+    if len(entrants) > MAX_NAMES:
+        lines.append(f"  ... and {len(entrants) - MAX_NAMES} more")
+    return lines
+
+
+def format_event(event_name: str, changes: dict) -> list:
+    """Plain-text section for one event."""
+    lines = [
+        f"{event_name}",
+        f"  Time: {changes['timestamp']}",
+        f"  Count: {changes['previous_count']} → {changes['new_count']} ({changes['count_change']:+d})",
+    ]
+    if changes.get('new_entrants'):
+        lines.append(f"  New entrants ({changes['total_new']}):")
+        lines.extend(_names(changes['new_entrants']))
+    if changes.get('dropped_entrants'):
+        lines.append(f"  Dropped entrants ({changes['total_dropped']}):")
+        lines.extend(_names(changes['dropped_entrants']))
+    if changes.get('total_modified'):
+        lines.append(f"  Updated entrants: {changes['total_modified']}")
+    return lines
+
+
+class NotificationDigest:
+    """Collects per-event changes during a run and sends them as one email per recipient."""
+
+    def __init__(self, config: SMTPConfig = None):
+        self.config = config or SMTPConfig.from_env()
+        self.events = []
+
+    def add(self, event_key: str, event_name: str, changes: dict):
+        if has_changes(changes):
+            self.events.append((event_key, event_name, changes))
+
+    def build_messages(self) -> list:
+        by_recipient = {}
+        for event_key, event_name, changes in self.events:
+            for recipient in self.config.recipients_for(event_key):
+                by_recipient.setdefault(recipient, []).append((event_name, changes))
+
+        messages = []
+        for recipient, events in by_recipient.items():
+            net = sum(changes['count_change'] for _, changes in events)
+            if len(events) == 1:
+                subject = f"[{events[0][0]}] Entrant list changed: {net:+d}"
+            else:
+                subject = f"Entrant lists changed for {len(events)} events: {net:+d}"
+
+            body = []
+            for event_name, changes in events:
+                body.extend(format_event(event_name, changes))
+                body.append('')
+
+            msg = EmailMessage()
+            msg['Subject'] = subject
+            msg['From'] = self.config.sender
+            msg['To'] = recipient
+            msg.set_content('\n'.join(body))
+            messages.append(msg)
+        return messages
+
+    @timing.timed('notify')
+    def send(self) -> int:
+        """Send all digests over one SMTP session; returns the number of messages sent."""
+        if not self.events or not self.config.configured:
+            return 0
+        messages = self.build_messages()
+        if not messages:
+            return 0
+
+        sent = 0
+        try:
+            server = self.config.connect()
+            try:
+                for msg in messages:
+                    server.send_message(msg)
+                    sent += 1
+            finally:
+                server.quit()
+            print(f"✓ Sent {sent} notification digest(s) covering {len(self.events)} event(s)")
+        except Exception as e:
+            print(f"Warning: failed to send notifications ({sent}/{len(messages)} sent): {e}")
+        timing.add('messages_sent', sent)
+        return sent
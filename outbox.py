@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Persistent notification outbox with an asyncio delivery worker.
+
+The tracker only enqueues: each change becomes a JSON file in
+data/outbox/pending/ (id = hash of event key + change timestamp, so the same
+change is never queued twice). OutboxWorker delivers pending items to every
+configured sink concurrently, retries failures with exponential backoff, and
+moves items to sent/ or (after MAX_ATTEMPTS) failed/. At the end of a run the
+worker waits up to OUTBOX_DRAIN_SECONDS, retrying through short backoffs.
+Anything still undelivered stays on disk for the next run or a long-running
+`python outbox.py worker`. data/outbox/ is gitignored, so scrape.yml carries it
+between runners in the Actions cache.
+
+Sinks (environment):
+    smtp      SMTP_HOST, NOTIFY_FROM, NOTIFY_TO... (see notify.py); one digest
+              per recipient per batch (OUTBOX_SMTP_BATCH_SECONDS, or the end of
+              a run), over one session
+    webhook   NOTIFY_WEBHOOK_URL        generic JSON POST (X-Idempotency-Key header)
+    slack     NOTIFY_SLACK_WEBHOOK_URL  Slack-compatible {"text": ...} POST
+
+Usage:
+    python outbox.py status
+    python outbox.py worker            # deliver until interrupted
+    python outbox.py worker --once     # deliver what is due, then exit
+    python outbox.py retry-failed      # move failed items back to pending
+"""
+
+import asyncio
+import hashlib
+import os
+import random
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import fileio
+import jsonio
+from notify import MAX_NAMES, NotificationDigest, SMTPConfig, has_changes
+
+DEFAULT_OUTBOX_DIR = Path("data") / "outbox"
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 15 * 60
+SENT_RETENTION_DAYS = 30
+
+# How long a run waits for queued notifications before leaving them on disk
+DRAIN_SECONDS = float(os.getenv('OUTBOX_DRAIN_SECONDS', '30'))
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter: ~2s, 4s, 8s ... capped at 15 minutes."""
+    delay = min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def summary_payload(item: dict) -> dict:
+    """JSON body for webhook sinks: counts plus new/dropped names."""
+    changes = item['changes']
+
+    def names(entrants):
+        return [f"{e['first_name']} {e['last_name']}" for e in entrants]
+
+    return {
+        'id': item['id'],
+        'event_key': item['event_key'],
+        'event_name': item['event_name'],
+        'timestamp': changes['timestamp'],
+        'count_change': changes['count_change'],
+        'previous_count': changes['previous_count'],
+        'new_count': changes['new_count'],
+        'total_new': changes.get('total_new', 0),
+        'total_dropped': changes.get('total_dropped', 0),
+        'total_modified': changes.get('total_modified', 0),
+        'new_entrants': names(changes.get('new_entrants', [])),
+        'dropped_entrants': names(changes.get('dropped_entrants', [])),
+    }
+
+
+class SMTPSink:
+    name = 'smtp'
+    # Hold items this long (or until the run drains) so one digest covers many events
+    batch_window = float(os.getenv('OUTBOX_SMTP_BATCH_SECONDS', '60'))
+
+    def __init__(self, config: SMTPConfig):
+        self.config = config
+
+    def deliver(self, items: list) -> dict:
+        """
+        All due items go out as one digest per recipient over one session. An
+        item counts as delivered once every digest it is in was sent, so a
+        failure part-way retries only items in digests that did not go out.
+        """
+        digest = NotificationDigest(self.config)
+        for item in items:
+            digest.add(item['event_key'], item['event_name'], item['changes'])
+        messages = digest.build_messages()
+        failed = {}
+        if messages:
+            server = self.config.connect()
+            try:
+                for i, msg in enumerate(messages):
+                    try:
+                        server.send_message(msg)
+                    except smtplib.SMTPServerDisconnected as e:
+                        # The session is gone: nothing after this was sent either
+                        for unsent in messages[i:]:
+                            failed[unsent['To']] = f"{type(e).__name__}: {e}"
+                        break
+                    except smtplib.SMTPException as e:
+                        # Refused for this recipient only (SMTPException is an OSError, so check it first)
+                        failed[msg['To']] = f"{type(e).__name__}: {e}"
+                    except OSError as e:
+                        for unsent in messages[i:]:
+                            failed[unsent['To']] = f"{type(e).__name__}: {e}"
+                        break
+            finally:
+                try:
+                    server.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+
+        results = {}
+        for item in items:
+            errors = [failed[r] for r in self.config.recipients_for(item['event_key']) if r in failed]
+            results[item['id']] = errors[0] if errors else None
+        return results
+
+
+class WebhookSink:
+    name = 'webhook'
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+        import requests
+
+        self.session = requests.Session()
+
+    def body(self, item: dict) -> dict:
+        return summary_payload(item)
+
+    def deliver(self, items: list) -> dict:
+        """POST each item; returns {id: error or None}."""
+        import requests
+
+        results = {}
+        for item in items:
+            try:
+                response = self.session.post(
+                    self.url, json=self.body(item), timeout=self.timeout,
+                    headers={'X-Idempotency-Key': item['id']}
+                )
+                response.raise_for_status()
+                results[item['id']] = None
+            except requests.RequestException as e:
+                results[item['id']] = str(e)
+        return results
+
+
+class SlackSink(WebhookSink):
+    name = 'slack'
+
+    def body(self, item: dict) -> dict:
+        payload = summary_payload(item)
+        lines = [
+            f"*{payload['event_name']}*: {payload['previous_count']} → {payload['new_count']} "
+            f"({payload['count_change']:+d})"
+        ]
+        for label, key in (('New', 'new_entrants'), ('Dropped', 'dropped_entrants')):
+            names = payload[key]
+            if names:
+                shown = ', '.join(names[:MAX_NAMES])
+                more = f" and {len(names) - MAX_NAMES} more" if len(names) > MAX_NAMES else ''
+                lines.append(f"{label} ({len(names)}): {shown}{more}")
+        if payload['total_modified']:
+            lines.append(f"Updated: {payload['total_modified']}")
+        return {'text': '\n'.join(lines)}
+
+
+def configured_sinks() -> list:
+    """Sinks enabled by the current environment."""
+    sinks = []
+    config = SMTPConfig.from_env()
+    if config.configured:
+        sinks.append(SMTPSink(config))
+    if os.getenv('NOTIFY_WEBHOOK_URL'):
+        sinks.append(WebhookSink(os.getenv('NOTIFY_WEBHOOK_URL')))
+    if os.getenv('NOTIFY_SLACK_WEBHOOK_URL'):
+        sinks.append(SlackSink(os.getenv('NOTIFY_SLACK_WEBHOOK_URL')))
+    return sinks
+
+
+class Outbox:
+    """On-disk queue of notifications; one JSON file per change."""
+
+    def __init__(self, root=DEFAULT_OUTBOX_DIR, sinks: list = None):
+        self.root = Path(root)
+        self.sinks = configured_sinks() if sinks is None else sinks
+        self.pending_dir = self.root / "pending"
+        self.sent_dir = self.root / "sent"
+        self.failed_dir = self.root / "failed"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def item_id(event_key: str, changes: dict) -> str:
+        return hashlib.sha1(f"{event_key}|{changes['timestamp']}".encode('utf-8')).hexdigest()[:16]
+
+    def add(self, event_key: str, event_name: str, changes: dict):
+        """Queue a change for every configured sink (same interface as NotificationDigest)."""
+        return self.enqueue(event_key, event_name, changes)
+
+    def enqueue(self, event_key: str, event_name: str, changes: dict):
+        """Write a pending item; returns its id, or None if unchanged, unconfigured or a duplicate."""
+        if not self.sinks or not has_changes(changes):
+            return None
+        item_id = self.item_id(event_key, changes)
+        with self._lock:
+            if any((d / f"{item_id}.json").exists() for d in (self.pending_dir, self.sent_dir, self.failed_dir)):
+                return None
+            self.save({
+                'id': item_id,
+                'event_key': event_key,
+                'event_name': event_name,
+                'changes': changes,
+                'created_at': datetime.now().isoformat(),
+                'created_ts': time.time(),
+                'pending_sinks': [sink.name for sink in self.sinks],
+                'attempts': {},
+                'next_attempt_at': {},
+                'errors': {},
+            })
+        return item_id
+
+    def save(self, item: dict, directory: Path = None):
+        directory = directory or self.pending_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        fileio.write_json(directory / f"{item['id']}.json", item)
+
+    def _move(self, item: dict, directory: Path):
+        self.save(item, directory)
+        (self.pending_dir / f"{item['id']}.json").unlink(missing_ok=True)
+
+    def _load_dir(self, directory: Path) -> list:
+        items = []
+        for path in sorted(directory.glob("*.json")) if directory.exists() else []:
+            try:
+                items.append(jsonio.load(path))
+            except (OSError, ValueError):
+                continue
+        items.sort(key=lambda item: item['created_at'])
+        return items
+
+    def pending(self) -> list:
+        return self._load_dir(self.pending_dir)
+
+    def failed(self) -> list:
+        return self._load_dir(self.failed_dir)
+
+    def due(self, sink_name: str, now: float = None) -> list:
+        now = time.time() if now is None else now
+        return [
+            item for item in self.pending()
+            if sink_name in item['pending_sinks'] and item['next_attempt_at'].get(sink_name, 0) <= now
+        ]
+
+    def next_due_at(self) -> float:
+        """
+        Earliest retry time over pending deliveries to configured sinks (None if
+        there are none). Items for a sink no longer configured wait on disk
+        until it is configured again, without holding up a drain.
+        """
+        configured = {sink.name for sink in self.sinks}
+        times = [
+            item['next_attempt_at'].get(sink, 0)
+            for item in self.pending() for sink in item['pending_sinks'] if sink in configured
+        ]
+        return min(times) if times else None
+
+    def record(self, item_id: str, sink_name: str, error: str = None):
+        """Record one delivery attempt and move the item on when it is settled."""
+        with self._lock:
+            path = self.pending_dir / f"{item_id}.json"
+            if not path.exists():
+                return
+            item = jsonio.load(path)
+
+            if error is None:
+                item['pending_sinks'] = [s for s in item['pending_sinks'] if s != sink_name]
+                item['errors'].pop(sink_name, None)
+                item['next_attempt_at'].pop(sink_name, None)
+            else:
+                attempts = item['attempts'].get(sink_name, 0) + 1
+                item['attempts'][sink_name] = attempts
+                item['errors'][sink_name] = error
+                item['next_attempt_at'][sink_name] = time.time() + backoff_seconds(attempts)
+
+            if not item['pending_sinks']:
+                item['delivered_at'] = datetime.now().isoformat()
+                self._move(item, self.sent_dir)
+            elif all(item['attempts'].get(s, 0) >= MAX_ATTEMPTS for s in item['pending_sinks']):
+                self._move(item, self.failed_dir)
+            else:
+                self.save(item)
+
+    def retry_failed(self) -> int:
+        items = self.failed()
+        for item in items:
+            item['attempts'] = {}
+            item['next_attempt_at'] = {}
+            self.save(item)
+            (self.failed_dir / f"{item['id']}.json").unlink(missing_ok=True)
+        return len(items)
+
+    def prune_sent(self, days: int = SENT_RETENTION_DAYS) -> int:
+        """Drop delivered items older than the retention window (kept for dedup)."""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        removed = 0
+        for item in self._load_dir(self.sent_dir):
+            if item.get('delivered_at', item['created_at']) < cutoff:
+                (self.sent_dir / f"{item['id']}.json").unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class OutboxWorker:
+    """Delivers due outbox items to all sinks concurrently; never blocks the tracker."""
+
+    def __init__(self, outbox: Outbox, poll_interval: float = 0.5, drain_seconds: float = DRAIN_SECONDS):
+        self.outbox = outbox
+        self.poll_interval = poll_interval
+        self.drain_seconds = drain_seconds
+        self.draining = False
+
+    async def _deliver_sink(self, sink) -> int:
+        items = self.outbox.due(sink.name)
+        window = getattr(sink, 'batch_window', 0)
+        if window and not self.draining:
+            cutoff = time.time() - window
+            if all(item.get('created_ts', 0) > cutoff for item in items):
+                return 0
+        if not items:
+            return 0
+        try:
+            results = await asyncio.to_thread(sink.deliver, items)
+        except Exception as e:
+            results = {item['id']: f"{type(e).__name__}: {e}" for item in items}
+        for item_id, error in results.items():
+            self.outbox.record(item_id, sink.name, error)
+            if error:
+                print(f"Warning: {sink.name} delivery of {item_id} failed: {error}")
+        return sum(1 for error in results.values() if error is None)
+
+    async def deliver_due(self) -> int:
+        """One delivery round across every sink; returns successful deliveries."""
+        counts = await asyncio.gather(*(self._deliver_sink(sink) for sink in self.outbox.sinks))
+        return sum(counts)
+
+    async def run(self, stop: threading.Event = None, drain_seconds: float = None):
+        """
+        Deliver until `stop` is set, then keep going for up to drain_seconds while
+        anything is pending, sleeping through retry backoffs that end before the
+        deadline. Items whose next attempt falls later are left on disk.
+        drain_seconds defaults to self.drain_seconds, read when the drain starts.
+        """
+        stop = stop or threading.Event()
+        deadline = None
+        while True:
+            self.draining = stop.is_set()
+            await self.deliver_due()
+            if self.draining:
+                if deadline is None:
+                    deadline = time.monotonic() + (self.drain_seconds if drain_seconds is None else drain_seconds)
+                next_due = self.outbox.next_due_at()
+                remaining = deadline - time.monotonic()
+                if next_due is None or remaining <= 0 or next_due - time.time() > remaining:
+                    return
+                await asyncio.sleep(min(max(next_due - time.time(), self.poll_interval), remaining))
+                continue
+            await asyncio.sleep(self.poll_interval)
+
+
+class BackgroundWorker:
+    """Runs an OutboxWorker on its own thread and event loop alongside a scrape."""
+
+    def __init__(self, outbox: Outbox, poll_interval: float = 0.5):
+        self.worker = OutboxWorker(outbox, poll_interval)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='outbox-worker', daemon=True)
+
+    def _run(self):
+        asyncio.run(self.worker.run(self._stop))
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = DRAIN_SECONDS):
+        """Ask the worker to drain for up to `timeout` seconds and wait for it."""
+        self.worker.drain_seconds = timeout
+        self._stop.set()
+        self._thread.join(timeout + 5)
+        pending = len(self.worker.outbox.pending())
+        if pending:
+            print(f"Warning: {pending} notification(s) still pending in {self.worker.outbox.pending_dir}; "
+                  f"they are retried only if this directory is kept for the next run")
+
+
+def start_outbox():
+    """(outbox, background worker) for a tracker run, or (None, None) with no sinks configured."""
+    outbox = Outbox()
+    if not outbox.sinks:
+        return None, None
+    outbox.prune_sent()
+    return outbox, BackgroundWorker(outbox).start()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect and deliver the notification outbox')
+    parser.add_argument('command', choices=['status', 'worker', 'retry-failed'])
+    parser.add_argument('--outbox', default=str(DEFAULT_OUTBOX_DIR), help='Outbox directory')
+    parser.add_argument('--once', action='store_true', help='Deliver what is due now, then exit')
+    parser.add_argument('--poll', type=float, default=5.0, help='Seconds between delivery rounds')
+    args = parser.parse_args()
+
+    outbox = Outbox(args.outbox)
+    if args.command == 'status':
+        print(f"Outbox: {outbox.root}")
+        print(f"  Sinks:   {', '.join(s.name for s in outbox.sinks) or '(none configured)'}")
+        pending = outbox.pending()
+        print(f"  Pending: {len(pending)}")
+        for item in pending:
+            errors = '; '.join(f"{s}: {e}" for s, e in item['errors'].items())
+            print(f"    {item['id']} {item['event_key']} {item['changes']['timestamp'][:16]} "
+                  f"-> {', '.join(item['pending_sinks'])} {errors}")
+        print(f"  Failed:  {len(outbox.failed())}")
+    elif args.command == 'retry-failed':
+        print(f"✓ Re-queued {outbox.retry_failed()} failed notification(s)")
+    else:
+        if not outbox.sinks:
+            print("No notification sinks configured")
+            return
+        worker = OutboxWorker(outbox, poll_interval=args.poll)
+        if args.once:
+            worker.draining = True
+            delivered = asyncio.run(worker.deliver_due())
+            print(f"✓ Delivered {delivered} notification(s)")
+            return
+        print(f"Delivering to {', '.join(s.name for s in outbox.sinks)} (Ctrl-C to stop)")
+        try:
+            asyncio.run(worker.run())
+        except KeyboardInterrupt:
+            print("\nStopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Content-addressed archive of raw scraped pages.
+
+Every scrape stores what it fetched (entrant page HTML, jqGrid row payloads)
+as a gzip object named by the SHA-256 of its bytes, so identical pages are
+stored once. manifest.jsonl records each capture (kind, key, url, digest,
+time, metadata). Parser fixes can then be applied by re-parsing the archive
+locally instead of re-crawling UltraSignup.
+
+Layout:
+    data/raw/objects/ab/abcdef....gz
+    data/raw/manifest.jsonl
+
+Usage:
+    python page_archive.py stats
+    python page_archive.py verify                    # every object reads back to its digest
+    python page_archive.py reparse                   # results + entrants, all cores
+    python page_archive.py reparse --kind results --analyze
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import fileio
+import jsonio
+
+DEFAULT_ARCHIVE_DIR = Path("data") / "raw"
+
+# Capture kinds
+ENTRANTS = 'entrants'          # entrants_event.aspx HTML, key = event key
+RESULTS_GRID = 'results_grid'  # jqGrid rows as JSON, key = "{year}_{distance}"
+
+
+class PageArchive:
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifest_file = self.root / "manifest.jsonl"
+        self._lock = threading.Lock()
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.gz"
+
+    def put(self, kind: str, key: str, content: bytes, url: str = None, **meta) -> str:
+        """Store content (deduplicated) and record a capture; returns its digest."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            # write_bytes gzips by the .gz suffix
+            fileio.write_bytes(path, content)
+
+        entry = {
+            'kind': kind,
+            'key': key,
+            'sha256': digest,
+            'size': len(content),
+            'captured_at': datetime.now().isoformat(),
+        }
+        if url:
+            entry['url'] = url
+        if meta:
+            entry['meta'] = meta
+        with self._lock:
+            fileio.append_line(self.manifest_file, jsonio.dumps(entry))
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Object content, checked against its digest."""
+        content = fileio.read_bytes(self.object_path(digest))
+        if hashlib.sha256(content).hexdigest() != digest and content[:2] == b'\x1f\x8b':
+            # Objects put between the suffix codec and this fix were gzipped twice
+            content = gzip.decompress(content)
+        if hashlib.sha256(content).hexdigest() != digest:
+            raise ValueError(f"Archive object {digest} is corrupt")
+        return content
+
+    def verify(self) -> list:
+        """Digests of manifest objects that are missing or don't read back as stored."""
+        bad = []
+        for digest in sorted({entry['sha256'] for entry in self.captures()}):
+            try:
+                self.get(digest)
+            except (OSError, ValueError):
+                bad.append(digest)
+        return bad
+
+    def captures(self, kind: str = None) -> list:
+        """All manifest entries in capture order, optionally for one kind."""
+        if not self.manifest_file.exists():
+            return []
+        entries = []
+        with open(self.manifest_file) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = jsonio.loads(line)
+                if kind is None or entry['kind'] == kind:
+                    entries.append(entry)
+        return entries
+
+    def latest(self, kind: str) -> dict:
+        """Most recent capture per key for one kind."""
+        return {entry['key']: entry for entry in self.captures(kind)}
+
+    def stats(self) -> dict:
+        entries = self.captures()
+        digests = {e['sha256'] for e in entries}
+        stored = sum(self.object_path(d).stat().st_size for d in digests if self.object_path(d).exists())
+        return {
+            'captures': len(entries),
+            'objects': len(digests),
+            'raw_bytes': sum(e['size'] for e in entries),
+            'unique_bytes': sum({e['sha256']: e['size'] for e in entries}.values()),
+            'stored_bytes': stored,
+            'kinds': sorted({e['kind'] for e in entries}),
+        }
+
+
+def default_archive():
+    """Archive the scrapers write to, or None when RAW_ARCHIVE=0."""
+    if os.getenv('RAW_ARCHIVE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return PageArchive(os.getenv('RAW_ARCHIVE_DIR', DEFAULT_ARCHIVE_DIR))
+
+
+def archive_quietly(archive, kind: str, key: str, content: bytes, url: str = None, **meta):
+    """Archive a capture without ever failing the scrape that produced it."""
+    if archive is None:
+        return None
+    try:
+        return archive.put(kind, key, content, url=url, **meta)
+    except OSError as e:
+        print(f"Warning: failed to archive raw {kind} page: {e}")
+        return None
+
+
+def reparse_capture(root: str, entry: dict):
+    """Rebuild the derived JSON for one capture (runs in a worker process)."""
+    archive = PageArchive(root)
+    content = archive.get(entry['sha256'])
+    if entry['kind'] == RESULTS_GRID:
+        from scraper_historical import build_results
+        meta = entry['meta']
+        return build_results(jsonio.loads(content), meta['year'], meta['distance'], meta['did'],
+                             scraped_at=entry['captured_at'])
+    if entry['kind'] == ENTRANTS:
+        from scraper import parse_entrants_html
+        snapshot = parse_entrants_html(content)
+        snapshot['timestamp'] = entry['captured_at']
+        return snapshot
+    raise ValueError(f"Unknown capture kind: {entry['kind']}")
+
+
+def reparse(archive: PageArchive, entries: list, workers: int = None) -> list:
+    """Re-parse captures across a process pool; returns results in entry order."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not entries:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(reparse_capture, [str(archive.root)] * len(entries), entries))
+
+
+def write_results(results: list):
+    """Write per-year results files and reassemble the complete archive from them."""
+    from scraper_historical import DATA_DIR, RESULTS_DIR, save_results, write_archive
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    for result in results:
+        save_results(result)
+
+    # Years the raw archive doesn't cover keep their existing results files
+    write_archive()
+    return fileio.find(DATA_DIR / "barkley_archive_complete.json")
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Inspect and re-parse the raw page archive')
+    parser.add_argument('command', choices=['stats', 'verify', 'reparse'])
+    parser.add_argument('--archive', default=os.getenv('RAW_ARCHIVE_DIR', str(DEFAULT_ARCHIVE_DIR)),
+                        help='Archive directory')
+    parser.add_argument('--kind', choices=['results', 'entrants', 'all'], default='all',
+                        help='Which derived data to rebuild')
+    parser.add_argument('--workers', '-j', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--analyze', action='store_true', help='Regenerate historical analysis afterwards')
+    parser.add_argument('--dry-run', action='store_true', help='Parse but do not write anything')
+    args = parser.parse_args()
+
+    archive = PageArchive(args.archive)
+    if args.command == 'stats':
+        stats = archive.stats()
+        print(f"Archive: {archive.root}")
+        print(f"  Captures:     {stats['captures']}")
+        print(f"  Objects:      {stats['objects']}")
+        print(f"  Raw bytes:    {stats['raw_bytes']:,}")
+        print(f"  Unique bytes: {stats['unique_bytes']:,}")
+        print(f"  Stored bytes: {stats['stored_bytes']:,} (gzip)")
+        print(f"  Kinds:        {', '.join(stats['kinds']) or '-'}")
+        return
+    if args.command == 'verify':
+        bad = archive.verify()
+        for digest in bad:
+            print(f"  ✗ {digest}")
+        if bad:
+            raise SystemExit(f"{len(bad)} object(s) missing or corrupt")
+        print(f"✓ All {archive.stats()['objects']} objects read back intact")
+        return
+
+    started = time.perf_counter()
+    if args.kind in ('results', 'all'):
+        entries = list(archive.latest(RESULTS_GRID).values())
+        results = reparse(archive, entries, args.workers)
+        for result in results:
+            print(f"  {result['year']} {result['distance']:<8} {len(result['finishers'])} rows")
+        if results and not args.dry_run:
+            archive_file = write_results(results)
+            print(f"✓ Rebuilt {len(results)} results files and {archive_file}")
+            if args.analyze:
+                from analyzer_historical import HistoricalAnalyzer
+                HistoricalAnalyzer().generate_all_analysis()
+
+    if args.kind in ('entrants', 'all'):
+        from scraper import EVENTS, make_storage
+        entries = [e for e in archive.latest(ENTRANTS).values() if e['key'] in EVENTS]
+        snapshots = reparse(archive, entries, args.workers)
+        for entry, snapshot in zip(entries, snapshots):
+            print(f"  {entry['key']:<20} {snapshot['count']} entrants (captured {entry['captured_at'][:16]})")
+            if not snapshot['entrants']:
+                # Never replace a real snapshot with an empty parse
+                print(f"  Skipping {entry['key']}: no entrants parsed")
+                continue
+            if not args.dry_run:
+                # Same per-event lock as the trackers, so a cron run or daemon poll can't interleave
+                with fileio.lock(f"event-{entry['key']}"):
+                    storage = make_storage(entry['key'])
+                    storage.save_current_data(snapshot)
+                    storage.publish()
+        if snapshots and not args.dry_run:
+            print(f"✓ Rebuilt {len(snapshots)} entrant snapshots")
+
+    print(f"Re-parse finished in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
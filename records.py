@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Compact record types for entrants, finishers and participations.
+
+Snapshots and results files are lists of dicts that repeat the same keys on
+every row, and most values (states, age groups, statuses, distances) come
+from a handful of strings. These NamedTuples store fields by position with no
+per-row dict, and the low-cardinality values are interned so all rows share
+one string object. to_dict() returns exactly the dicts written to the JSON
+files, so the formats on disk don't change.
+"""
+
+import hashlib
+import sys
+from typing import NamedTuple, Optional
+
+ENTRANT_FIELDS = ('first_name', 'last_name', 'city', 'location', 'age')
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def fields_digest(values) -> str:
+    """Compact digest of entrant field values in ENTRANT_FIELDS order."""
+    raw = '\x1f'.join(str(value or '') for value in values)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def entrant_digest(entrant: dict) -> str:
+    """Compact digest of an entrant's fields; equal digests mean nothing changed."""
+    return fields_digest(entrant.get(field) for field in ENTRANT_FIELDS)
+
+
+class Entrant(NamedTuple):
+    """One entrant of an entrants_{key}.json snapshot."""
+    first_name: str
+    last_name: str
+    city: str
+    location: str
+    age: str
+    digest: str
+
+    @classmethod
+    def create(cls, first_name, last_name, city, location, age):
+        values = (first_name, last_name, _intern(city), _intern(location), _intern(age))
+        return cls(*values, fields_digest(values))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        values = (data.get('first_name'), data.get('last_name'), _intern(data.get('city')),
+                  _intern(data.get('location')), _intern(data.get('age')))
+        return cls(*values, data.get('digest') or fields_digest(values))
+
+    def to_dict(self) -> dict:
+        """The entrants_{key}.json form."""
+        return self._asdict()
+
+    def change_entry(self, key: str) -> dict:
+        """The form used in change records: entrant fields plus its key, no digest."""
+        return {'first_name': self.first_name, 'last_name': self.last_name, 'city': self.city,
+                'location': self.location, 'age': self.age, 'key': key}
+
+
+def as_entrant(entrant) -> Entrant:
+    return entrant if isinstance(entrant, Entrant) else Entrant.from_dict(entrant)
+
+
+def entrant_records(entrants: dict) -> dict:
+    """{key: Entrant} from a snapshot's entrants, whether dicts or records."""
+    return {key: as_entrant(entrant) for key, entrant in entrants.items()}
+
+
+def snapshot_dict(snapshot: dict) -> dict:
+    """A snapshot with its entrants as plain dicts, for writing JSON."""
+    return {
+        **snapshot,
+        'entrants': {
+            key: entrant.to_dict() if isinstance(entrant, Entrant) else entrant
+            for key, entrant in snapshot.get('entrants', {}).items()
+        },
+    }
+
+
+class Finisher(NamedTuple):
+    """One row of a results_{year}_{distance}.json file."""
+    year: Optional[int] = None
+    distance: Optional[str] = None
+    place: Optional[int] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    age: Optional[int] = None
+    division: Optional[str] = None
+    status: Optional[str] = None
+    finish_time_seconds: Optional[int] = None
+    finish_time_formatted: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict, **overrides):
+        """Missing fields become None, like dict.get(); `overrides` replace fields (e.g. year=...)."""
+        values = {field: data.get(field) for field in cls._fields}
+        values.update(overrides)
+        for field in ('distance', 'city', 'state', 'division', 'status'):
+            values[field] = _intern(values[field])
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class Participation(NamedTuple):
+    """One race a runner started, as listed in analysis/veterans.json."""
+    year: int
+    distance: str
+    status: str
+    place: Optional[int]
+    finish_time_seconds: Optional[int]
+    finish_time_formatted: str
+    age: Optional[int]
+    city: str
+    state: str
+    division: str
+    display_name: str
+
+    @classmethod
+    def from_finisher(cls, finisher: dict, year: int, distance: str, display_name: str):
+        return cls(
+            year=year,
+            distance=_intern(distance),
+            status=_intern(finisher.get('status', 'Unknown')),
+            place=finisher.get('place'),
+            finish_time_seconds=finisher.get('finish_time_seconds'),
+            finish_time_formatted=finisher.get('finish_time_formatted', ''),
+            age=finisher.get('age'),
+            city=_intern(finisher.get('city', '')),
+            state=_intern(finisher.get('state', '')),
+            division=_intern(finisher.get('division', '')),
+            display_name=display_name,
+        )
+
+    def to_dict(self) -> dict:
+        return self._asdict()
@@ -1,24 +1,35 @@
 """Resolve 50K/Marathon DIDs for each year by reading toggle links."""
-from playwright.sync_api import sync_playwright
+import argparse
+
+from discovery_cache import cached
+from events import load_registry
+from ultrasignup import fetch_html, parse_toggle_links, results_url, sibling_dids
 
 # Known 50K DIDs as seeds (from the toggle block we already trust)
 SEED_50K = {
-    2025: 119817,
-    2024: 108870,
-    2023: 97857,
-    2022: 88170,
-    2021: 79789,
-    2020: 71482,
-    2019: 60848,
-    2018: 50528,
-    2017: 41232,
-    2016: 34630,
-    2015: 32215,
+    year: dids['50K']
+    for year, dids in load_registry().series('barkley_fall_classic').editions.items()
 }
 
 
-def resolve_links(seed_did):
-    url = f"https://ultrasignup.com/results_event.aspx?did={seed_did}"
+def resolve_links(seed_did, refresh=False):
+    # Sibling DIDs never change once published, so most years come from the discovery cache
+    return cached(seed_did, 'siblings', lambda: fetch_links(seed_did), refresh)
+
+
+def fetch_links(seed_did):
+    url = results_url(seed_did)
+    html = fetch_html(url)
+    links = parse_toggle_links(html) if html else None
+    if links is None:
+        links = browser_links(url)
+    return sibling_dids(links)
+
+
+def browser_links(url):
+    """Toggle links as rendered by Chromium, for pages whose static HTML lacks them."""
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
@@ -36,26 +47,17 @@ def resolve_links(seed_did):
             """
         )
         browser.close()
-    mapping = {}
-    for link in links:
-        href = link.get('href','')
-        text = link.get('text','').lower()
-        if 'did=' in href:
-            try:
-                did_val = int(href.split('did=')[1].split('#')[0])
-            except ValueError:
-                continue
-            if '50k' in text:
-                mapping['50K'] = did_val
-            elif 'marathon' in text:
-                mapping['Marathon'] = did_val
-    return mapping
+    return links
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--refresh", action="store_true", help="Ignore the discovery cache")
+    args = parser.parse_args()
+
     results = {}
     for year, seed in sorted(SEED_50K.items()):
-        mapping = resolve_links(seed)
+        mapping = resolve_links(seed, refresh=args.refresh)
         results[year] = mapping
         print(f"{year}: {mapping}")
     print("\nFinal mapping:")
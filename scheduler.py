@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Adaptive polling schedule driven by each event's observed change rate.
+
+For every event the scheduler reads history_{key}.csv (or the change log if
+there is no history yet) and keeps a time-weighted EWMA of admits + drops
+per hour. The next poll is due after the time it takes to expect
+TARGET_CHANGES_PER_POLL changes, clamped to the event's
+min/max_interval_hours from events.json. Quiet events drift towards the
+maximum interval and busy ones (lottery week) towards the minimum. When the
+plan would spend more polls per day than the fixed schedule did
+(sum of 24 / interval_hours), all intervals are stretched to fit that budget.
+
+Usage:
+    python scheduler.py                 # show the plan
+    python scripts/run_all.py --due-only
+"""
+
+import csv
+import json
+import os
+from datetime import datetime, timedelta
+
+import fileio
+from events import load_registry
+from scraper import data_paths_for
+
+HALF_LIFE_HOURS = float(os.getenv('SCHEDULER_HALF_LIFE_HOURS', '72'))
+TARGET_CHANGES_PER_POLL = float(os.getenv('SCHEDULER_TARGET_CHANGES', '1'))
+# Runs this close to the next poll count as due (cron granularity)
+SLACK_MINUTES = float(os.getenv('SCHEDULER_SLACK_MINUTES', '10'))
+
+
+def load_polls(key: str) -> list:
+    """[(timestamp, admits + drops)] per recorded poll, oldest first."""
+    _, changes_file, history_file = data_paths_for(key)
+    polls = []
+    if fileio.find(history_file):
+        with fileio.open_text(history_file, newline='') as f:
+            for row in csv.DictReader(f):
+                try:
+                    polls.append((datetime.fromisoformat(row['Date']),
+                                  int(row['New_Entrants']) + int(row['Dropped_Entrants'])))
+                except (KeyError, ValueError):
+                    continue
+    elif fileio.find(changes_file):
+        for record in fileio.read_json(changes_file):
+            polls.append((datetime.fromisoformat(record['timestamp']),
+                          record.get('total_new', 0) + record.get('total_dropped', 0)))
+    polls.sort(key=lambda poll: poll[0])
+    return polls
+
+
+def change_rate(polls: list, half_life_hours: float = HALF_LIFE_HOURS) -> float:
+    """
+    Time-weighted EWMA of changes per hour. Each poll's rate is weighted by how
+    much time it covers, so a long quiet gap counts for more than a short one.
+    """
+    rate = None
+    for (prev_time, _), (time, changes) in zip(polls, polls[1:]):
+        hours = (time - prev_time).total_seconds() / 3600
+        if hours <= 0:
+            continue
+        observed = changes / hours
+        weight = 1 - 0.5 ** (hours / half_life_hours)
+        rate = observed if rate is None else rate + weight * (observed - rate)
+    return rate or 0.0
+
+
+class EventSchedule:
+    def __init__(self, event, last_poll, rate: float, interval_hours: float):
+        self.event = event
+        self.key = event.key
+        self.last_poll = last_poll
+        self.rate = rate
+        self.interval_hours = interval_hours
+
+    @property
+    def next_poll(self):
+        if self.last_poll is None:
+            return None
+        return self.last_poll + timedelta(hours=self.interval_hours)
+
+    def is_due(self, now: datetime = None, slack_minutes: float = SLACK_MINUTES) -> bool:
+        now = now or datetime.now()
+        return self.next_poll is None or now >= self.next_poll - timedelta(minutes=slack_minutes)
+
+    def to_dict(self) -> dict:
+        return {
+            'key': self.key,
+            'last_poll': self.last_poll.isoformat() if self.last_poll else None,
+            'changes_per_day': round(self.rate * 24, 3),
+            'interval_hours': round(self.interval_hours, 2),
+            'next_poll': self.next_poll.isoformat() if self.next_poll else None,
+        }
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def _intervals(raw: list, events: list, scale: float) -> list:
+    return [_clamp(r * scale, e.min_interval_hours, e.max_interval_hours) for r, e in zip(raw, events)]
+
+
+def plan(events: list = None, budget_per_day: float = None) -> list:
+    """Schedule for each event; budget_per_day defaults to the fixed schedule's polls/day."""
+    events = events if events is not None else load_registry().enabled()
+    if not events:
+        return []
+    if budget_per_day is None:
+        budget_per_day = sum(24 / e.interval_hours for e in events)
+
+    polls = [load_polls(e.key) for e in events]
+    rates = [change_rate(p) for p in polls]
+    # Hours until TARGET_CHANGES_PER_POLL changes are expected; no history keeps the fixed interval
+    raw = [
+        TARGET_CHANGES_PER_POLL / rate if rate > 0 else (e.max_interval_hours if len(p) > 1 else e.interval_hours)
+        for e, p, rate in zip(events, polls, rates)
+    ]
+
+    # Stretch every interval (never shrink) until the plan fits the budget
+    scale = 1.0
+    if sum(24 / h for h in _intervals(raw, events, 1.0)) > budget_per_day:
+        low, high = 1.0, 1e4
+        for _ in range(60):
+            mid = (low + high) / 2
+            if sum(24 / h for h in _intervals(raw, events, mid)) > budget_per_day:
+                low = mid
+            else:
+                high = mid
+        scale = high
+
+    return [
+        EventSchedule(e, p[-1][0] if p else None, rate, interval)
+        for e, p, rate, interval in zip(events, polls, rates, _intervals(raw, events, scale))
+    ]
+
+
+def due_events(events: list = None, now: datetime = None, budget_per_day: float = None) -> list:
+    """Events whose next poll is due now."""
+    now = now or datetime.now()
+    return [s.event for s in plan(events, budget_per_day) if s.is_due(now)]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show the adaptive polling plan')
+    parser.add_argument('--budget', type=float, help='Max polls per day across all events')
+    parser.add_argument('--json', action='store_true', help='Print the plan as JSON')
+    args = parser.parse_args()
+
+    now = datetime.now()
+    schedules = plan(budget_per_day=args.budget)
+    if args.json:
+        print(json.dumps([s.to_dict() for s in schedules], indent=2))
+        return
+
+    print(f"{'event':<24} {'changes/day':>11} {'interval':>9}  {'next poll':<16}  due")
+    for s in schedules:
+        next_poll = s.next_poll.strftime('%Y-%m-%d %H:%M') if s.next_poll else 'now'
+        print(f"{s.key:<24} {s.rate * 24:>11.2f} {s.interval_hours:>8.1f}h  {next_poll:<16}  {'yes' if s.is_due(now) else ''}")
+    print(f"\n{sum(24 / s.interval_hours for s in schedules):.1f} polls/day planned")
+
+
+if __name__ == '__main__':
+    main()
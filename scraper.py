@@ -4,33 +4,30 @@ Ultramarathon Entrant List Tracker
 Scrapes and tracks changes in entrant lists from UltraSignup
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-import csv
+import os
+import unicodedata
+from difflib import SequenceMatcher
 from datetime import datetime
 from pathlib import Path
-import hashlib
+
+import fileio
+import timing
+from notify import NotificationDigest, has_changes
+from page_archive import ENTRANTS, archive_quietly, default_archive
+from events import load_registry
+from records import ENTRANT_FIELDS, Entrant, entrant_records
+from storage import FileStorage, SQLiteStorage
 
 # Configuration
-# Map of event keys to (display name, url). Add more events here as needed.
-EVENTS = {
-    'frozen_head_50k': (
-        'Frozen Head 50K',
-        'https://ultrasignup.com/entrants_event.aspx?did=131025'
-    ),
-    'other_race_50m': (
-        'Other Race 50 Miler',
-        'https://ultrasignup.com/entrants_event.aspx?did=127637'
-    ),
-    'other_race_55k': (
-        'Other Race 55K',
-        'https://ultrasignup.com/entrants_event.aspx?did=127638'
-    )
-}
+# Map of event keys to (display name, url), built from the registry.
+# Add events to events.json, not here.
+EVENTS = {event.key: (event.name, event.url) for event in load_registry().events}
 
 DATA_DIR = Path("data")
 
+# Storage backend for tracker state: 'files' (default) or 'sqlite'
+STORAGE_BACKEND = os.getenv('TRACKER_STORAGE', 'files')
+
 def data_paths_for(key: str):
     """Return per-event data file paths for given event key."""
     DATA_DIR.mkdir(exist_ok=True)
@@ -40,8 +37,129 @@ def data_paths_for(key: str):
     return entrants, changes, history
 
 
+def make_storage(event_key: str, backend: str = None):
+    """Build the storage backend for an event ('files' or 'sqlite')."""
+    backend = backend or STORAGE_BACKEND
+    paths = data_paths_for(event_key)
+    if backend == 'sqlite':
+        name, url = EVENTS[event_key]
+        # Keep the flat files the static pages read in sync with the database
+        return SQLiteStorage(event_key, name, url, export_paths=paths)
+    if backend == 'files':
+        return FileStorage(*paths)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+@timing.timed('parse')
+def parse_entrants_html(html) -> dict:
+    """
+    Parse an entrants_event.aspx page into the snapshot format
+    (separate from fetching so saved pages can be re-parsed offline)
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    entrants = {}
+    
+    # Find the main entrants table (table index 2 based on page structure)
+    tables = soup.find_all('table')
+    if len(tables) >= 3:
+        table = tables[2]  # The entrants table
+        rows = table.find_all('tr')[1:]  # Skip header row
+        
+        for row in rows:
+            cells = row.find_all('td')
+            # Columns: [0]Rank%, [1]AgeRank%, [2]Results, [3]Target, [4]Age, [5]empty, [6]First, [7]Last, [8]City, [9]Location, [10]empty, [11]Bib, [12]Finishes, [13]Results-link
+            if len(cells) >= 10:
+                try:
+                    first_name = cells[6].text.strip()
+                    last_name = cells[7].text.strip()
+                    city = cells[8].text.strip()
+                    location = cells[9].text.strip()
+                    age = cells[4].text.strip()
+                    
+                    # Validate that we have a real entrant (not empty)
+                    if first_name and last_name:
+                        # Create a unique key for the entrant
+                        entrant_key = f"{first_name}_{last_name}_{location}".lower()
+                        entrants[entrant_key] = Entrant.create(first_name, last_name, city, location, age)
+                except (IndexError, AttributeError):
+                    continue
+    
+    # Count is the actual number of entrants scraped (most reliable source)
+    current_count = len(entrants)
+    timing.add('entrants', current_count)
+    
+    return {
+        'count': current_count,
+        'entrants': entrants,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def _norm(text) -> str:
+    """Lowercase, accent-free, letters and digits only - for fuzzy matching."""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    return ''.join(c for c in text.lower() if c.isalnum())
+
+
+def _similar_first_names(a: str, b: str) -> bool:
+    a, b = _norm(a), _norm(b)
+    if not a or not b:
+        return False
+    # Chris / Christopher, Jon / John
+    return a.startswith(b) or b.startswith(a) or SequenceMatcher(None, a, b).ratio() >= 0.8
+
+
+def match_rekeyed(dropped: dict, added: dict) -> list:
+    """
+    Pair dropped and new entrants that are really the same person whose key
+    changed (location edit, name spelling fix). Returns [(old_key, new_key)].
+    Two bucketed passes keep this linear: same normalized name (plus one other
+    matching field), then same last name and location with a similar first
+    name. Only unambiguous one-to-one matches are linked.
+    """
+    pairs = []
+    dropped = dict(dropped)
+    added = dict(added)
+
+    passes = (
+        # Same name alone isn't enough: keep at least one of city/location/age
+        (lambda e: (_norm(e.first_name), _norm(e.last_name)),
+         lambda old, new: any(_norm(getattr(old, f)) == _norm(getattr(new, f)) for f in ('city', 'location', 'age'))),
+        (lambda e: (_norm(e.last_name), _norm(e.location)),
+         lambda old, new: _similar_first_names(old.first_name, new.first_name)),
+    )
+    for bucket_key, accept in passes:
+        old_buckets, new_buckets = {}, {}
+        for key, entrant in dropped.items():
+            old_buckets.setdefault(bucket_key(entrant), []).append(key)
+        for key, entrant in added.items():
+            new_buckets.setdefault(bucket_key(entrant), []).append(key)
+        for bucket, old_keys in old_buckets.items():
+            new_keys = new_buckets.get(bucket, [])
+            if len(old_keys) != 1 or len(new_keys) != 1:
+                continue
+            old_key, new_key = old_keys[0], new_keys[0]
+            if accept and not accept(dropped[old_key], added[new_key]):
+                continue
+            pairs.append((old_key, new_key))
+            del dropped[old_key]
+            del added[new_key]
+    return pairs
+
+
+def field_deltas(old: Entrant, new: Entrant) -> dict:
+    """{field: {'from': old, 'to': new}} for the entrant fields that differ."""
+    return {
+        field: {'from': getattr(old, field), 'to': getattr(new, field)}
+        for field in ENTRANT_FIELDS if getattr(old, field) != getattr(new, field)
+    }
+
+
 class EntrantTracker:
-    def __init__(self, event_key: str = 'frozen_head_50k'):
+    def __init__(self, event_key: str = 'frozen_head_50k', storage=None, notifier=None, session=None):
         self.data_dir = DATA_DIR
         self.data_dir.mkdir(exist_ok=True)
         if event_key not in EVENTS:
@@ -50,71 +168,32 @@ class EntrantTracker:
         self.event_key = event_key
         self.event_name, self.event_url = EVENTS[event_key]
         self.ENTRANTS_FILE, self.CHANGES_FILE, self.HISTORY_FILE = data_paths_for(event_key)
+        self.storage = storage or make_storage(event_key)
+        self.archive = default_archive()
 
-        # Notification config read from environment variables
-        import os
-        self.smtp_host = os.getenv('SMTP_HOST')
-        self.smtp_port = int(os.getenv('SMTP_PORT', '0')) if os.getenv('SMTP_PORT') else None
-        self.smtp_user = os.getenv('SMTP_USER')
-        self.smtp_pass = os.getenv('SMTP_PASS')
-        self.notify_to = os.getenv('NOTIFY_TO')
-        self.notify_from = os.getenv('NOTIFY_FROM')
+        # Outbox (or NotificationDigest) that collects changes for delivery after/alongside the run
+        self.notifier = notifier
+        # Shared requests.Session for long-running callers (daemon.py); plain requests.get otherwise
+        self.session = session
         
     def scrape_entrants(self) -> dict:
         """
         Scrape the entrant list from UltraSignup
         Returns a dictionary with entrant info
         """
+        import requests
+
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(self.event_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            entrants = {}
+            with timing.span('fetch', url=self.event_url):
+                response = (self.session or requests).get(self.event_url, headers=headers, timeout=10)
+                response.raise_for_status()
+                timing.add('bytes_read', len(response.content))
+            archive_quietly(self.archive, ENTRANTS, self.event_key, response.content, url=self.event_url)
             
-            # Find the main entrants table (table index 2 based on page structure)
-            tables = soup.find_all('table')
-            if len(tables) >= 3:
-                table = tables[2]  # The entrants table
-                rows = table.find_all('tr')[1:]  # Skip header row
-                
-                for row in rows:
-                    cells = row.find_all('td')
-                    # Columns: [0]Rank%, [1]AgeRank%, [2]Results, [3]Target, [4]Age, [5]empty, [6]First, [7]Last, [8]City, [9]Location, [10]empty, [11]Bib, [12]Finishes, [13]Results-link
-                    if len(cells) >= 10:
-                        try:
-                            first_name = cells[6].text.strip()
-                            last_name = cells[7].text.strip()
-                            city = cells[8].text.strip()
-                            location = cells[9].text.strip()
-                            age = cells[4].text.strip()
-                            
-                            # Validate that we have a real entrant (not empty)
-                            if first_name and last_name:
-                                # Create a unique key for the entrant
-                                entrant_key = f"{first_name}_{last_name}_{location}".lower()
-                                entrants[entrant_key] = {
-                                    'first_name': first_name,
-                                    'last_name': last_name,
-                                    'city': city,
-                                    'location': location,
-                                    'age': age
-                                }
-                        except (IndexError, AttributeError):
-                            continue
-            
-            # Count is the actual number of entrants scraped (most reliable source)
-            current_count = len(entrants)
-            
-            return {
-                'count': current_count,
-                'entrants': entrants,
-                'timestamp': datetime.now().isoformat()
-            }
+            return self.parse_entrants(response.content)
         
         except Exception as e:
             print(f"Error scraping entrants: {e}")
@@ -122,41 +201,62 @@ class EntrantTracker:
             traceback.print_exc()
             return {'count': 0, 'entrants': {}, 'timestamp': datetime.now().isoformat()}
     
+    def parse_entrants(self, html) -> dict:
+        """Parse an entrants page into the snapshot format (see parse_entrants_html)"""
+        return parse_entrants_html(html)
+    
+    @timing.timed('load_previous')
     def load_previous_data(self) -> dict:
         """Load previously saved entrant data for this event"""
-        if self.ENTRANTS_FILE.exists():
-            with open(self.ENTRANTS_FILE, 'r') as f:
-                return json.load(f)
-        return {'count': 0, 'entrants': {}, 'timestamp': None}
+        return self.storage.load_previous_data()
     
+    @timing.timed('save_current')
     def save_current_data(self, data: dict):
         """Save current entrant data for this event"""
-        with open(self.ENTRANTS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        self.storage.save_current_data(data)
     
+    @timing.timed('find_changes')
     def find_changes(self, previous: dict, current: dict) -> dict:
         """
         Compare previous and current data to find changes
-        Matches entrants by name and location
+        Matches entrants by name and location, compares per-entrant digests to
+        find edited fields, then links drop/add pairs that are the same person
         """
-        prev_entrants = set(previous.get('entrants', {}).keys())
-        curr_entrants = set(current.get('entrants', {}).keys())
+        prev_map = entrant_records(previous.get('entrants', {}))
+        curr_map = entrant_records(current.get('entrants', {}))
+        prev_entrants = set(prev_map.keys())
+        curr_entrants = set(curr_map.keys())
         
         new_entrants = curr_entrants - prev_entrants
         dropped_entrants = prev_entrants - curr_entrants
         
-        # Build detailed lists
-        new_list = []
-        for key in sorted(new_entrants):
-            entrant = current['entrants'][key].copy()
-            entrant['key'] = key
-            new_list.append(entrant)
+        # Digests first; only entrants whose digest differs are expanded into field deltas
+        modified_list = []
+        for key in sorted(prev_entrants & curr_entrants):
+            old, new = prev_map[key], curr_map[key]
+            if old.digest != new.digest:
+                deltas = field_deltas(old, new)
+                if deltas:
+                    modified_list.append({**new.change_entry(key), 'changes': deltas})
+        
+        # Re-key pass: a location edit or name fix shows up as a drop plus an add
+        rekeyed = match_rekeyed(
+            {key: prev_map[key] for key in dropped_entrants},
+            {key: curr_map[key] for key in new_entrants}
+        )
+        for old_key, new_key in rekeyed:
+            dropped_entrants.discard(old_key)
+            new_entrants.discard(new_key)
+            modified_list.append({
+                **curr_map[new_key].change_entry(new_key),
+                'previous_key': old_key,
+                'changes': field_deltas(prev_map[old_key], curr_map[new_key])
+            })
+        modified_list.sort(key=lambda e: e['key'])
         
-        dropped_list = []
-        for key in sorted(dropped_entrants):
-            entrant = previous['entrants'][key].copy()
-            entrant['key'] = key
-            dropped_list.append(entrant)
+        # Build detailed lists
+        new_list = [curr_map[key].change_entry(key) for key in sorted(new_entrants)]
+        dropped_list = [prev_map[key].change_entry(key) for key in sorted(dropped_entrants)]
         
         changes = {
             'timestamp': datetime.now().isoformat(),
@@ -166,103 +266,54 @@ class EntrantTracker:
             'new_entrants': new_list,
             'dropped_entrants': dropped_list,
             'total_new': len(new_entrants),
-            'total_dropped': len(dropped_entrants)
+            'total_dropped': len(dropped_entrants),
+            'modified_entrants': modified_list,
+            'total_modified': len(modified_list)
         }
         
         return changes
     
+    @timing.timed('save_changes')
     def save_changes(self, changes: dict):
-        """Save changes to file for this event"""
-        all_changes = []
-
-        if self.CHANGES_FILE.exists():
-            with open(self.CHANGES_FILE, 'r') as f:
-                try:
-                    all_changes = json.load(f)
-                except Exception:
-                    all_changes = []
-
-        all_changes.append(changes)
-
-        with open(self.CHANGES_FILE, 'w') as f:
-            json.dump(all_changes, f, indent=2)
+        """Save changes to storage for this event"""
+        self.storage.save_changes(changes)
     
+    @timing.timed('append_history')
     def append_to_history(self, changes: dict):
-        """Append changes to CSV history file for this event"""
-        file_exists = self.HISTORY_FILE.exists()
-
-        with open(self.HISTORY_FILE, 'a', newline='') as f:
-            writer = csv.writer(f)
-
-            if not file_exists:
-                writer.writerow([
-                    'Date', 'Total_Entrants', 'Previous_Count', 'New_Entrants',
-                    'Dropped_Entrants', 'Net_Change'
-                ])
-
-            writer.writerow([
-                changes['timestamp'],
-                changes['new_count'],
-                changes['previous_count'],
-                changes['total_new'],
-                changes['total_dropped'],
-                changes['count_change']
-            ])
+        """Append changes to the history for this event"""
+        self.storage.append_to_history(changes)
 
+    @timing.timed('notify')
     def send_notification(self, changes: dict):
-        """Send an email notification if SMTP config is present."""
-        # Only attempt to send if configured
-        if not (self.smtp_host and self.notify_to and self.notify_from):
+        """Queue changes on the run's outbox/digest, or email them right away if there is none."""
+        if self.notifier is not None:
+            self.notifier.add(self.event_key, self.event_name, changes)
             return
-
-        try:
-            import smtplib
-            from email.message import EmailMessage
-
-            subject = f"[{self.event_name}] Entrant list changed: {changes['count_change']:+d}"
-            body_lines = [f"Event: {self.event_name}", f"Time: {changes['timestamp']}", f"Net change: {changes['count_change']}\n"]
-            if changes.get('total_new'):
-                body_lines.append(f"New entrants: {changes['total_new']}")
-            if changes.get('total_dropped'):
-                body_lines.append(f"Dropped entrants: {changes['total_dropped']}")
-
-            msg = EmailMessage()
-            msg['Subject'] = subject
-            msg['From'] = self.notify_from
-            msg['To'] = self.notify_to
-            msg.set_content('\n'.join(body_lines))
-
-            # Connect and send
-            if self.smtp_port:
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10)
-            else:
-                server = smtplib.SMTP(self.smtp_host, timeout=10)
-
-            server.ehlo()
-            try:
-                server.starttls()
-                server.ehlo()
-            except Exception:
-                pass
-
-            if self.smtp_user and self.smtp_pass:
-                server.login(self.smtp_user, self.smtp_pass)
-
-            server.send_message(msg)
-            server.quit()
-            print(f"✓ Notification sent to {self.notify_to}")
-        except Exception as e:
-            print(f"Warning: failed to send notification: {e}")
+        digest = NotificationDigest()
+        digest.add(self.event_key, self.event_name, changes)
+        digest.send()
     
     def run(self):
         """Execute the tracker"""
+        with timing.span('track', event=self.event_key):
+            self._run()
+
+    def _run(self):
         print(f"[{datetime.now().isoformat()}] Starting entrant tracking...")
         
         # Scrape current data
         print("Scraping entrant list...")
         current_data = self.scrape_entrants()
         print(f"Found {current_data['count']} entrants")
-        
+        self.process(current_data)
+
+    def process(self, current_data: dict) -> dict:
+        """Diff a scraped snapshot against the stored one, record it and notify; returns the change record"""
+        # One writer per event at a time, across runners, the daemon and manual runs
+        with fileio.lock(f"event-{self.event_key}"):
+            return self._process(current_data)
+
+    def _process(self, current_data: dict) -> dict:
         # Load previous data
         previous_data = self.load_previous_data()
         
@@ -276,6 +327,7 @@ class EntrantTracker:
             print(f"Net change: {changes['count_change']:+d}")
             print(f"New entrants: {changes['total_new']}")
             print(f"Dropped entrants: {changes['total_dropped']}")
+            print(f"Modified entrants: {changes['total_modified']}")
             
             if changes['new_entrants']:
                 print(f"\n--- New Entrants ({len(changes['new_entrants'])}) ---")
@@ -291,12 +343,20 @@ class EntrantTracker:
                 if len(changes['dropped_entrants']) > 10:
                     print(f"  ... and {len(changes['dropped_entrants']) - 10} more")
             
+            if changes['modified_entrants']:
+                print(f"\n--- Modified Entrants ({len(changes['modified_entrants'])}) ---")
+                for entrant in changes['modified_entrants'][:10]:  # Show first 10
+                    edits = ', '.join(f"{field}: {d['from']} → {d['to']}" for field, d in entrant['changes'].items())
+                    print(f"  {entrant['first_name']} {entrant['last_name']} ({edits})")
+                if len(changes['modified_entrants']) > 10:
+                    print(f"  ... and {len(changes['modified_entrants']) - 10} more")
+            
             # Save changes
             self.save_changes(changes)
             self.append_to_history(changes)
 
             # Send notification if configured and there was a change
-            if changes['count_change'] != 0:
+            if has_changes(changes):
                 self.send_notification(changes)
         else:
             print("No previous data to compare. This is the first run.")
@@ -309,26 +369,40 @@ class EntrantTracker:
                 'new_entrants': [],
                 'dropped_entrants': [],
                 'total_new': 0,
-                'total_dropped': 0
+                'total_dropped': 0,
+                'modified_entrants': [],
+                'total_modified': 0
             }
             self.save_changes(changes)
             self.append_to_history(changes)
         
         # Save current data
         self.save_current_data(current_data)
-        print(f"\n✓ Data saved to {self.ENTRANTS_FILE}")
+        with timing.span('publish'):
+            self.storage.publish()
+        print(f"\n✓ Data saved to {self.ENTRANTS_FILE} ({self.storage.describe()})")
         print(f"✓ Changes logged to {self.CHANGES_FILE}")
         print(f"✓ History updated in {self.HISTORY_FILE}")
+        return changes
 
 if __name__ == "__main__":
     import argparse
-    import os
+    from outbox import start_outbox
 
     parser = argparse.ArgumentParser(description='Entrant list tracker (multi-event)')
     parser.add_argument('--event', '-e', help='Event key to track (overrides EVENT_KEY env var)')
+    parser.add_argument('--storage', choices=['files', 'sqlite'],
+                        help='Storage backend (overrides TRACKER_STORAGE env var)')
     args = parser.parse_args()
 
     event_key = args.event or os.getenv('EVENT_KEY', 'frozen_head_50k')
-    tracker = EntrantTracker(event_key=event_key)
+    # Notifications are queued on disk and delivered by a background worker
+    outbox, worker = start_outbox()
+    tracker = EntrantTracker(event_key=event_key, storage=make_storage(event_key, args.storage), notifier=outbox)
     print(f"Tracking event: {tracker.event_name} (key={tracker.event_key})")
-    tracker.run()
+    with timing.run_report(f"track_{event_key}"):
+        try:
+            tracker.run()
+        finally:
+            if worker:
+                worker.stop()
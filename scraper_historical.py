@@ -7,50 +7,161 @@ Handles both 50K and Marathon distances for each year.
 
 import json
 import csv
+import hashlib
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
-import requests
-from bs4 import BeautifulSoup
 import time
-from playwright.sync_api import sync_playwright
-
-# Configuration for all years - maps year to (50K_did, Marathon_did)
-BARKLEY_HISTORICAL = {
-    2025: (119817, 119818),
-    2024: (108870, 116578),
-    2023: (97857, 108677),
-    2022: (88170, 97828),
-    2021: (79789, 88389),
-    2020: (71482, 79480),
-    2019: (60848, 71684),
-    2018: (50528, 60817),
-    2017: (41232, 50516),
-    2016: (34630, 34629),
-    2015: (32215, 34599),
-}
+
+import fileio
+import timing
+from corrections import CORRECTIONS_FILE, log_corrections
+from events import load_registry
+from page_archive import RESULTS_GRID, archive_quietly, default_archive
+from discovery_cache import cached
+from ultrasignup import fetch_html, grid_url, parse_toggle_links, results_url, session, sibling_dids
+
+# Configuration for all years - maps year to (50K_did, Marathon_did), from events.json
+SERIES = load_registry().series('barkley_fall_classic')
+BARKLEY_HISTORICAL = SERIES.by_year()
+
+# Seconds to let jqGrid populate after the table appears (lower it against a local stand-in)
+JQGRID_SETTLE_SECONDS = float(os.getenv('JQGRID_SETTLE_SECONDS', '10'))
 
 DATA_DIR = Path(__file__).parent / "data" / "historical"
 RESULTS_DIR = DATA_DIR / "results"
+STATE_FILE = DATA_DIR / "scrape_state.json"
 ANALYSIS_DIR = DATA_DIR / "analysis"
 
-# Ensure directories exist
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
+def parse_time(time_str):
+    """Convert HH:MM:SS to seconds."""
+    try:
+        parts = time_str.split(':')
+        if len(parts) == 3:
+            hours = int(parts[0])
+            minutes = int(parts[1])
+            seconds = int(parts[2])
+            return hours * 3600 + minutes * 60 + seconds
+    except:
+        pass
+    return None
+
+
+def build_results(rows, year, distance, did, scraped_at=None):
+    """
+    Build a results file from raw jqGrid rows. Pure (no browser), so archived
+    grid payloads can be re-parsed with page_archive.py.
+    """
+    finishers = []
+    status_counts = {'1': 0, '2': 0, '3': 0, '5': 0}
+    
+    for row_data in rows:
+        # Status codes: 1=Finisher, 2=DNF, 3=DNS
+        status_code = str(row_data.get('status', ''))
+        status_counts[status_code] = status_counts.get(status_code, 0) + 1
+        
+        # Map status code to text
+        if status_code == '1':
+            status = 'Finished'
+        elif status_code == '2':
+            status = 'DNF'
+        elif status_code == '3':
+            status = 'DNS'
+        elif status_code == '5':
+            status = 'Disqualified'
+        else:
+            status = 'Unknown'
+        
+        # Parse place
+        place = 0
+        try:
+            place_text = str(row_data.get('place', '0'))
+            if place_text and place_text != '0':
+                place = int(place_text)
+        except:
+            pass
+        
+        # Parse time (only for finishers)
+        finish_time_seconds = None
+        finish_time_formatted = row_data.get('formattime', '')
+        
+        if status == 'Finished' and finish_time_formatted:
+            finish_time_seconds = parse_time(finish_time_formatted)
+        
+        # Parse age
+        age = None
+        try:
+            age_text = str(row_data.get('age', ''))
+            if age_text and age_text != '':
+                age = int(age_text)
+        except:
+            pass
+        
+        finisher_data = {
+            'year': year,
+            'distance': distance,
+            'place': place,
+            'first_name': row_data.get('firstname', ''),
+            'last_name': row_data.get('lastname', ''),
+            'city': row_data.get('city', ''),
+            'state': row_data.get('state', ''),
+            'age': age,
+            'division': row_data.get('agegroup', ''),
+            'status': status,
+            'finish_time_seconds': finish_time_seconds,
+            'finish_time_formatted': finish_time_formatted if status == 'Finished' else ''
+        }
+        
+        finishers.append(finisher_data)
+    
+    timing.add('rows', len(finishers))
+    
+    # Sort by status (Finished first) then by place
+    finishers.sort(key=lambda x: (0 if x['status'] == 'Finished' else (1 if x['status'] == 'DNF' else 2), x['place']))
+    
+    return {
+        'year': year,
+        'distance': distance,
+        'did': did,
+        'scraped_at': scraped_at or datetime.now().isoformat(),
+        'total_finishers': status_counts.get('1', 0),
+        'total_dnf': status_counts.get('2', 0),
+        'total_dns': status_counts.get('3', 0),
+        'total_disqualified': status_counts.get('5', 0),
+        'finishers': finishers
+    }
+
 
 class HistoricalResultsScraper:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        # The process-wide UltraSignup session, shared with the discovery lookups
+        self.session = session()
+        self.archive = default_archive()
+        # Created here rather than at import so read-only users of this module touch nothing
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        # Why the last scrape_year() returned None, for the job state
+        self.last_error = None
 
-    def resolve_event_links(self, seed_did):
+    def resolve_event_links(self, seed_did, refresh=False):
         """Resolve sibling event DIDs (50K/Marathon) from a seed event page.
         Returns a dict like {'50K': did, 'Marathon': did} discovered from the toggle links.
+        Answers come from the discovery cache until they expire (or refresh=True).
         """
-        url = f"https://ultrasignup.com/results_event.aspx?did={seed_did}"
+        return cached(seed_did, 'siblings', lambda: self._fetch_event_links(seed_did), refresh)
+
+    def _fetch_event_links(self, seed_did):
+        url = results_url(seed_did)
+        # The toggle is server-rendered, so a plain GET usually suffices
+        html = fetch_html(url)
+        links = parse_toggle_links(html) if html else None
+        if links is None:
+            links = self._browser_event_links(url)
+        return sibling_dids(links)
+
+    def _browser_event_links(self, url):
+        from playwright.sync_api import sync_playwright
+
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
             page = browser.new_page()
@@ -69,147 +180,73 @@ class HistoricalResultsScraper:
                 """
             )
             browser.close()
-        mapping = {}
-        for link in links:
-            href = link.get('href', '')
-            text = link.get('text', '')
-            if 'did=' in href:
-                try:
-                    did_val = int(href.split('did=')[1].split('#')[0])
-                    # Normalize distance label
-                    label = text.lower()
-                    if '50k' in label:
-                        mapping['50K'] = did_val
-                    elif 'marathon' in label:
-                        mapping['Marathon'] = did_val
-                except ValueError:
-                    continue
-        return mapping
+        return links
     
     def scrape_year(self, year, did):
         """Scrape results for a specific year and distance."""
         distance = "50K" if did == BARKLEY_HISTORICAL[year][0] else "Marathon"
         print(f"Scraping {year} {distance} (did={did})...")
-        url = f"https://ultrasignup.com/results_event.aspx?did={did}"
+        url = results_url(did)
+        self.last_error = None
         
         try:
-            # Use Playwright to render JavaScript and extract jqGrid data
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(url, wait_until='domcontentloaded', timeout=90000)
-                
-                # Wait for jqGrid table to load with generous timeout
-                page.wait_for_selector('table#list', timeout=30000)
-                
-                # Give jqGrid extra time to populate with data
-                time.sleep(10)
-                
-                # Extract results using jqGrid JavaScript API
-                results = self._extract_from_jqgrid_api(page, year, distance, did)
+            # Imported here so build_results() can be used without a browser installed
+            from playwright.sync_api import sync_playwright
+
+
+            with timing.span('scrape_year', year=year, distance=distance, did=did):
+                # Use Playwright to render JavaScript and extract jqGrid data
+                with sync_playwright() as p:
+                    with timing.span('browser_launch'):
+                        browser = p.chromium.launch(headless=True)
+                        page = browser.new_page()
+                    with timing.span('page_load'):
+                        page.goto(url, wait_until='domcontentloaded', timeout=90000)
+                    
+                        # Wait for jqGrid table to load with generous timeout
+                        page.wait_for_selector('table#list', timeout=30000)
+                    
+                    # Give jqGrid extra time to populate with data
+                    with timing.span('fixed_sleep'):
+                        time.sleep(JQGRID_SETTLE_SECONDS)
+                    
+                    # Extract results using jqGrid JavaScript API
+                    results = self._extract_from_jqgrid_api(page, year, distance, did)
+                    
+                    browser.close()
                 
-                browser.close()
-            
-            if results['finishers']:
-                # Save raw results
-                output_file = RESULTS_DIR / f"results_{year}_{distance.lower().replace('k', 'k')}.json"
-                with open(output_file, 'w') as f:
-                    json.dump(results, f, indent=2)
-                
-                print(f"  ✓ Saved {len(results['finishers'])} {distance} finisher records")
-                return results
-            else:
-                print(f"  ✗ No finishers found for {year} {distance}")
-                return None
+                if results['finishers']:
+                    # Save raw results
+                    with timing.span('write'):
+                        output_file = save_results(results)
+                        timing.add_file_bytes('bytes_written', output_file)
+                    
+                    print(f"  ✓ Saved {len(results['finishers'])} {distance} finisher records")
+                    return results
+                else:
+                    print(f"  ✗ No finishers found for {year} {distance}")
+                    self.last_error = 'no finishers found'
+                    return None
             
         except Exception as e:
             print(f"  ✗ Error scraping {year} {distance}: {e}")
+            self.last_error = f"{type(e).__name__}: {e}"
             return None
     
+    @timing.timed('extract')
     def _extract_from_jqgrid_api(self, page, year, distance, did):
         """Extract data using jqGrid JavaScript API to get status codes."""
+        rows = self._fetch_jqgrid_rows(page)
+        payload = json.dumps(rows, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        archive_quietly(self.archive, RESULTS_GRID, f"{year}_{distance}", payload,
+                        url=results_url(did), year=year, distance=distance, did=did)
+        return build_results(rows, year, distance, did)
+
+    def _fetch_jqgrid_rows(self, page):
+        """Raw jqGrid row data (includes the status field the table doesn't show)."""
         # Get all row IDs from jqGrid
         row_ids = page.evaluate("jQuery('#list').jqGrid('getDataIDs')")
-        
-        finishers = []
-        status_counts = {'1': 0, '2': 0, '3': 0, '5': 0}
-        
-        for row_id in row_ids:
-            # Get full row data from jqGrid (includes status field)
-            row_data = page.evaluate(f"jQuery('#list').jqGrid('getRowData', '{row_id}')")
-            
-            # Status codes: 1=Finisher, 2=DNF, 3=DNS
-            status_code = str(row_data.get('status', ''))
-            status_counts[status_code] = status_counts.get(status_code, 0) + 1
-            
-            # Map status code to text
-            if status_code == '1':
-                status = 'Finished'
-            elif status_code == '2':
-                status = 'DNF'
-            elif status_code == '3':
-                status = 'DNS'
-            elif status_code == '5':
-                status = 'Disqualified'
-            else:
-                status = 'Unknown'
-            
-            # Parse place
-            place = 0
-            try:
-                place_text = str(row_data.get('place', '0'))
-                if place_text and place_text != '0':
-                    place = int(place_text)
-            except:
-                pass
-            
-            # Parse time (only for finishers)
-            finish_time_seconds = None
-            finish_time_formatted = row_data.get('formattime', '')
-            
-            if status == 'Finished' and finish_time_formatted:
-                finish_time_seconds = self._parse_time(finish_time_formatted)
-            
-            # Parse age
-            age = None
-            try:
-                age_text = str(row_data.get('age', ''))
-                if age_text and age_text != '':
-                    age = int(age_text)
-            except:
-                pass
-            
-            finisher_data = {
-                'year': year,
-                'distance': distance,
-                'place': place,
-                'first_name': row_data.get('firstname', ''),
-                'last_name': row_data.get('lastname', ''),
-                'city': row_data.get('city', ''),
-                'state': row_data.get('state', ''),
-                'age': age,
-                'division': row_data.get('agegroup', ''),
-                'status': status,
-                'finish_time_seconds': finish_time_seconds,
-                'finish_time_formatted': finish_time_formatted if status == 'Finished' else ''
-            }
-            
-            finishers.append(finisher_data)
-        
-        # Sort by status (Finished first) then by place
-        finishers.sort(key=lambda x: (0 if x['status'] == 'Finished' else (1 if x['status'] == 'DNF' else 2), x['place']))
-        
-        return {
-            'year': year,
-            'distance': distance,
-            'did': did,
-            'scraped_at': datetime.now().isoformat(),
-            'total_finishers': status_counts.get('1', 0),
-            'total_dnf': status_counts.get('2', 0),
-            'total_dns': status_counts.get('3', 0),
-            'total_disqualified': status_counts.get('5', 0),
-            'finishers': finishers
-        }
+        return [page.evaluate(f"jQuery('#list').jqGrid('getRowData', '{row_id}')") for row_id in row_ids]
     
     def _parse_jqgrid_row(self, cells, year, distance):
         """Parse a single row from jqGrid table."""
@@ -266,47 +303,213 @@ class HistoricalResultsScraper:
     
     def _parse_time(self, time_str):
         """Convert HH:MM:SS to seconds."""
-        try:
-            parts = time_str.split(':')
-            if len(parts) == 3:
-                hours = int(parts[0])
-                minutes = int(parts[1])
-                seconds = int(parts[2])
-                return hours * 3600 + minutes * 60 + seconds
-        except:
-            pass
-        return None
+        return parse_time(time_str)
     
-    def scrape_all(self):
-        """Scrape all years and distances."""
-        all_results = []
+    def probe(self, year, distance, did):
+        """
+        Cheap change check: the grid data endpoint's rows over plain HTTP, no browser.
+        Returns {'record_count', 'probe_sha256', 'content_sha256'} or None if the probe failed.
+        """
+        import requests
+
+        with timing.span('probe', year=year, distance=distance, did=did):
+            try:
+                response = self.session.get(grid_url(did), timeout=30)
+                response.raise_for_status()
+                data = response.json()
+            except (requests.RequestException, ValueError) as e:
+                print(f"  Probe failed for {year} {distance}: {e}")
+                return None
+            rows = data.get('rows') if isinstance(data, dict) else data
+            if not isinstance(rows, list):
+                return None
+            payload = json.dumps(rows, sort_keys=True, separators=(',', ':')).encode('utf-8')
+            return {
+                'record_count': len(rows),
+                'probe_sha256': hashlib.sha256(payload).hexdigest(),
+                # Same normalization as a full scrape, so it compares with the stored results
+                'content_sha256': results_digest(build_results(rows, year, distance, did)),
+            }
+
+    def scrape_all(self, resume=False, probe=True):
+        """
+        Scrape all years and distances, checkpointing each one in the job state.
+        With resume, units already done are skipped and only failed or unfinished ones run.
+        With probe, a unit whose grid data is unchanged since its last scrape is not re-scraped.
+        Returns the archive assembled from the per-year results files.
+        """
+        # The job state is read-modify-write: one backfill at a time
+        with fileio.lock('historical-scrape'):
+            return self._scrape_all(resume, probe)
+
+    def _scrape_all(self, resume, probe):
+        state = ScrapeState()
+        units = [(year, distance, did)
+                 for year in sorted(BARKLEY_HISTORICAL.keys())
+                 for distance, did in zip(('50K', 'Marathon'), BARKLEY_HISTORICAL[year])]
+        if not resume:
+            # A fresh run re-scrapes everything; an interrupted one can then be resumed
+            for year, distance, did in units:
+                state.mark_pending(year, distance, did)
+            state.save()
         
-        for year in sorted(BARKLEY_HISTORICAL.keys()):
-            did_50k, did_marathon = BARKLEY_HISTORICAL[year]
-            
-            # Scrape 50K
-            results_50k = self.scrape_year(year, did_50k)
-            if results_50k:
-                all_results.append(results_50k)
-            time.sleep(2)  # Rate limiting
-            
-            # Scrape Marathon
-            results_marathon = self.scrape_year(year, did_marathon)
-            if results_marathon:
-                all_results.append(results_marathon)
+        failed = []
+        for year, distance, did in units:
+            if resume and state.is_done(year, distance):
+                print(f"Skipping {year} {distance} (done {state.get(year, distance).get('last_success')})")
+                continue
+            probed = self.probe(year, distance, did) if probe else None
+            if probed and state.unchanged(year, distance, probed):
+                print(f"Unchanged {year} {distance} ({probed['record_count']} rows, probe matches last scrape)")
+                state.mark_unchanged(year, distance, did, probed)
+                state.save()
+                continue
+            results = self.scrape_year(year, did)
+            if results:
+                state.mark_done(year, distance, did, results, probed)
+            else:
+                state.mark_failed(year, distance, did, self.last_error or 'no finishers found')
+                failed.append(f"{year} {distance}")
+            state.save()
             time.sleep(2)  # Rate limiting
         
-        # Save comprehensive archive
-        archive_file = DATA_DIR / "barkley_archive_complete.json"
-        with open(archive_file, 'w') as f:
-            json.dump(all_results, f, indent=2)
-        
-        print(f"\n✓ Saved complete archive to {archive_file}")
+        all_results = write_archive()
+        if failed:
+            print(f"\n✗ {len(failed)} unit(s) failed: {', '.join(failed)}")
+            print("  Re-run with --resume to retry only those")
         return all_results
 
+
+class ScrapeState:
+    """
+    Per-(year, distance) job state for scrape_all, persisted in scrape_state.json:
+    status (pending/done/failed), last successful scrape, content hash and last error,
+    plus the last probe of the grid data endpoint (record count and row digest).
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = path or STATE_FILE
+        try:
+            self.units = fileio.read_json(self.path)
+        except (OSError, ValueError):
+            self.units = {}
+
+    @staticmethod
+    def key(year, distance) -> str:
+        return f"{year}_{distance}"
+
+    def get(self, year, distance) -> dict:
+        return self.units.get(self.key(year, distance), {})
+
+    def is_done(self, year, distance) -> bool:
+        return self.get(year, distance).get('status') == 'done' and fileio.find(results_file(year, distance)) is not None
+
+    def _update(self, year, distance, did, **fields):
+        unit = self.units.setdefault(self.key(year, distance), {'year': year, 'distance': distance})
+        unit.update(did=did, updated_at=datetime.now().isoformat(), **fields)
+        return unit
+
+    def mark_pending(self, year, distance, did):
+        self._update(year, distance, did, status='pending')
+
+    def unchanged(self, year, distance, probed: dict) -> bool:
+        """Whether a probe shows the same rows as the stored results file."""
+        path = fileio.find(results_file(year, distance))
+        if not path:
+            return False
+        unit = self.get(year, distance)
+        if unit.get('probe_sha256'):
+            return unit['probe_sha256'] == probed['probe_sha256']
+        # No probe recorded yet: compare normalized finishers with the stored file
+        content_sha256 = unit.get('content_sha256')
+        if not content_sha256:
+            content_sha256 = results_digest(fileio.read_json(path))
+        return content_sha256 == probed['content_sha256']
+
+    def mark_done(self, year, distance, did, results: dict, probed: dict = None):
+        unit = self._update(year, distance, did, status='done', last_success=results['scraped_at'],
+                            content_sha256=results_digest(results), error=None)
+        unit['attempts'] = 0
+        if probed:
+            unit.update(record_count=probed['record_count'], probe_sha256=probed['probe_sha256'],
+                        last_probe=unit['updated_at'])
+
+    def mark_unchanged(self, year, distance, did, probed: dict):
+        unit = self._update(year, distance, did, status='done', error=None,
+                            record_count=probed['record_count'], probe_sha256=probed['probe_sha256'])
+        unit['last_probe'] = unit['updated_at']
+        if not unit.get('content_sha256'):
+            unit['content_sha256'] = probed['content_sha256']
+
+    def mark_failed(self, year, distance, did, error: str):
+        unit = self._update(year, distance, did, status='failed', error=error)
+        unit['attempts'] = unit.get('attempts', 0) + 1
+
+    def save(self):
+        fileio.write_json(self.path, self.units)
+
+
+def results_file(year, distance) -> Path:
+    return RESULTS_DIR / f"results_{year}_{distance.lower()}.json"
+
+
+def save_results(results: dict) -> Path:
+    """Write a results file, logging row-level corrections against the version it replaces."""
+    output_file = results_file(results['year'], results['distance'])
+    with fileio.lock(f"results-{output_file.stem}"):
+        if fileio.find(output_file):
+            try:
+                previous = fileio.read_json(output_file)
+            except ValueError:
+                previous = None
+            diff = log_corrections(previous, results) if previous else None
+            if diff:
+                print(f"  Corrections in {results['year']} {results['distance']}: +{len(diff['added'])} "
+                      f"-{len(diff['removed'])} ~{len(diff['modified'])} (logged to {CORRECTIONS_FILE.name})")
+        fileio.write_json(output_file, results)
+    return output_file
+
+
+def results_digest(results: dict) -> str:
+    """SHA-256 of a results file's finishers, independent of when they were scraped."""
+    payload = json.dumps(results['finishers'], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def write_archive() -> list:
+    """Assemble barkley_archive_complete.json from the per-year results files."""
+    all_results = []
+    for year in sorted(BARKLEY_HISTORICAL.keys()):
+        for distance in ('50K', 'Marathon'):
+            path = results_file(year, distance)
+            if fileio.find(path):
+                all_results.append(fileio.read_json(path))
+    
+    archive_file = fileio.cold_path(DATA_DIR / "barkley_archive_complete.json")
+    with timing.span('write_archive'):
+        with fileio.lock('report-barkley_archive_complete'):
+            fileio.write_json(archive_file, all_results)
+        timing.add_file_bytes('bytes_written', archive_file)
+    
+    print(f"\n✓ Saved complete archive to {archive_file} ({len(all_results)} results files)")
+    return all_results
+
+
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scrape historical results for every configured year')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip years/distances already scraped; retry only failed or unfinished ones')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-scrape every page even if its grid data probe is unchanged')
+    args = parser.parse_args()
+
     scraper = HistoricalResultsScraper()
-    scraper.scrape_all()
+    with timing.run_report('scrape_historical'):
+        scraper.scrape_all(resume=args.resume, probe=not args.full)
+    failed = [key for key, unit in ScrapeState().units.items() if unit.get('status') != 'done']
+    sys.exit(1 if failed else 0)
 
 if __name__ == '__main__':
     main()
@@ -3,7 +3,6 @@
 Analyze Barkley Fall Classic veterans - runners who participated multiple years.
 """
 
-import json
 import sys
 from pathlib import Path
 from collections import defaultdict
@@ -12,22 +11,24 @@ from collections import defaultdict
 repo_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(repo_root))
 
+import fileio
+from analyzer_historical import VETERAN_FIELDS
+from archive_reader import iter_editions
+
 DATA_DIR = repo_root / "data" / "historical"
 ANALYSIS_DIR = DATA_DIR / "analysis"
 
 def analyze_veterans():
     """Find runners who participated in multiple years."""
     
-    # Load complete archive
+    # Stream the archive one edition at a time, keeping only the fields used below
     archive_file = DATA_DIR / "barkley_archive_complete.json"
-    with open(archive_file, 'r') as f:
-        all_data = json.load(f)
     
     # Track each runner's participations
     # Key: (first_name, last_name) - Value: list of participation records
     runner_participations = defaultdict(list)
     
-    for year_data in all_data:
+    for year_data in iter_editions(archive_file, VETERAN_FIELDS):
         year = year_data['year']
         distance = year_data.get('distance', 'Unknown')
         
@@ -117,8 +118,8 @@ def analyze_veterans():
     
     # Save to analysis file
     output_file = ANALYSIS_DIR / "veterans.json"
-    with open(output_file, 'w') as f:
-        json.dump(veterans, f, indent=2)
+    with fileio.lock(f"report-{output_file.stem}"):
+        fileio.write_json(output_file, veterans)
     
     print(f"✓ Found {len(veterans)} Barkley veterans")
     print(f"  Saved to {output_file}")
@@ -1,29 +1,50 @@
 #!/usr/bin/env python3
-"""Check if any event had meaningful changes (new/dropped entrants)."""
-import json
+"""Check if any event had meaningful changes (new/dropped entrants).
+
+Only events tracked by the last run_all.py run (data/last_run.json) and changes
+recorded since it started count, so hourly --due-only runs don't re-report an
+older change.
+"""
 from pathlib import Path
 import sys
 
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import jsonio
+from events import load_registry
+
 DATA_DIR = Path('data')
-EVENTS = ['frozen_head_50k', 'other_race_50m', 'other_race_55k']
+LAST_RUN_FILE = DATA_DIR / 'last_run.json'
+EVENTS = [event.key for event in load_registry().enabled()]
+
+def last_run():
+    """(event keys, started_at) of the last run_all.py run, or (EVENTS, None)."""
+    if not LAST_RUN_FILE.exists():
+        return EVENTS, None
+    run = jsonio.load(LAST_RUN_FILE)
+    return run.get('events', EVENTS), run.get('started_at')
 
 def check_for_changes():
     """Return True if any event has new or dropped entrants in the latest change."""
     has_changes = False
+    events, started_at = last_run()
     
-    for event_key in EVENTS:
+    for event_key in events:
         changes_file = DATA_DIR / f'changes_{event_key}.json'
         if not changes_file.exists():
             continue
             
-        with open(changes_file) as f:
-            changes = json.load(f)
+        changes = jsonio.load(changes_file)
         
         if not changes:
             continue
             
         latest = changes[-1]
-        if latest.get('total_new', 0) > 0 or latest.get('total_dropped', 0) > 0:
+        # ISO timestamps from the same clock compare correctly as strings
+        if started_at and latest.get('timestamp', '') < started_at:
+            continue
+        if latest.get('total_new', 0) > 0 or latest.get('total_dropped', 0) > 0 or latest.get('total_modified', 0) > 0:
             has_changes = True
             break
     
@@ -1,32 +1,33 @@
 #!/usr/bin/env python3
 """Diagnose per-event data files and compute metrics similar to index.html's analysis."""
-import json
 import csv
+import sys
 from pathlib import Path
 from datetime import datetime
 
-EVENTS = {
-    'frozen_head_50k': 'Barkley Fall Classic',
-    'other_race_50m': 'Dam Yeti 50 Miler',
-    'other_race_55k': 'Dam Yeti 55K'
-}
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fileio
+from events import load_registry
+
+EVENTS = {event.key: event.display_name for event in load_registry().events}
 DATA_DIR = Path('data')
 
 
 def read_changes(key):
     p = DATA_DIR / f'changes_{key}.json'
-    if not p.exists():
+    if not fileio.find(p):
         return []
-    with open(p) as f:
-        return json.load(f)
+    return fileio.read_json(p)
 
 
 def read_history(key):
     p = DATA_DIR / f'history_{key}.csv'
-    if not p.exists():
+    if not fileio.find(p):
         return []
     rows = []
-    with open(p) as f:
+    with fileio.open_text(p, newline='') as f:
         reader = csv.DictReader(f)
         for r in reader:
             rows.append(r)
@@ -50,13 +51,13 @@ def analyze(key):
         start_ts = history[0].get('Date')
         start_count = int(history[0].get('Total_Entrants') or 0)
     else:
-        start_ts = changes[0].get('timestamp')
+        start_ts = changes[0].get('first_timestamp', changes[0].get('timestamp'))
         start_count = changes[0].get('previous_count') or 0
 
     days_between = (datetime.fromisoformat(latest['timestamp']) - datetime.fromisoformat(start_ts)).total_seconds() / (86400)
     daily_rate = (total_new / days_between) if days_between > 0 else 0
 
-    print('Snapshots:', len(changes))
+    print('Snapshots:', sum(c.get('polls', 1) for c in changes))
     print('Latest count:', latest.get('new_count'))
     print('Total new:', total_new)
     print('Total dropped:', total_dropped)
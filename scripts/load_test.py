@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Load-test the local data server the way the dashboards poll it.
+
+Each worker keeps one HTTP/1.1 connection open and repeatedly requests the
+dashboard data files, revalidating with If-None-Match like a browser does.
+Reports throughput, latency percentiles and bytes transferred.
+
+Usage:
+    python serve.py --quiet &
+    python scripts/load_test.py --workers 8 --requests 500
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    '/index.html',
+    '/data/changes_frozen_head_50k.json',
+    '/data/history_frozen_head_50k.csv',
+    '/data/veterans_2026.json',
+    '/data/historical/analysis/veterans.json',
+]
+
+
+def worker(base_url, paths, count, revalidate, gzip_ok, stats, lock):
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    etags = {}
+    latencies = []
+    status_counts = {}
+    body_bytes = 0
+
+    for i in range(count):
+        path = paths[i % len(paths)]
+        headers = {}
+        if gzip_ok:
+            headers['Accept-Encoding'] = 'gzip'
+        if revalidate and path in etags:
+            headers['If-None-Match'] = etags[path]
+
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            status_counts['error'] = status_counts.get('error', 0) + 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+        status_counts[response.status] = status_counts.get(response.status, 0) + 1
+        body_bytes += len(body)
+        etag = response.getheader('ETag')
+        if etag:
+            etags[path] = etag
+
+    conn.close()
+    with lock:
+        stats['latencies'].extend(latencies)
+        stats['bytes'] += body_bytes
+        for status, n in status_counts.items():
+            stats['status'][status] = stats['status'].get(status, 0) + n
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load_test(base_url, paths, workers, requests_per_worker, revalidate=True, gzip_ok=True):
+    stats = {'latencies': [], 'bytes': 0, 'status': {}}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(base_url, paths, requests_per_worker,
+                                              revalidate, gzip_ok, stats, lock))
+        for _ in range(workers)
+    ]
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(stats['latencies'])
+    return {
+        'requests': len(latencies),
+        'elapsed_seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed > 0 else 0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'bytes_received': stats['bytes'],
+        'status_counts': {str(k): v for k, v in sorted(stats['status'].items(), key=lambda kv: str(kv[0]))},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the local data server')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+    parser.add_argument('--workers', '-w', type=int, default=8, help='Concurrent connections')
+    parser.add_argument('--requests', '-n', type=int, default=200, help='Requests per worker')
+    parser.add_argument('--no-revalidate', action='store_true', help='Never send If-None-Match')
+    parser.add_argument('--no-gzip', action='store_true', help='Do not advertise gzip support')
+    parser.add_argument('--path', action='append', help='Path to request (repeatable)')
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    print(f"Load testing {args.url} with {args.workers} workers x {args.requests} requests")
+    result = run_load_test(args.url, paths, args.workers, args.requests,
+                           revalidate=not args.no_revalidate, gzip_ok=not args.no_gzip)
+
+    print(f"  Requests:     {result['requests']} in {result['elapsed_seconds']}s")
+    print(f"  Throughput:   {result['requests_per_second']} req/s")
+    print(f"  Latency:      p50 {result['p50_ms']} ms | p95 {result['p95_ms']} ms | p99 {result['p99_ms']} ms")
+    print(f"  Transferred:  {result['bytes_received'] / 1024:.1f} KB")
+    print(f"  Status codes: {result['status_counts']}")
+
+
+if __name__ == '__main__':
+    main()
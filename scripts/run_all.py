@@ -1,28 +1,94 @@
 #!/usr/bin/env python3
-"""Run the EntrantTracker for every configured event.
+"""Run the EntrantTracker for every enabled event in events.json.
+
+Split the registry across runners with --shard INDEX/COUNT (or TRACKER_SHARD),
+e.g. a CI matrix of four jobs each running --shard N/4.
+
+With --due-only, only events whose adaptive next poll time has passed are
+tracked (see scheduler.py), so the job can run hourly within the same daily
+budget. Every run records its start time and events in data/last_run.json for
+check_changes.py and the workflow's issue step.
 
 Ensure the repository root is on sys.path so `from scraper import ...` works
 when this script is executed from `scripts/` (this is the behavior in
 GitHub Actions and when running `python scripts/run_all.py`).
 """
 from pathlib import Path
+import argparse
+import os
 import sys
+from datetime import datetime
 
 # Prepend repo root to sys.path so sibling modules at the repo root can be imported
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
 
-from scraper import EntrantTracker, EVENTS
+import fileio
+import timing
+from events import export_event_list, load_registry, parse_shard
+from compaction import compact_event
+from outbox import start_outbox
+from scraper import DATA_DIR, EntrantTracker
+
+LAST_RUN_FILE = DATA_DIR / "last_run.json"
 
 
 def main():
-    for key in EVENTS.keys():
-        tracker = EntrantTracker(event_key=key)
-        print(f"\n=== Running tracker for: {tracker.event_name} (key={key}) ===")
+    parser = argparse.ArgumentParser(description='Track every enabled event in the registry')
+    parser.add_argument('--shard', default=os.getenv('TRACKER_SHARD'),
+                        help='Only track events in shard INDEX/COUNT (e.g. 0/4)')
+    parser.add_argument('--due-only', action='store_true',
+                        help='Only track events whose adaptive next poll is due (scheduler.py)')
+    args = parser.parse_args()
+    started_at = datetime.now()
+
+    registry = load_registry()
+    shard = parse_shard(args.shard)
+    events = registry.shard(*shard) if shard else registry.enabled()
+    if shard:
+        print(f"Shard {shard[0]}/{shard[1]}: {len(events)} of {len(registry.enabled())} events")
+    if args.due_only:
+        from scheduler import plan
+
+        schedules = plan(events)
+        for s in schedules:
+            if not s.is_due(started_at):
+                print(f"Skipping {s.key}: next poll {s.next_poll:%Y-%m-%d %H:%M} "
+                      f"(every {s.interval_hours:.1f}h, {s.rate * 24:.2f} changes/day)")
+        events = [s.event for s in schedules if s.is_due(started_at)]
+        print(f"{len(events)} of {len(schedules)} events due")
+    # Dashboard event list is generated from the registry
+    export_event_list(registry)
+    fileio.write_json(LAST_RUN_FILE, {
+        'started_at': started_at.isoformat(),
+        'events': [event.key for event in events],
+    })
+    if not events:
+        return
+
+    # Changes are queued in the on-disk outbox; a background worker delivers them
+    # (SMTP digests, webhooks) while the remaining events are scraped
+    outbox, worker = start_outbox()
+    report_name = f"track_all_shard{shard[0]}of{shard[1]}" if shard else 'track_all'
+    with timing.run_report(report_name, events=len(events)):
         try:
-            tracker.run()
-        except Exception as e:
-            print(f"Error running tracker for {key}: {e}")
+            for key in (event.key for event in events):
+                tracker = EntrantTracker(event_key=key, notifier=outbox)
+                print(f"\n=== Running tracker for: {tracker.event_name} (key={key}) ===")
+                try:
+                    tracker.run()
+                except Exception as e:
+                    print(f"Error running tracker for {key}: {e}")
+            with timing.span('compact_changes'):
+                for key in (event.key for event in events):
+                    try:
+                        compact_event(key)
+                    except Exception as e:
+                        print(f"Error compacting changes for {key}: {e}")
+        finally:
+            if worker:
+                with timing.span('drain_outbox'):
+                    worker.stop()
 
 
 if __name__ == '__main__':
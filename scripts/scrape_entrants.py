@@ -4,26 +4,37 @@ Automated entrant tracker.
 Intelligently discovers and tracks entrants based on race date:
 - Before race date: track current year entrants
 - After race date: track next year entrants (post-race registration opens)
+
+Race dates and registration events come from the discovery cache
+(discovery_cache.py), so most runs start without opening a browser.
+Use --refresh to look them up again.
 """
 
-import json
+import argparse
 import os
 from datetime import datetime
 from pathlib import Path
-from playwright.sync_api import sync_playwright
 import re
 import sys
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fileio
 from discover_current_year import discover_current_year_event
+from events import load_registry
 from get_race_dates import get_race_date_for_year
+from ultrasignup import register_url
 
 
 ENTRANTS_DIR = Path(__file__).parent.parent / "data" / "entrants"
-ENTRANTS_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def scrape_entrants_from_page(eid):
     """Scrape entrant list from UltraSignup registration page."""
-    url = f"https://ultrasignup.com/register.aspx?eid={eid}"
+    from playwright.sync_api import sync_playwright
+
+    url = register_url(eid=eid)
     
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
@@ -66,7 +77,7 @@ def scrape_entrants_from_page(eid):
     return entrants
 
 
-def determine_target_year_and_did():
+def determine_target_year_and_did(refresh=False):
     """
     Intelligently determine which year's entrants to track based on race date.
     
@@ -76,14 +87,14 @@ def determine_target_year_and_did():
     """
     today = datetime.now().date()
     
-    # Seed DID for discovering events (2025 50K)
-    seed_did = 119817
+    # Seed DID for discovering events (latest known 50K, from events.json)
+    seed_did = load_registry().series('barkley_fall_classic').seed_did
     
     # Get current year race date
     print(f"Today's date: {today}")
     print("Getting current year race date...")
     
-    race_date = get_race_date_for_year(seed_did)
+    race_date = get_race_date_for_year(seed_did, refresh=refresh)
     if not race_date:
         print("ERROR: Could not determine race date")
         return None, None
@@ -95,25 +106,30 @@ def determine_target_year_and_did():
         # Before race: track current year (discovered from seed_did)
         print(f"\n→ Before race ({today} < {race_date})")
         print("→ Tracking CURRENT YEAR entrants")
-        event = discover_current_year_event(seed_did)
+        event = discover_current_year_event(seed_did, refresh=refresh)
         return event['year'], seed_did
     else:
         # After race: track next year
         print(f"\n→ After race ({today} >= {race_date})")
         print("→ Tracking NEXT YEAR entrants")
-        event = discover_current_year_event(seed_did)
+        event = discover_current_year_event(seed_did, refresh=refresh)
         next_year = event['year'] + 1
         print(f"→ Next year will be {next_year}")
         return next_year, seed_did
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Discover and scrape the tracked year\'s entrants')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Look up race date and registration event again instead of using the discovery cache')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("ENTRANT TRACKER - Intelligent Scheduling")
     print("=" * 60)
     
     # Determine which year's entrants to track
-    target_year, seed_did = determine_target_year_and_did()
+    target_year, seed_did = determine_target_year_and_did(refresh=args.refresh)
     
     if not target_year or not seed_did:
         print("ERROR: Failed to determine target year")
@@ -121,6 +137,7 @@ def main():
     
     print(f"\n[SCRAPING] Year {target_year} entrants")
     print("Discovering registration URL...")
+    # Already looked up above, so this comes from the discovery cache
     event = discover_current_year_event(seed_did)
     
     if not event:
@@ -151,8 +168,7 @@ def main():
         'entrants': entrants
     }
     
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    fileio.write_json(output_file, data)
     
     print(f"✓ Saved {len(entrants)} entrants to {output_file}")
     print("=" * 60)
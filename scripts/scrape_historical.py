@@ -2,8 +2,11 @@
 """
 Master script for historical Barkley Fall Classic data collection and analysis.
 Runs scraper and analyzer for complete historical dataset.
+With --resume, years and distances already scraped are skipped (see scrape_state.json).
+Pages whose grid data is unchanged since the last scrape are not re-scraped unless --full.
 """
 
+import argparse
 import sys
 from pathlib import Path
 import time
@@ -12,10 +15,12 @@ import time
 repo_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(repo_root))
 
-from scraper_historical import HistoricalResultsScraper
+import fileio
+import timing
+from scraper_historical import HistoricalResultsScraper, ScrapeState
 from analyzer_historical import HistoricalAnalyzer
 
-def main():
+def main(resume=False, probe=True):
     print("=" * 60)
     print("BARKLEY FALL CLASSIC - HISTORICAL DATA COLLECTION")
     print("=" * 60)
@@ -25,7 +30,7 @@ def main():
     print("STEP 1: Scraping historical results from UltraSignup")
     print("-" * 60)
     scraper = HistoricalResultsScraper()
-    results = scraper.scrape_all()
+    results = scraper.scrape_all(resume=resume, probe=probe)
     print()
     
     if not results:
@@ -62,8 +67,8 @@ def main():
             size_kb = f.stat().st_size / 1024
             print(f"  • {f.name} ({size_kb:.1f} KB)")
     
-    archive = data_dir / "barkley_archive_complete.json"
-    if archive.exists():
+    archive = fileio.find(data_dir / "barkley_archive_complete.json")
+    if archive:
         size_mb = archive.stat().st_size / (1024 * 1024)
         print(f"\nMaster Archive:")
         print(f"  • {archive.name} ({size_mb:.2f} MB)")
@@ -75,5 +80,13 @@ def main():
     return True
 
 if __name__ == '__main__':
-    success = main()
-    sys.exit(0 if success else 1)
+    parser = argparse.ArgumentParser(description='Scrape historical results, then run the analysis')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip years/distances already scraped; retry only failed or unfinished ones')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-scrape every page even if its grid data probe is unchanged')
+    args = parser.parse_args()
+    with timing.run_report('scrape_historical_all'):
+        success = main(resume=args.resume, probe=not args.full)
+    incomplete = [key for key, unit in ScrapeState().units.items() if unit.get('status') != 'done']
+    sys.exit(0 if success and not incomplete else 1)
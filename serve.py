@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Local static server for the dashboards and the data directory.
+Serves files with strong ETags, If-None-Match revalidation, cached gzip,
+byte ranges and an in-memory LRU of hot files so repeated polling is cheap.
+"""
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+ROOT_DIR = Path(__file__).parent
+
+# Files larger than this are streamed from disk instead of cached
+MAX_CACHED_FILE_BYTES = 8 * 1024 * 1024
+# Total bytes (identity + gzip bodies) kept in the hot-file cache
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# Bodies smaller than this are not worth compressing
+MIN_GZIP_BYTES = 1024
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'image/svg+xml',
+)
+
+mimetypes.add_type('application/json', '.json')
+mimetypes.add_type('text/csv', '.csv')
+
+
+class LRUCache:
+    """Thread-safe LRU mapping bounded by the total size of its values."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._items[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def pop(self, key):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+class CachedFile:
+    """A file body held in memory together with its validators."""
+
+    __slots__ = ('mtime_ns', 'size', 'body', 'etag', 'gzip_body', 'gzip_etag',
+                 'content_type', 'last_modified')
+
+    def __init__(self, path: Path, stat: os.stat_result):
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.body = path.read_bytes()
+        digest = hashlib.sha1(self.body).hexdigest()
+        self.etag = f'"{digest}"'
+        self.content_type = guess_type(path)
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+        self.gzip_body = None
+        self.gzip_etag = None
+        if is_compressible(self.content_type) and len(self.body) >= MIN_GZIP_BYTES:
+            compressed = gzip.compress(self.body, compresslevel=6, mtime=0)
+            if len(compressed) < len(self.body):
+                self.gzip_body = compressed
+                # A strong ETag must differ between representations
+                self.gzip_etag = f'"{digest}-gz"'
+
+    @property
+    def memory_size(self) -> int:
+        return len(self.body) + (len(self.gzip_body) if self.gzip_body else 0)
+
+
+def guess_type(path: Path) -> str:
+    content_type, _ = mimetypes.guess_type(str(path))
+    content_type = content_type or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/json', 'application/javascript'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_range(header: str, size: int):
+    """
+    Parse a single "bytes=" range against a body of the given size.
+    Returns (start, end) inclusive, None to ignore the header, or
+    'unsatisfiable' when the range lies outside the body.
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+    spec = header[len('bytes='):].strip()
+    if ',' in spec:
+        # Multipart ranges are not worth supporting; serve the full body
+        return None
+    start_text, sep, end_text = spec.partition('-')
+    if not sep:
+        return None
+    try:
+        if start_text == '':
+            suffix = int(end_text)
+            if suffix <= 0:
+                return 'unsatisfiable'
+            start = max(size - suffix, 0)
+            end = size - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: str, etags) -> bool:
+    """Check an If-None-Match / If-Range header value against our ETags."""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return any(tag and tag in candidates for tag in etags)
+
+
+class DataRequestHandler(BaseHTTPRequestHandler):
+    """Serves files below the server's root directory."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'BFCDataServer/1.0'
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _resolve(self):
+        """Map the request path to a file under the root, or None."""
+        path = unquote(urlsplit(self.path).path)
+        root = self.server.root
+        target = (root / path.lstrip('/')).resolve()
+        if target != root and root not in target.parents:
+            return None
+        # Nothing hidden: .git/, .github/, .env and the like
+        if any(part.startswith('.') for part in target.relative_to(root).parts):
+            return None
+        if target.is_dir():
+            target = target / 'index.html'
+        return target if target.is_file() else None
+
+    def _load(self, path: Path, stat: os.stat_result):
+        """Return a CachedFile for path, reusing the LRU entry while it is fresh."""
+        cache = self.server.cache
+        entry = cache.get(path)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+        entry = CachedFile(path, stat)
+        cache.put(path, entry, entry.memory_size)
+        return entry
+
+    def _serve(self, send_body: bool):
+        path = self._resolve()
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return
+
+        stat = path.stat()
+        if stat.st_size > MAX_CACHED_FILE_BYTES:
+            self._serve_uncached(path, stat, send_body)
+            return
+
+        entry = self._load(path, stat)
+        accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        use_gzip = accepts_gzip and entry.gzip_body is not None
+        etag = entry.gzip_etag if use_gzip else entry.etag
+
+        if etag_matches(self.headers.get('If-None-Match'), (entry.etag, entry.gzip_etag)):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(etag, entry.last_modified)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = entry.body
+        status = HTTPStatus.OK
+        content_range = None
+
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and (not if_range or etag_matches(if_range, (entry.etag,))):
+            byte_range = parse_range(range_header, len(entry.body))
+            if byte_range == 'unsatisfiable':
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{len(entry.body)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if byte_range is not None:
+                # Ranges always refer to the identity representation
+                use_gzip = False
+                etag = entry.etag
+                start, end = byte_range
+                body = entry.body[start:end + 1]
+                status = HTTPStatus.PARTIAL_CONTENT
+                content_range = f'bytes {start}-{end}/{len(entry.body)}'
+
+        if use_gzip:
+            body = entry.gzip_body
+
+        self.send_response(status)
+        self.send_header('Content-Type', entry.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Accept-Ranges', 'bytes')
+        if entry.gzip_body is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        if content_range:
+            self.send_header('Content-Range', content_range)
+        self._send_validators(etag, entry.last_modified)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _serve_uncached(self, path: Path, stat: os.stat_result, send_body: bool):
+        """Stream a large file from disk with a weak mtime/size validator."""
+        etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        if self.headers.get('If-None-Match', '').strip() == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(etag, last_modified)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        start, end = 0, stat.st_size - 1
+        status = HTTPStatus.OK
+        byte_range = parse_range(self.headers.get('Range'), stat.st_size)
+        if byte_range == 'unsatisfiable':
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', f'bytes */{stat.st_size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if byte_range is not None:
+            start, end = byte_range
+            status = HTTPStatus.PARTIAL_CONTENT
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header('Content-Type', guess_type(path))
+        self.send_header('Content-Length', str(length))
+        self.send_header('Accept-Ranges', 'bytes')
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{stat.st_size}')
+        self._send_validators(etag, last_modified)
+        self.end_headers()
+        if not send_body:
+            return
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(64 * 1024, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def _send_validators(self, etag: str, last_modified: str):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        # Let browsers keep their copy but revalidate on every poll
+        self.send_header('Cache-Control', 'no-cache')
+
+
+class DataServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, root: Path = ROOT_DIR, cache_bytes: int = DEFAULT_CACHE_BYTES,
+                 quiet: bool = False, handler_class=DataRequestHandler):
+        self.root = Path(root).resolve()
+        self.cache = LRUCache(cache_bytes)
+        self.quiet = quiet
+        super().__init__(address, handler_class)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the dashboards and data directory')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', '-p', type=int, default=8000, help='Port to listen on (default: 8000)')
+    parser.add_argument('--root', default=str(ROOT_DIR), help='Directory to serve (default: repo root)')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                        help='Size of the in-memory hot-file cache in MB')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Suppress per-request logging')
+    args = parser.parse_args()
+
+    server = DataServer((args.host, args.port), root=args.root,
+                        cache_bytes=args.cache_mb * 1024 * 1024, quiet=args.quiet)
+    print(f"Serving {server.root} at http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Storage backends for EntrantTracker state.
+
+FileStorage keeps the original layout of three flat files per event
+(entrants JSON, changes JSON array, history CSV). SQLiteStorage keeps the
+same state in one WAL-mode database shared by all events, so each run only
+writes what changed and cross-event queries are indexed. export_event()
+writes the flat files back out for the static pages.
+
+Usage:
+    python storage.py import            # load existing data/ files into SQLite
+    python storage.py export            # rewrite data/ files from SQLite
+    python storage.py drops --days 7    # dropped entrants across all events
+"""
+
+import csv
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import fileio
+import jsonio
+import timing
+from compaction import compact, is_summary, load_archived
+from records import ENTRANT_FIELDS, as_entrant, entrant_digest, snapshot_dict
+
+DEFAULT_DB_PATH = Path("data") / "tracker.sqlite3"
+
+HISTORY_HEADER = [
+    'Date', 'Total_Entrants', 'Previous_Count', 'New_Entrants',
+    'Dropped_Entrants', 'Net_Change'
+]
+
+# Scalar columns of a change record; anything else goes in the details column
+CHANGE_COLUMNS = (
+    'timestamp', 'count_change', 'new_count', 'previous_count', 'total_new', 'total_dropped'
+)
+
+
+class TrackerStorage:
+    """Interface for persisting one event's snapshots, changes and history."""
+
+    def load_previous_data(self) -> dict:
+        raise NotImplementedError
+
+    def save_current_data(self, data: dict):
+        raise NotImplementedError
+
+    def save_changes(self, changes: dict):
+        raise NotImplementedError
+
+    def append_to_history(self, changes: dict):
+        raise NotImplementedError
+
+    def publish(self):
+        """Write the flat files the static pages read, if they are not the primary store."""
+
+    def describe(self) -> str:
+        return self.__class__.__name__
+
+
+class FileStorage(TrackerStorage):
+    """Per-event entrants JSON, changes JSON array and history CSV."""
+
+    def __init__(self, entrants_file: Path, changes_file: Path, history_file: Path):
+        self.ENTRANTS_FILE = entrants_file
+        self.CHANGES_FILE = changes_file
+        self.HISTORY_FILE = history_file
+
+    def load_previous_data(self) -> dict:
+        """Load previously saved entrant data for this event"""
+        stored = fileio.find(self.ENTRANTS_FILE)
+        if stored:
+            timing.add_file_bytes('bytes_read', stored)
+            return fileio.read_json(stored)
+        return {'count': 0, 'entrants': {}, 'timestamp': None}
+
+    def save_current_data(self, data: dict):
+        """Save current entrant data for this event"""
+        fileio.write_json(self.ENTRANTS_FILE, snapshot_dict(data))
+        timing.add_file_bytes('bytes_written', self.ENTRANTS_FILE)
+
+    def save_changes(self, changes: dict):
+        """Save changes to file for this event"""
+        all_changes = []
+
+        stored = fileio.find(self.CHANGES_FILE)
+        if stored:
+            timing.add_file_bytes('bytes_read', stored)
+            try:
+                all_changes = fileio.read_json(stored)
+            except Exception:
+                all_changes = []
+
+        all_changes.append(changes)
+
+        fileio.write_json(self.CHANGES_FILE, all_changes)
+        timing.add_file_bytes('bytes_written', self.CHANGES_FILE)
+
+    def append_to_history(self, changes: dict):
+        """Append changes to CSV history file for this event"""
+        file_exists = fileio.find(self.HISTORY_FILE) is not None
+
+        with fileio.append(self.HISTORY_FILE, newline='') as f:
+            start = f.tell()
+            writer = csv.writer(f)
+
+            if not file_exists:
+                writer.writerow(HISTORY_HEADER)
+
+            writer.writerow(history_row(changes))
+            timing.add('bytes_written', f.tell() - start)
+
+    def describe(self) -> str:
+        return f"files in {self.ENTRANTS_FILE.parent}"
+
+
+def history_row(changes: dict) -> list:
+    return [
+        changes['timestamp'],
+        changes['new_count'],
+        changes['previous_count'],
+        changes['total_new'],
+        changes['total_dropped'],
+        changes['count_change']
+    ]
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    key TEXT PRIMARY KEY,
+    name TEXT,
+    url TEXT
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    event_key TEXT NOT NULL REFERENCES events(key),
+    timestamp TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_event_time ON snapshots(event_key, timestamp);
+
+CREATE TABLE IF NOT EXISTS entrants (
+    event_key TEXT NOT NULL REFERENCES events(key),
+    entrant_key TEXT NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    city TEXT,
+    location TEXT,
+    age TEXT,
+    PRIMARY KEY (event_key, entrant_key)
+);
+CREATE INDEX IF NOT EXISTS idx_entrants_name ON entrants(last_name, first_name);
+
+-- One row per continuous stretch an entrant spent on the list.
+-- left_snapshot_id is NULL while they are still entered.
+CREATE TABLE IF NOT EXISTS memberships (
+    id INTEGER PRIMARY KEY,
+    event_key TEXT NOT NULL,
+    entrant_key TEXT NOT NULL,
+    joined_snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    left_snapshot_id INTEGER REFERENCES snapshots(id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_memberships_open
+    ON memberships(event_key, entrant_key) WHERE left_snapshot_id IS NULL;
+
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY,
+    event_key TEXT NOT NULL REFERENCES events(key),
+    timestamp TEXT NOT NULL,
+    count_change INTEGER,
+    new_count INTEGER,
+    previous_count INTEGER,
+    total_new INTEGER,
+    total_dropped INTEGER,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_changes_event_time ON changes(event_key, timestamp);
+CREATE INDEX IF NOT EXISTS idx_changes_time ON changes(timestamp);
+
+CREATE TABLE IF NOT EXISTS change_entrants (
+    id INTEGER PRIMARY KEY,
+    change_id INTEGER NOT NULL REFERENCES changes(id),
+    kind TEXT NOT NULL CHECK (kind IN ('new', 'dropped')),
+    entrant_key TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_change_entrants_change ON change_entrants(change_id, kind);
+CREATE INDEX IF NOT EXISTS idx_change_entrants_kind ON change_entrants(kind, change_id);
+
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    event_key TEXT NOT NULL REFERENCES events(key),
+    timestamp TEXT NOT NULL,
+    total_entrants INTEGER,
+    previous_count INTEGER,
+    new_entrants INTEGER,
+    dropped_entrants INTEGER,
+    net_change INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_history_event_time ON history(event_key, timestamp);
+"""
+
+
+def connect(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Open the tracker database in WAL mode, creating the schema if needed."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT so concurrent writers queue instead of clobbering."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class SQLiteStorage(TrackerStorage):
+    """Event state in a shared SQLite database; writes are proportional to the delta."""
+
+    def __init__(self, event_key: str, event_name: str = None, event_url: str = None,
+                 db_path: Path = DEFAULT_DB_PATH, export_paths: tuple = None):
+        self.event_key = event_key
+        self.db_path = Path(db_path)
+        self.export_paths = export_paths
+        self.conn = connect(self.db_path)
+        with _Transaction(self.conn) as conn:
+            conn.execute(
+                "INSERT INTO events (key, name, url) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET name=excluded.name, url=excluded.url",
+                (event_key, event_name, event_url)
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def publish(self):
+        if self.export_paths:
+            export_event(self.conn, self.event_key, *self.export_paths)
+
+    def describe(self) -> str:
+        return f"SQLite database {self.db_path}"
+
+    def load_previous_data(self) -> dict:
+        """Rebuild the latest snapshot from open memberships."""
+        return load_snapshot(self.conn, self.event_key)
+
+    def save_current_data(self, data: dict):
+        """Record a snapshot, opening/closing memberships only for entrants that changed."""
+        # Field values in ENTRANT_FIELDS order (the first five of an Entrant record)
+        entrants = {key: as_entrant(entrant)[:5] for key, entrant in data.get('entrants', {}).items()}
+        with _Transaction(self.conn) as conn:
+            snapshot_id = conn.execute(
+                "INSERT INTO snapshots (event_key, timestamp, count) VALUES (?, ?, ?)",
+                (self.event_key, data.get('timestamp') or datetime.now().isoformat(),
+                 data.get('count', len(entrants)))
+            ).lastrowid
+
+            stored = {
+                row[0]: tuple(row[1:]) for row in conn.execute(
+                    "SELECT m.entrant_key, e.first_name, e.last_name, e.city, e.location, e.age "
+                    "FROM memberships m JOIN entrants e "
+                    "ON e.event_key = m.event_key AND e.entrant_key = m.entrant_key "
+                    "WHERE m.event_key = ? AND m.left_snapshot_id IS NULL",
+                    (self.event_key,)
+                )
+            }
+            open_keys = set(stored)
+
+            conn.executemany(
+                "UPDATE memberships SET left_snapshot_id = ? "
+                "WHERE event_key = ? AND entrant_key = ? AND left_snapshot_id IS NULL",
+                [(snapshot_id, self.event_key, key) for key in open_keys if key not in entrants]
+            )
+            # Iterate the snapshot dict (not a set) so membership ids keep page order
+            added = [key for key in entrants if key not in open_keys]
+            # Upsert details only for new entrants and those whose fields changed
+            upserts = [
+                key for key in entrants
+                if key not in open_keys or stored[key] != entrants[key]
+            ]
+            conn.executemany(
+                "INSERT INTO entrants (event_key, entrant_key, first_name, last_name, city, location, age) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(event_key, entrant_key) DO UPDATE SET first_name=excluded.first_name, "
+                "last_name=excluded.last_name, city=excluded.city, location=excluded.location, age=excluded.age",
+                [(self.event_key, key, *entrants[key]) for key in upserts]
+            )
+            conn.executemany(
+                "INSERT INTO memberships (event_key, entrant_key, joined_snapshot_id) VALUES (?, ?, ?)",
+                [(self.event_key, key, snapshot_id) for key in added]
+            )
+
+    def save_changes(self, changes: dict):
+        """Insert one change record and its new/dropped entrant rows."""
+        details = {
+            k: v for k, v in changes.items()
+            if k not in CHANGE_COLUMNS and k not in ('new_entrants', 'dropped_entrants')
+        }
+        with _Transaction(self.conn) as conn:
+            change_id = conn.execute(
+                "INSERT INTO changes (event_key, timestamp, count_change, new_count, previous_count, "
+                "total_new, total_dropped, details) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.event_key, *(changes.get(c) for c in CHANGE_COLUMNS),
+                 jsonio.dumps(details) if details else None)
+            ).lastrowid
+            rows = []
+            for kind, field in (('new', 'new_entrants'), ('dropped', 'dropped_entrants')):
+                for entrant in changes.get(field, []):
+                    rows.append((change_id, kind, entrant.get('key'), jsonio.dumps(entrant)))
+            conn.executemany(
+                "INSERT INTO change_entrants (change_id, kind, entrant_key, data) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def append_to_history(self, changes: dict):
+        with _Transaction(self.conn) as conn:
+            conn.execute(
+                "INSERT INTO history (event_key, timestamp, total_entrants, previous_count, "
+                "new_entrants, dropped_entrants, net_change) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.event_key, *history_row(changes))
+            )
+
+    def load_changes(self) -> list:
+        """Return all change records for this event in the changes JSON format."""
+        return load_changes(self.conn, self.event_key)
+
+    def load_history(self) -> list:
+        return load_history(self.conn, self.event_key)
+
+
+def load_snapshot(conn: sqlite3.Connection, event_key: str) -> dict:
+    latest = conn.execute(
+        "SELECT timestamp FROM snapshots WHERE event_key = ? ORDER BY id DESC LIMIT 1",
+        (event_key,)
+    ).fetchone()
+    if latest is None:
+        return {'count': 0, 'entrants': {}, 'timestamp': None}
+
+    rows = conn.execute(
+        """
+        SELECT e.entrant_key, e.first_name, e.last_name, e.city, e.location, e.age
+        FROM memberships m
+        JOIN entrants e ON e.event_key = m.event_key AND e.entrant_key = m.entrant_key
+        WHERE m.event_key = ? AND m.left_snapshot_id IS NULL
+        ORDER BY m.id
+        """,
+        (event_key,)
+    ).fetchall()
+    entrants = {}
+    for row in rows:
+        entrant = {field: row[field] for field in ENTRANT_FIELDS}
+        entrant['digest'] = entrant_digest(entrant)
+        entrants[row['entrant_key']] = entrant
+    return {'count': len(entrants), 'entrants': entrants, 'timestamp': latest['timestamp']}
+
+
+def load_history(conn: sqlite3.Connection, event_key: str) -> list:
+    rows = conn.execute(
+        "SELECT timestamp, total_entrants, previous_count, new_entrants, dropped_entrants, net_change "
+        "FROM history WHERE event_key = ? ORDER BY id",
+        (event_key,)
+    ).fetchall()
+    return [list(row) for row in rows]
+
+
+def load_changes(conn: sqlite3.Connection, event_key: str) -> list:
+    entrant_rows = conn.execute(
+        "SELECT ce.change_id, ce.kind, ce.data FROM change_entrants ce "
+        "JOIN changes c ON c.id = ce.change_id WHERE c.event_key = ? ORDER BY ce.id",
+        (event_key,)
+    ).fetchall()
+    by_change = {}
+    for row in entrant_rows:
+        lists = by_change.setdefault(row['change_id'], {'new': [], 'dropped': []})
+        lists[row['kind']].append(jsonio.loads(row['data']))
+
+    records = []
+    for row in conn.execute("SELECT * FROM changes WHERE event_key = ? ORDER BY id", (event_key,)):
+        lists = by_change.get(row['id'], {'new': [], 'dropped': []})
+        record = {
+            'timestamp': row['timestamp'],
+            'count_change': row['count_change'],
+            'new_count': row['new_count'],
+            'previous_count': row['previous_count'],
+            'new_entrants': lists['new'],
+            'dropped_entrants': lists['dropped'],
+            'total_new': row['total_new'],
+            'total_dropped': row['total_dropped'],
+        }
+        if row['details']:
+            record.update(jsonio.loads(row['details']))
+        records.append(record)
+    return records
+
+
+def recent_drops(conn: sqlite3.Connection, since: str) -> list:
+    """Dropped entrants across all events with change timestamps at or after `since`."""
+    rows = conn.execute(
+        "SELECT c.event_key, c.timestamp, ce.data FROM change_entrants ce "
+        "JOIN changes c ON c.id = ce.change_id "
+        "WHERE ce.kind = 'dropped' AND c.timestamp >= ? ORDER BY c.timestamp",
+        (since,)
+    ).fetchall()
+    return [{'event': row['event_key'], 'timestamp': row['timestamp'], **jsonio.loads(row['data'])} for row in rows]
+
+
+def export_event(conn: sqlite3.Connection, event_key: str, entrants_file: Path,
+                 changes_file: Path, history_file: Path):
+    """Write the flat JSON/CSV files the static pages read from the database."""
+    fileio.write_json(entrants_file, load_snapshot(conn, event_key))
+    # The database keeps every raw record; the published file is compacted
+    fileio.write_json(changes_file, compact(load_changes(conn, event_key))[0])
+    with fileio.atomic_write(history_file, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HISTORY_HEADER)
+        writer.writerows(load_history(conn, event_key))
+
+
+def _timestamps(conn: sqlite3.Connection, table: str, event_key: str) -> set:
+    return {row[0] for row in conn.execute(f"SELECT timestamp FROM {table} WHERE event_key = ?", (event_key,))}
+
+
+def import_event(storage: SQLiteStorage, entrants_file: Path, changes_file: Path, history_file: Path):
+    """
+    Seed the database from an event's existing flat files. Rows whose timestamp
+    the event already has are skipped, so importing again adds only what is new.
+    """
+    files = FileStorage(entrants_file, changes_file, history_file)
+    conn, key = storage.conn, storage.event_key
+    if fileio.find(changes_file):
+        # Rolled-up summaries stand in for raw records kept in the compaction archive
+        records = load_archived(changes_file)
+        records += [record for record in fileio.read_json(changes_file) if not is_summary(record)]
+        # Also drops records a crashed compaction archived twice
+        seen = _timestamps(conn, 'changes', key)
+        for record in sorted(records, key=lambda record: record['timestamp']):
+            if record['timestamp'] not in seen:
+                seen.add(record['timestamp'])
+                storage.save_changes(record)
+    if fileio.find(history_file):
+        seen = _timestamps(conn, 'history', key)
+        with fileio.open_text(history_file, newline='') as f:
+            for row in csv.DictReader(f):
+                if row['Date'] in seen:
+                    continue
+                seen.add(row['Date'])
+                storage.append_to_history({
+                    'timestamp': row['Date'],
+                    'new_count': int(row['Total_Entrants']),
+                    'previous_count': int(row['Previous_Count']),
+                    'total_new': int(row['New_Entrants']),
+                    'total_dropped': int(row['Dropped_Entrants']),
+                    'count_change': int(row['Net_Change']),
+                })
+    snapshot = files.load_previous_data()
+    if snapshot.get('timestamp') and snapshot['timestamp'] not in _timestamps(conn, 'snapshots', key):
+        storage.save_current_data(snapshot)
+
+
+def main():
+    import argparse
+    from scraper import EVENTS, data_paths_for
+
+    parser = argparse.ArgumentParser(description='Manage the SQLite tracker database')
+    parser.add_argument('command', choices=['import', 'export', 'drops'])
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='Database path')
+    parser.add_argument('--event', '-e', action='append', help='Limit to event key (repeatable)')
+    parser.add_argument('--days', type=int, default=7, help='Window for the drops query')
+    args = parser.parse_args()
+
+    keys = args.event or list(EVENTS.keys())
+    if args.command == 'import':
+        for key in keys:
+            name, url = EVENTS[key]
+            storage = SQLiteStorage(key, name, url, db_path=args.db)
+            import_event(storage, *data_paths_for(key))
+            print(f"✓ Imported {key} into {args.db}")
+            storage.close()
+    elif args.command == 'export':
+        conn = connect(args.db)
+        for key in keys:
+            export_event(conn, key, *data_paths_for(key))
+            print(f"✓ Exported {key} from {args.db}")
+        conn.close()
+    else:
+        conn = connect(args.db)
+        since = (datetime.now() - timedelta(days=args.days)).isoformat()
+        drops = recent_drops(conn, since)
+        print(f"{len(drops)} dropped entrants since {since[:10]}")
+        for drop in drops:
+            print(f"  {drop['timestamp'][:16]} [{drop['event']}] {drop.get('first_name')} {drop.get('last_name')} ({drop.get('location')})")
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
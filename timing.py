@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Lightweight timing spans for the scrape/analyze pipeline.
+
+    with timing.run_report('track'):
+        with timing.span('scrape'):
+            ...
+            timing.add('bytes_read', len(body))
+
+    @timing.timed()
+    def generate_yearly_summary(self): ...
+
+Spans nest, carry counters (counts, bytes read/written) and cost almost
+nothing when no run report is active. run_report() writes the span tree to
+run_report_{name}.json and appends a one-line summary to run_reports.jsonl
+(a compressed log under BFC_COMPRESS), so slow stages and regressions are easy
+to spot. Reports go to BFC_REPORT_DIR (default data/reports/, gitignored) so
+scheduled runs don't commit a new report every hour.
+"""
+
+import functools
+import os
+import socket
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+import fileio
+import jsonio
+
+REPORT_DIR = Path(os.getenv('BFC_REPORT_DIR', Path(__file__).parent / "data" / "reports"))
+
+# Stack of open spans for the current thread / task
+_stack = ContextVar('timing_stack', default=())
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'started_at', 'duration', 'children', 'counters', '_start')
+
+    def __init__(self, name: str, attrs: dict = None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.started_at = datetime.now().isoformat()
+        self.duration = None
+        self.children = []
+        self.counters = {}
+        self._start = time.perf_counter()
+
+    def add(self, key: str, n=1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def totals(self) -> dict:
+        """Counters summed over this span and all descendants."""
+        totals = dict(self.counters)
+        for child in self.children:
+            for key, value in child.totals().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def to_dict(self) -> dict:
+        result = {
+            'name': self.name,
+            'started_at': self.started_at,
+            'seconds': round(self.duration, 6) if self.duration is not None else None,
+        }
+        if self.attrs:
+            result['attrs'] = self.attrs
+        if self.counters:
+            result['counters'] = self.counters
+        if self.children:
+            result['children'] = [child.to_dict() for child in self.children]
+        return result
+
+
+def current_span():
+    stack = _stack.get()
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block as a child of the current span."""
+    parent = current_span()
+    s = Span(name, attrs)
+    token = _stack.set(_stack.get() + (s,))
+    try:
+        yield s
+    finally:
+        s.duration = time.perf_counter() - s._start
+        _stack.reset(token)
+        if parent is not None:
+            parent.children.append(s)
+
+
+def timed(name: str = None):
+    """Decorator form of span(); defaults to the function's qualified name."""
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add(key: str, n=1):
+    """Add to a counter on the current span (no-op outside a span)."""
+    s = current_span()
+    if s is not None:
+        s.add(key, n)
+
+
+def add_file_bytes(key: str, path):
+    """Add a file's size to a bytes_read / bytes_written counter."""
+    s = current_span()
+    if s is not None:
+        try:
+            s.add(key, os.path.getsize(path))
+        except OSError:
+            pass
+
+
+@contextmanager
+def run_report(name: str, output_dir=None, **attrs):
+    """
+    Root span for one pipeline run. On exit (including failures) writes
+    run_report_{name}.json and appends a summary line to run_reports.jsonl
+    in output_dir (REPORT_DIR by default).
+    """
+    output_dir = Path(output_dir or REPORT_DIR)
+    root = None
+    error = None
+    try:
+        with span(name, host=socket.gethostname(), pid=os.getpid(), **attrs) as root:
+            yield root
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if root is not None:
+            write_report(root, output_dir, error)
+
+
+def write_report(root: Span, output_dir: Path, error: str = None):
+    report = root.to_dict()
+    report['totals'] = root.totals()
+    if error:
+        report['error'] = error
+
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        fileio.write_json(output_dir / f"run_report_{root.name}.json", report)
+
+        stages = {}
+        for child in root.children:
+            stages[child.name] = round(stages.get(child.name, 0) + child.duration, 3)
+        summary = {
+            'name': root.name,
+            'started_at': root.started_at,
+            'seconds': report['seconds'],
+            'stages': stages,
+            'totals': report['totals'],
+        }
+        if error:
+            summary['error'] = error
+        fileio.append_line(fileio.cold_path(output_dir / "run_reports.jsonl"), jsonio.dumps(summary))
+    except OSError as e:
+        print(f"Warning: failed to write run report: {e}")
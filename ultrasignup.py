@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+UltraSignup endpoints shared by the scrapers.
+Set ULTRASIGNUP_BASE_URL to point every scraper (HTTP and Playwright paths)
+at another host, e.g. the offline stand-in in benchmarks/fake_ultrasignup.py.
+
+The discovery lookups only need elements that are in the server-rendered HTML
+(the current-event link, the race date, the distance toggle links). The
+parse_* functions read them from a plain HTTP fetch over one shared session;
+callers fall back to a browser only when a page lacks the element.
+"""
+
+import os
+import re
+from urllib.parse import urlencode
+
+DEFAULT_BASE_URL = 'https://ultrasignup.com'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+RACE_DATE_PATTERN = re.compile(
+    r'(January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+(\d{1,2}),?\s+(\d{4})'
+)
+
+_session = None
+
+
+def base_url() -> str:
+    # Read on every call so the override works whatever was imported first
+    return os.getenv('ULTRASIGNUP_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+
+
+def url(page: str, **params) -> str:
+    """Absolute URL for an UltraSignup page, e.g. url('results_event.aspx', did=119817)."""
+    query = f"?{urlencode(params)}" if params else ''
+    return f"{base_url()}/{page.lstrip('/')}{query}"
+
+
+def results_url(did) -> str:
+    return url('results_event.aspx', did=did)
+
+
+def entrants_url(did) -> str:
+    return url('entrants_event.aspx', did=did)
+
+
+def grid_url(did) -> str:
+    """JSON rows behind a results page's jqGrid (including the status codes)."""
+    return url(f'service/events.svc/results/{did}/1/json')
+
+
+def register_url(did=None, eid=None) -> str:
+    if eid is not None:
+        return url('register.aspx', eid=eid)
+    return url('register.aspx', did=did)
+
+
+def session():
+    """One requests.Session for every static lookup in the process (connection reuse)."""
+    global _session
+    if _session is None:
+        import requests
+
+        _session = requests.Session()
+        _session.headers['User-Agent'] = USER_AGENT
+    return _session
+
+
+def fetch_html(page_url: str, timeout: float = 30):
+    """Server-rendered HTML of a page, or None if the request fails."""
+    import requests
+
+    try:
+        response = session().get(page_url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"  Static fetch failed for {page_url}: {e}")
+        return None
+    return response.text
+
+
+def parse_current_event_link(html: str):
+    """(href, text) of the "See the {year} event" link, or None if the page has none."""
+    from bs4 import BeautifulSoup
+
+    link = BeautifulSoup(html, 'html.parser').find('a', id='ContentPlaceHolder1_hlCurrentEventPage')
+    if link is None or not link.get('href'):
+        return None
+    return link['href'], link.get_text(strip=True)
+
+
+def parse_race_date_text(text: str):
+    """First "Month DD, YYYY" in the text as (month_name, day, year), or None."""
+    match = RACE_DATE_PATTERN.search(text or '')
+    return match.groups() if match else None
+
+
+def parse_race_date(html: str):
+    from bs4 import BeautifulSoup
+
+    body = BeautifulSoup(html, 'html.parser').body
+    return parse_race_date_text(body.get_text(' ') if body else '')
+
+
+def parse_toggle_links(html: str):
+    """[{'text', 'href'}] for the distance toggle links, or None if the page has no toggle."""
+    from bs4 import BeautifulSoup
+
+    container = BeautifulSoup(html, 'html.parser').select_one('div.unit-1.text-right')
+    if container is None:
+        return None
+    return [{'text': a.get_text(strip=True), 'href': a.get('href') or ''} for a in container.find_all('a')]
+
+
+def sibling_dids(links: list) -> dict:
+    """{'50K': did, 'Marathon': did} from toggle links."""
+    mapping = {}
+    for link in links:
+        href = link.get('href', '')
+        label = link.get('text', '').lower()
+        if 'did=' not in href:
+            continue
+        try:
+            did = int(href.split('did=')[1].split('#')[0].split('&')[0])
+        except ValueError:
+            continue
+        if '50k' in label:
+            mapping['50K'] = did
+        elif 'marathon' in label:
+            mapping['Marathon'] = did
+    return mapping